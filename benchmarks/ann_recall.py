@@ -0,0 +1,87 @@
+"""
+Recall@k and latency of the IVF index against exact search.
+
+    python benchmarks/ann_recall.py --rows 200000 --dim 384 --k 10
+
+Builds a flat and an IVF NumpyCollection over the same synthetic clustered
+vectors (in a temporary directory) and reports, for several nprobe values,
+the mean recall@k of the IVF results against the exact top-k and the mean
+query latency.
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from swiftagent.prebuilt.storage.numpy_store import NumpyCollection
+
+
+def clustered_vectors(
+    rows: int, dim: int, clusters: int, seed: int = 0
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=rows)
+    noise = rng.normal(scale=0.35, size=(rows, dim)).astype(np.float32)
+    return centers[labels] + noise
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=None)
+    parser.add_argument(
+        "--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32]
+    )
+    args = parser.parse_args()
+
+    data = clustered_vectors(
+        args.rows, args.dim, clusters=max(8, args.rows // 500)
+    )
+    queries = clustered_vectors(args.queries, args.dim, clusters=64, seed=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        flat = NumpyCollection(f"{tmp}/flat")
+        ivf = NumpyCollection(
+            f"{tmp}/ivf", index="ivf", index_options={"nlist": args.nlist}
+        )
+
+        flat.add_vectors(data)
+        start = time.perf_counter()
+        ivf.add_vectors(data, ids=flat._ids)
+        build = time.perf_counter() - start
+        print(
+            f"rows={args.rows} dim={args.dim} nlist={ivf._index.nlist} "
+            f"build={build:.2f}s"
+        )
+
+        start = time.perf_counter()
+        truth = [
+            {hit["id"] for hit in flat.search(q, k=args.k)} for q in queries
+        ]
+        exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+        print(f"exact      recall@{args.k}=1.000  {exact_ms:7.2f} ms/query")
+
+        for nprobe in args.nprobe:
+            start = time.perf_counter()
+            found = [
+                {hit["id"] for hit in ivf.search(q, k=args.k, nprobe=nprobe)}
+                for q in queries
+            ]
+            ms = (time.perf_counter() - start) / len(queries) * 1000
+            recall = np.mean(
+                [len(t & f) / len(t) for t, f in zip(truth, found)]
+            )
+            print(
+                f"nprobe={nprobe:<4} recall@{args.k}={recall:.3f}  "
+                f"{ms:7.2f} ms/query"
+            )
+
+
+if __name__ == "__main__":
+    main()
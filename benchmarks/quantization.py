@@ -0,0 +1,86 @@
+"""
+Compression, recall@k and latency of SQ8 / PQ against float32 search.
+
+    python benchmarks/quantization.py --rows 100000 --dim 384 --rerank 0 50
+
+Builds a float32 collection and one quantized collection per method and
+re-rank depth over the same synthetic clustered vectors (in a temporary
+directory), then reports bytes per vector scanned by searches, the
+compression ratio of those codes, bytes per vector on disk (codes plus the
+full-precision vectors), mean recall@k against the exact top-k and mean
+query latency.
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from swiftagent.prebuilt.storage.numpy_store import NumpyCollection
+
+from ann_recall import clustered_vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--methods", nargs="+", default=["sq8", "pq"])
+    parser.add_argument("--rerank", type=int, nargs="+", default=[0, 50])
+    args = parser.parse_args()
+
+    data = clustered_vectors(
+        args.rows, args.dim, clusters=max(8, args.rows // 500)
+    )
+    queries = clustered_vectors(args.queries, args.dim, clusters=64, seed=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        flat = NumpyCollection(f"{tmp}/flat")
+        ids = flat.add_vectors(data)
+
+        start = time.perf_counter()
+        truth = [
+            {hit["id"] for hit in flat.search(q, k=args.k)} for q in queries
+        ]
+        exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+        print(
+            f"float32         {args.dim * 4:5d} B/vector   1.0x  "
+            f"recall@{args.k}=1.000  {exact_ms:7.2f} ms/query"
+        )
+
+        for method in args.methods:
+            for rerank in args.rerank:
+                collection = NumpyCollection(
+                    f"{tmp}/{method}-{rerank}",
+                    quantization=method,
+                    quantization_options={"rerank": rerank},
+                )
+                start = time.perf_counter()
+                collection.add_vectors(data, ids=ids)
+                build = time.perf_counter() - start
+
+                start = time.perf_counter()
+                found = [
+                    {hit["id"] for hit in collection.search(q, k=args.k)}
+                    for q in queries
+                ]
+                ms = (time.perf_counter() - start) / len(queries) * 1000
+                recall = np.mean(
+                    [len(t & f) / len(t) for t, f in zip(truth, found)]
+                )
+                report = collection.quantization_report(queries[:1])
+                print(
+                    f"{method:<4} rerank={rerank:<4}"
+                    f"{report['bytes_per_vector']:5d} B/vector "
+                    f"{report['compression_ratio']:5.1f}x  "
+                    f"{report['disk_bytes_per_vector']:5d} B/vector on disk  "
+                    f"recall@{args.k}={recall:.3f}  {ms:7.2f} ms/query  "
+                    f"(build {build:.1f}s)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Throughput and memory of the native text splitter against LangChain's.
+
+    python benchmarks/text_splitter.py --mb 20 --chunk-size 1500 --overlap 150
+
+Splits the same synthetic prose (paragraphs, lines and words of random
+lengths) with LangChain's RecursiveCharacterTextSplitter (through
+`create_documents`, as swiftagent used it; skipped when
+langchain-text-splitters is not installed) and with RecursiveTextSplitter
+returning chunks, returning offsets and streaming, and reports MB/s, chunks
+and the peak memory allocated while splitting.
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from swiftagent.memory.splitter import RecursiveTextSplitter
+
+
+def synthetic_text(chars: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(1, 12)))
+        for _ in range(5000)
+    ]
+    parts, size = [], 0
+    while size < chars:
+        line = " ".join(rng.choices(words, k=rng.randint(3, 30)))
+        line += "\n\n" if rng.random() < 0.2 else "\n"
+        parts.append(line)
+        size += len(line)
+    return "".join(parts)[:chars]
+
+
+def measure(name: str, split, text: str) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = split(text)
+    count = chunks if isinstance(chunks, int) else len(chunks)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<28} {len(text) / seconds / 1e6:8.1f} MB/s  "
+        f"{count:8d} chunks  peak {peak / 1e6:8.1f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--mb", type=float, default=10)
+    parser.add_argument("--chunk-size", type=int, default=1500)
+    parser.add_argument("--overlap", type=int, default=150)
+    args = parser.parse_args()
+
+    text = synthetic_text(int(args.mb * 1e6))
+    native = RecursiveTextSplitter(args.chunk_size, args.overlap)
+
+    try:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+    except ImportError:
+        print("langchain-text-splitters not installed, skipping it")
+    else:
+        langchain = RecursiveCharacterTextSplitter(
+            chunk_size=args.chunk_size, chunk_overlap=args.overlap
+        )
+        measure(
+            "langchain create_documents",
+            lambda t: langchain.create_documents([t]),
+            text,
+        )
+        assert langchain.split_text(text) == native.split(text)
+
+    measure("native split", native.split, text)
+    measure("native spans", native.spans, text)
+
+    def stream(text: str) -> int:
+        pieces = (text[i : i + 65536] for i in range(0, len(text), 65536))
+        return sum(1 for _ in native.stream(pieces))
+
+    measure("native stream (count only)", stream, text)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,9 @@ from .base import (
 from .wrapper import action
 
 from .set import ActionSet
+
+from .execution import ActionExecutor, ExecutionPolicy
+
+from .cache import ActionCache
+
+from .retrieval import ActionRetriever
@@ -12,6 +12,8 @@ import inspect
 from swiftagent.actions.utils import (
     python_type_to_json_schema,
 )
+from swiftagent.actions.execution import ExecutionPolicy
+from swiftagent.actions.cache import ActionCache
 
 
 class Action:
@@ -27,13 +29,33 @@ class Action:
             ]
         ] = None,
         strict: bool = True,
+        execution: Optional[ExecutionPolicy | str] = None,
+        cache: bool | dict | ActionCache | None = None,
+        timeout: Optional[float] = None,
     ):
+        """
+        Args:
+            execution: Where the function runs when it is synchronous
+                ("inline", "thread" or "process"). Defaults to the agent's
+                thread pool so blocking actions never stall the event loop.
+            cache: Memoize results of this (idempotent) action. True or a
+                dict of ActionCache options uses the process-wide cache for
+                this function; an ActionCache instance is used as is.
+            timeout: Seconds a single call may take before it is abandoned
+                and a timeout error is returned to the model.
+        """
 
         self.func = func
         self.name = name or func.__name__
         self.description = description or func.__doc__ or ""
         self.params = params or {}
         self.strict = strict
+        self.execution = (
+            ExecutionPolicy(execution) if execution is not None else None
+        )
+
+        self.cache = self._build_cache(cache)
+        self.timeout = timeout
 
         # Cache the metadata when instantiated
         self._metadata = self._build_metadata()
@@ -89,6 +111,23 @@ class Action:
             },
         }
 
+    def _build_cache(
+        self, cache: bool | dict | ActionCache | None
+    ) -> Optional[ActionCache]:
+        if cache is None or cache is False:
+            return None
+        if isinstance(cache, ActionCache):
+            return cache
+
+        # Keyed on the function itself, so every agent registering the
+        # same action shares one cache
+        identity = (
+            f"{getattr(self.func, '__module__', '')}."
+            f"{getattr(self.func, '__qualname__', self.name)}"
+        )
+        options = cache if isinstance(cache, dict) else {}
+        return ActionCache.shared(identity, **options)
+
     def _create_wrapper(
         self,
     ) -> Callable:
@@ -0,0 +1,174 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import cloudpickle
+
+from swiftagent.constants import CACHE_DIR
+from swiftagent.core.diskcache import DiskCache
+
+
+class ActionCache:
+    """
+    Memoizes the results of an idempotent action, keyed on its JSON-normalized
+    arguments.
+
+    Entries live in an in-memory LRU (bounded by `max_entries`, optionally
+    expiring after `ttl` seconds) with an optional on-disk copy under
+    CACHE_DIR, so results also survive restarts. Caches obtained through
+    `ActionCache.shared` are shared by every agent in the process that
+    registers the same action.
+
+    Example:
+
+        @yfinance_actions.action(cache={"ttl": 600})
+        def get_company_info(symbol: str) -> str: ...
+    """
+
+    _shared: dict[str, "ActionCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        name: str = "action",
+        ttl: Optional[float] = None,
+        max_entries: int = 1024,
+        persist: bool = False,
+    ):
+        """
+        Args:
+            name: Used for the on-disk file name when `persist` is set.
+            ttl: Seconds a result stays valid (None means forever).
+            max_entries: LRU bound of the in-memory cache (and disk copy).
+            persist: Also store results in CACHE_DIR/action_cache/<name>.
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.persist = persist
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[str, tuple[Optional[float], Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._disk: Optional[DiskCache] = None
+        if persist:
+            file_name = re.sub(r"[^\w.-]", "_", name) + ".sqlite3"
+            self._disk = DiskCache(
+                CACHE_DIR / "action_cache" / file_name,
+                max_entries=max_entries,
+                ttl=ttl,
+            )
+
+    @classmethod
+    def shared(cls, name: str, **options) -> "ActionCache":
+        """
+        Return the process-wide cache registered under `name`. Options left
+        out follow the existing cache; options that contradict it raise a
+        ValueError rather than being silently ignored.
+        """
+        with cls._shared_lock:
+            cache = cls._shared.get(name)
+            if cache is None:
+                cache = cls._shared[name] = cls(name=name, **options)
+                return cache
+            conflicts = {
+                option: value
+                for option, value in options.items()
+                if cache.config.get(option) != value
+            }
+            if conflicts:
+                raise ValueError(
+                    f"Action cache {name!r} is already registered with "
+                    f"{cache.config}, which conflicts with {conflicts}"
+                )
+            return cache
+
+    @staticmethod
+    def make_key(arguments: dict) -> str:
+        return json.dumps(
+            arguments, sort_keys=True, separators=(",", ":"), default=str
+        )
+
+    def get(self, arguments: dict) -> tuple[bool, Any]:
+        """Return (hit, value) for the given call arguments."""
+        key = self.make_key(arguments)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+
+        if self._disk is not None:
+            entry = self._disk.get_entry(key)
+            if entry is not None:
+                raw, expires_at = entry
+                value = cloudpickle.loads(raw)
+                # Keep the expiry stored on disk, so a reload does not
+                # extend the entry's lifetime
+                self._remember(key, value, expires_at)
+                with self._lock:
+                    self.hits += 1
+                return True, value
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def set(self, arguments: dict, value: Any) -> None:
+        key = self.make_key(arguments)
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        self._remember(key, value, expires_at)
+
+        if self._disk is not None:
+            try:
+                self._disk.set(key, cloudpickle.dumps(value))
+            except Exception:
+                # Unpicklable results are only cached in memory
+                pass
+
+    def _remember(
+        self, key: str, value: Any, expires_at: Optional[float]
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    @property
+    def config(self) -> dict:
+        """Constructor options, as stored by AgentRegistry."""
+        return {
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+            "persist": self.persist,
+        }
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
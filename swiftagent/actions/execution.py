@@ -0,0 +1,164 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Optional
+
+import cloudpickle
+
+if TYPE_CHECKING:
+    from swiftagent.actions.base import Action
+
+
+class ExecutionPolicy(Enum):
+    """Where a synchronous action runs. Coroutine actions always run on the loop."""
+
+    INLINE = "inline"  # directly on the event loop (only for trivial work)
+    THREAD = "thread"  # in the agent's bounded thread pool (default)
+    PROCESS = "process"  # in a process pool (CPU-bound, picklable work)
+
+    @classmethod
+    def _missing_(cls, value: str) -> "ExecutionPolicy":
+        """Handle string inputs by converting them to enum members."""
+        if isinstance(value, str):
+            try:
+                return cls[value.upper()]
+            except KeyError:
+                pass
+        return None
+
+
+def _run_pickled(payload: bytes, kwargs: dict) -> Any:
+    """Process-pool trampoline: decorated functions don't pickle by reference."""
+    func = cloudpickle.loads(payload)
+    return func(**kwargs)
+
+
+class ActionExecutor:
+    """
+    Owns the bounded pools that synchronous actions are dispatched to, so that
+    blocking tools (yfinance, DuckDuckGo, `requests`, ...) never freeze the
+    event loop serving other queries and heartbeats.
+
+    Pools are created lazily on first use.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_processes: Optional[int] = None,
+    ):
+        """
+        Args:
+            max_workers: Thread pool size (defaults to ThreadPoolExecutor's).
+            max_processes: Process pool size (defaults to the CPU count).
+        """
+        self.max_workers = max_workers
+        self.max_processes = max_processes
+
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="swiftagent-action",
+            )
+        return self._thread_pool
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.max_processes
+            )
+        return self._process_pool
+
+    def submit(self, action: "Action", kwargs: dict) -> Any:
+        """
+        Start `action` with `kwargs` according to its execution policy and
+        return an awaitable for its result.
+        """
+        if inspect.iscoroutinefunction(action.func):
+            return action.func(**kwargs)
+
+        loop = asyncio.get_running_loop()
+        policy = action.execution or ExecutionPolicy.THREAD
+
+        if policy == ExecutionPolicy.INLINE:
+            future = loop.create_future()
+            try:
+                future.set_result(action.func(**kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        if policy == ExecutionPolicy.PROCESS:
+            return loop.run_in_executor(
+                self.process_pool,
+                _run_pickled,
+                cloudpickle.dumps(action.func),
+                kwargs,
+            )
+
+        # Carry context variables over to the worker like asyncio.to_thread
+        context = contextvars.copy_context()
+        return loop.run_in_executor(
+            self.thread_pool,
+            functools.partial(context.run, action.func, **kwargs),
+        )
+
+    async def run(
+        self,
+        action: "Action",
+        kwargs: dict,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Run `action` to completion off the event loop when needed, serving
+        it from the action's result cache if it has one.
+
+        The call is bounded by the smaller of `action.timeout` and `timeout`.
+        On expiry a coroutine action is cancelled, while a pooled call is
+        abandoned (its worker finishes in the background), and
+        asyncio.TimeoutError is raised.
+        """
+        if action.cache is not None:
+            hit, value = action.cache.get(kwargs)
+            if hit:
+                return value
+
+        limits = [t for t in (action.timeout, timeout) if t is not None]
+        if limits:
+            result = await asyncio.wait_for(
+                self.submit(action, kwargs), min(limits)
+            )
+        else:
+            result = await self.submit(action, kwargs)
+
+        if action.cache is not None:
+            action.cache.set(kwargs, result)
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait, cancel_futures=not wait)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=not wait)
+            self._process_pool = None
+
+
+_default_executor: Optional[ActionExecutor] = None
+
+
+def default_action_executor() -> ActionExecutor:
+    """Process-wide executor used by reasoning objects not bound to an agent."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ActionExecutor()
+    return _default_executor
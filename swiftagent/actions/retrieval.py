@@ -0,0 +1,140 @@
+import threading
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from swiftagent.actions.base import Action
+
+
+class ActionRetriever:
+    """
+    Pre-selects the actions relevant to a task, so that an agent with many
+    registered actions (several ActionSets) only sends the top-k tool schemas
+    to the model instead of all of them on every turn.
+
+    Each action is embedded once, from its name and description, when it is
+    registered (`add_many` embeds a whole ActionSet in one batch);
+    re-registering an action only re-embeds it if its description changed.
+    Actions that reach `select` without having been registered, e.g. ones
+    added before the retriever was attached, are embedded then. Pinned
+    actions are always included.
+
+    Example:
+
+        agent = SwiftAgent(
+            name="analyst",
+            action_retriever=ActionRetriever(top_k=6, pinned=["web_search"]),
+        )
+    """
+
+    def __init__(
+        self,
+        embedding_function: Optional[Any] = None,
+        top_k: int = 8,
+        pinned: Iterable[str] = (),
+    ):
+        """
+        Args:
+            embedding_function: Called with a list of strings, returns one
+                vector per string (any Chroma-style embedding function).
+                Defaults to the embedding function of the Chroma storage.
+            top_k: Number of actions selected per task (besides the pins).
+            pinned: Names of actions that are always selected.
+        """
+        self._embedding_function = embedding_function
+        self.top_k = top_k
+        self.pinned: set[str] = set(pinned)
+
+        self._texts: dict[str, str] = {}
+        self._vectors: dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def embedding_function(self) -> Any:
+        if self._embedding_function is None:
+            from swiftagent.prebuilt.storage.chroma import (
+                default_embedding_function,
+            )
+
+            self._embedding_function = default_embedding_function
+        return self._embedding_function
+
+    @staticmethod
+    def describe(action: Action) -> str:
+        return f"{action.name}: {action.description or ''}"
+
+    def add(self, action: Action) -> "ActionRetriever":
+        """Register (or update) an action and embed it."""
+        return self.add_many([action])
+
+    def add_many(self, actions: Iterable[Action]) -> "ActionRetriever":
+        """Register (or update) actions and embed them in one batch."""
+        self._register(actions)
+        self.index()
+        return self
+
+    def _register(self, actions: Iterable[Action]) -> None:
+        with self._lock:
+            for action in actions:
+                text = self.describe(action)
+                if self._texts.get(action.name) != text:
+                    self._texts[action.name] = text
+                    self._vectors.pop(action.name, None)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._texts.pop(name, None)
+            self._vectors.pop(name, None)
+
+    def pin(self, *names: str) -> "ActionRetriever":
+        self.pinned.update(names)
+        return self
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.asarray(self.embedding_function(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def index(self) -> None:
+        """Embed every action registered since the last call, in one batch."""
+        with self._lock:
+            stale = [n for n in self._texts if n not in self._vectors]
+            texts = [self._texts[n] for n in stale]
+        if not stale:
+            return
+
+        vectors = self._embed(texts)
+        with self._lock:
+            for name, text, vector in zip(stale, texts, vectors):
+                # Skip entries updated or removed while we were embedding
+                if self._texts.get(name) == text:
+                    self._vectors[name] = vector
+
+    def select(self, task: str, actions: list[Action]) -> list[Action]:
+        """
+        Return the pinned actions plus the `top_k` actions most similar to
+        `task`, in their original order. Small action lists are returned as
+        they are.
+        """
+        if len(actions) <= self.top_k or not task.strip():
+            return list(actions)
+
+        # Fallback for actions registered before the retriever was attached
+        self._register(a for a in actions if a.name not in self._texts)
+        self.index()
+
+        candidates = [
+            a
+            for a in actions
+            if a.name not in self.pinned and a.name in self._vectors
+        ]
+        keep = {a.name for a in actions if a.name in self.pinned}
+
+        if candidates:
+            matrix = np.stack([self._vectors[a.name] for a in candidates])
+            scores = matrix @ self._embed([task])[0]
+            k = min(self.top_k, len(candidates))
+            for i in np.argpartition(-scores, k - 1)[:k]:
+                keep.add(candidates[i].name)
+
+        return [a for a in actions if a.name in keep]
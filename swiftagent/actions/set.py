@@ -3,6 +3,8 @@ import inspect
 
 # Assuming you have your existing Action class available:
 from swiftagent.actions.base import Action
+from swiftagent.actions.execution import ExecutionPolicy
+from swiftagent.actions.cache import ActionCache
 
 
 class ActionSet:
@@ -50,6 +52,9 @@ class ActionSet:
         description: Optional[str] = None,
         params: Optional[Dict[str, str]] = None,
         strict: Optional[bool] = None,
+        execution: Optional[ExecutionPolicy | str] = None,
+        cache: bool | dict | ActionCache | None = None,
+        timeout: Optional[float] = None,
     ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
         """
         Decorator to register a function as an Action within this ActionSet.
@@ -63,6 +68,11 @@ class ActionSet:
             description: Optional description of the action.
             params: Optional dictionary describing each parameter.
             strict: Optional override of the ActionSet’s strict flag for this action.
+            execution: Where a synchronous function runs ("inline", "thread"
+                or "process"); defaults to the agent's thread pool.
+            cache: Memoize results (True, ActionCache options dict, or an
+                ActionCache instance).
+            timeout: Seconds a single call may take inside the reasoning loop.
 
         Returns:
             A decorator that returns the wrapped action function.
@@ -79,6 +89,9 @@ class ActionSet:
                 description=description or func.__doc__ or "",
                 params=params or {},
                 strict=actual_strict,
+                execution=execution,
+                cache=cache,
+                timeout=timeout,
             )
             # Store the action using its name as the key
             self._actions[action_instance.name] = action_instance
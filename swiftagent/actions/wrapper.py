@@ -1,6 +1,8 @@
 from typing import Callable, Optional
 from functools import wraps
 from swiftagent.actions.base import Action
+from swiftagent.actions.execution import ExecutionPolicy
+from swiftagent.actions.cache import ActionCache
 
 
 def action(
@@ -8,6 +10,9 @@ def action(
     description: Optional[str] = None,
     params: Optional[dict[str, str]] = None,
     strict: bool = True,
+    execution: Optional[ExecutionPolicy | str] = None,
+    cache: bool | dict | ActionCache | None = None,
+    timeout: Optional[float] = None,
 ):
     """
     Standalone decorator that transforms a function into an Action-compatible format.
@@ -18,6 +23,11 @@ def action(
         description: Description of what the action does
         params: Dictionary of parameter descriptions
         strict: Whether to enforce strict parameter checking
+        execution: Where a synchronous function runs ("inline", "thread"
+            or "process"); defaults to the agent's thread pool
+        cache: Memoize results (True, ActionCache options dict, or an
+            ActionCache instance)
+        timeout: Seconds a single call may take inside the reasoning loop
     """
 
     def decorator(func: Callable):
@@ -28,6 +38,9 @@ def action(
             description=description or func.__doc__ or "",
             params=params or {},
             strict=strict,
+            execution=execution,
+            cache=cache,
+            timeout=timeout,
         )
 
         # Store the action instance on the function itself
@@ -1,20 +1,27 @@
 import asyncio
+from contextlib import asynccontextmanager
 from functools import wraps
 from typing import Callable, Any, Optional, Type, overload, Annotated
 from swiftagent.actions.set import ActionSet
 from swiftagent.application.types import RuntimeType
 from swiftagent.actions.base import Action
+from swiftagent.actions.execution import ActionExecutor, ExecutionPolicy
+from swiftagent.actions.cache import ActionCache
+from swiftagent.actions.retrieval import ActionRetriever
 
 
 from swiftagent.reasoning.base import BaseReasoning
 from swiftagent.reasoning.salient import SalientMemoryReasoning
+from swiftagent.reasoning.context import ContextManager
 
 from swiftagent.memory.long_term import LongTermMemory
 from swiftagent.memory.working import WorkingMemory
+from swiftagent.memory.recall import RecallCoordinator
+from swiftagent.application.jobs import IngestJobManager
 
 from starlette.requests import Request
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 from starlette.routing import Route
 import uvicorn
 import websockets
@@ -58,6 +65,12 @@ class SwiftAgent:
         working_memory: Optional[WorkingMemory] = None,
         long_term_memory: Optional[LongTermMemory] = None,
         semantic_memory_sections: list[SemanticMemory] = [],
+        max_parallel_actions: Optional[int] = None,
+        action_workers: Optional[int] = None,
+        context: Optional[ContextManager] = None,
+        action_retriever: Optional[ActionRetriever] = None,
+        recall_coordinator: Optional[RecallCoordinator] = None,
+        max_ingest_jobs: int = 2,
     ):
         self.name = name
         self.description = description
@@ -83,12 +96,28 @@ class SwiftAgent:
         self.last_pong: Optional[float] = None
         self.suite_connection: Optional[WebSocketServerProtocol] = None
 
+        # Bounded pool that synchronous actions run in, off the event loop
+        self.action_executor = ActionExecutor(max_workers=action_workers)
+
+        # Background ingestion into semantic memory stores (server mode)
+        self.ingest_jobs = IngestJobManager(max_concurrent=max_ingest_jobs)
+
+        # Per-query budget (seconds / LLM turns), set through `run`
+        self.query_timeout: Optional[float] = None
+        self.max_turns: Optional[int] = None
+
         # If verbose, attach a console for Rich printing. Otherwise None.
         self.console = Console(theme=client_cli_default) if verbose else None
 
         if episodic_memory:
             self.reasoning = SalientMemoryReasoning(
-                "test_stm", self.instruction
+                "test_stm",
+                self.instruction,
+                max_parallel_actions=max_parallel_actions,
+                action_executor=self.action_executor,
+                context=context,
+                action_retriever=action_retriever,
+                recall_coordinator=recall_coordinator,
             )
 
             self._create_or_replace_working_memory()
@@ -101,7 +130,13 @@ class SwiftAgent:
             self.working_memory = None
             self.long_term_memory = None
             self.reasoning = BaseReasoning(
-                name=self.name, instructions=self.instruction
+                name=self.name,
+                instructions=self.instruction,
+                max_parallel_actions=max_parallel_actions,
+                action_executor=self.action_executor,
+                context=context,
+                action_retriever=action_retriever,
+                recall_coordinator=recall_coordinator,
             )
 
         if episodic_memory and working_memory:
@@ -159,6 +194,17 @@ class SwiftAgent:
 
         return self
 
+    def close(self, wait: bool = True) -> None:
+        """
+        Shut down the pools the agent runs actions and ingest jobs in. They
+        are started again if the agent is used after closing.
+
+        Args:
+            wait: Wait for running actions and ingest jobs to finish.
+        """
+        self.action_executor.shutdown(wait=wait)
+        self.ingest_jobs.shutdown(wait=wait)
+
     def _print(self, message: str):
         """Helper to safely print only if verbose."""
         if self.verbose and self.console:
@@ -190,6 +236,9 @@ class SwiftAgent:
         description: Optional[str] = None,
         params: Optional[dict[str, str]] = None,
         strict: bool = True,
+        execution: Optional[ExecutionPolicy | str] = None,
+        cache: bool | dict | ActionCache | None = None,
+        timeout: Optional[float] = None,
     ):
         """Decorator to register an action with the agent."""
 
@@ -200,6 +249,9 @@ class SwiftAgent:
                 description=description,
                 params=params,
                 strict=strict,
+                execution=execution,
+                cache=cache,
+                timeout=timeout,
             )
 
             self.add_action(action.name, action)
@@ -239,7 +291,8 @@ class SwiftAgent:
         Adds all actions from an ActionSet to this agent.
         """
         for action_instance in actionset.actions:
-            self.add_action(action_instance.name, action_instance)
+            self._actions[action_instance.name] = action_instance
+        self.reasoning.set_actions(list(actionset.actions))
 
     def resource(
         self,
@@ -331,10 +384,36 @@ class SwiftAgent:
 
     async def _process(self, query: str):
         return (
-            await self.reasoning.flow(task=query, llm=self.llm)
+            await self.reasoning.flow(
+                task=query,
+                llm=self.llm,
+                timeout=self.query_timeout,
+                max_turns=self.max_turns,
+            )
             # )[-2:]
         )[-1]["content"]
 
+    def _process_stream(self, query: str):
+        return self.reasoning.flow_stream(
+            task=query,
+            llm=self.llm,
+            timeout=self.query_timeout,
+            max_turns=self.max_turns,
+        )
+
+    async def stream(self, task: str):
+        """
+        Stream a query in STANDARD mode. Yields the reasoning events
+        (see `BaseReasoning.flow_stream`): "delta" text as it is generated,
+        "tool_call"/"tool_result" events, and a last "final" event holding
+        the complete answer.
+        """
+        async for event in self._process_stream(task):
+            yield event
+
+        if self.auto_save and self.persist_path:
+            self.save()
+
     ##############################
     # Persistent Agent Mode
     ##############################
@@ -343,6 +422,11 @@ class SwiftAgent:
         """Create Starlette app with single process route"""
         routes = [
             Route(f"/{self.name}", self._process_persistent, methods=["POST"]),
+            Route(
+                f"/{self.name}/stream",
+                self._process_persistent_stream,
+                methods=["POST"],
+            ),
             Route(
                 f"/{self.name}/add_memory_store",
                 self._add_memory_store,
@@ -353,8 +437,24 @@ class SwiftAgent:
                 self._ingest_memory_store,
                 methods=["POST"],
             ),
+            Route(
+                f"/{self.name}/ingest_jobs",
+                self._list_ingest_jobs,
+                methods=["GET"],
+            ),
+            Route(
+                f"/{self.name}/ingest_jobs/{{job_id}}",
+                self._get_ingest_job,
+                methods=["GET"],
+            ),
         ]
-        return Starlette(routes=routes)
+        return Starlette(routes=routes, lifespan=self._server_lifespan)
+
+    @asynccontextmanager
+    async def _server_lifespan(self, app: Starlette):
+        yield
+        # Server shutdown: release the worker threads and processes
+        await asyncio.to_thread(self.close)
 
     async def _process_persistent(self, request: Request):
         """HTTP endpoint that handles process requests"""
@@ -393,6 +493,30 @@ class SwiftAgent:
                 status_code=500,
             )
 
+    async def _process_persistent_stream(self, request: Request):
+        """
+        HTTP endpoint that streams the reasoning events of a query as
+        Server-Sent Events (one JSON event per `data:` line).
+        """
+        data: dict[str, str] = await request.json()
+        query = data.get("query")
+
+        self._print(
+            f"[bright_black][[/bright_black][cyan]Client[/cyan][bright_black] →[/bright_black] "
+            f"[green]{self.name}[/green][bright_black]][/bright_black] "
+            f"[white]{query}[/white]"
+        )
+
+        async def event_source():
+            try:
+                async for event in self._process_stream(query):
+                    yield f"data: {json.dumps(event)}\n\n"
+            except Exception as e:
+                error = {"type": "error", "message": str(e)}
+                yield f"data: {json.dumps(error)}\n\n"
+
+        return StreamingResponse(event_source(), media_type="text/event-stream")
+
     async def _add_memory_store(self, request: Request):
         """
         Create a new semantic memory store by name.
@@ -437,6 +561,10 @@ class SwiftAgent:
         """
         Ingest content into an existing semantic memory store by name.
         Expected JSON body: {"store_name": "some_unique_identifier", "content": "some text to store"}
+
+        The ingestion runs as a background job; the response (202) carries
+        its id, to poll at GET /{name}/ingest_jobs/{job_id}. With
+        `"wait": true` the response is only sent once the job finished.
         """
         try:
             data = await request.json()
@@ -461,13 +589,39 @@ class SwiftAgent:
                     status_code=400,
                 )
 
-            # Ingest the content into the requested memory store
-            self.semantic_memories[store_name].ingest(content)
+            # Ingest the content into the requested memory store, off the
+            # event loop
+            job = self.ingest_jobs.submit(
+                self.semantic_memories[store_name], store_name, content
+            )
+            if not data.get("wait"):
+                return JSONResponse(
+                    {
+                        "status": "success",
+                        "message": f"Ingestion into store '{store_name}' queued.",
+                        "job_id": job.id,
+                        "job": job.to_dict(),
+                    },
+                    status_code=202,
+                )
 
+            await job.wait()
+            if job.status == "failed":
+                return JSONResponse(
+                    {
+                        "status": "error",
+                        "message": job.error,
+                        "job_id": job.id,
+                        "job": job.to_dict(),
+                    },
+                    status_code=500,
+                )
             return JSONResponse(
                 {
                     "status": "success",
                     "message": f"Content ingested into store '{store_name}'.",
+                    "job_id": job.id,
+                    "job": job.to_dict(),
                 }
             )
 
@@ -476,6 +630,23 @@ class SwiftAgent:
                 {"status": "error", "message": str(e)}, status_code=500
             )
 
+    async def _list_ingest_jobs(self, request: Request):
+        """Status of recent ingest jobs (optionally ?store_name=...)."""
+        jobs = self.ingest_jobs.list(request.query_params.get("store_name"))
+        return JSONResponse(
+            {"status": "success", "jobs": [job.to_dict() for job in jobs]}
+        )
+
+    async def _get_ingest_job(self, request: Request):
+        """Status and progress of one ingest job."""
+        job = self.ingest_jobs.get(request.path_params["job_id"])
+        if job is None:
+            return JSONResponse(
+                {"status": "error", "message": "Unknown ingest job."},
+                status_code=404,
+            )
+        return JSONResponse({"status": "success", "job": job.to_dict()})
+
     ##############################
     # Hosted Agent Mode
     ##############################
@@ -522,10 +693,29 @@ class SwiftAgent:
                 request_id = data.get("request_id")
                 query = data.get("query", "")
 
-                # Run your normal reasoning logic
-                result_list = await self._process(
-                    query
-                )  # result is typically a list or string
+                try:
+                    if data.get("stream"):
+                        # Forward every reasoning event as it happens; the
+                        # final answer still goes out as agent_query_response
+                        result_list = None
+                        async for event in self._process_stream(query):
+                            if event["type"] == "final":
+                                result_list = event["content"]
+                            elif request_id:
+                                await self.send_message(
+                                    "agent_query_chunk",
+                                    request_id=request_id,
+                                    chunk=event,
+                                )
+                    else:
+                        # Run your normal reasoning logic
+                        result_list = await self._process(
+                            query
+                        )  # result is typically a list or string
+                except Exception as e:
+                    # Always answer, or the suite (and a whole pipeline
+                    # tier) would wait on this request forever
+                    result_list = f"Error: {e}"
                 # Let's just use the final item as a string result
                 # or join them if it's multiple
                 if isinstance(result_list, list):
@@ -574,12 +764,17 @@ class SwiftAgent:
         host: str | None = None,
         port: int | None = None,
         runtime: RuntimeType | str = RuntimeType.STANDARD,
+        timeout: float | None = None,
+        max_turns: int | None = None,
     ):
         """
         Run the SwiftAgent in either server or public mode.
 
         Args:
             mode: Either 'server' (local HTTP server) or 'public' (websocket client)
+            timeout: Wall-clock budget (seconds) for each query, covering
+                every LLM turn and tool call. Applies to all runtimes.
+            max_turns: Maximum number of LLM turns per query.
             **kwargs: Additional arguments
                 For server mode:
                     - host: Server host (default: "0.0.0.0")
@@ -593,6 +788,11 @@ class SwiftAgent:
             except KeyError:
                 raise ValueError(f"Invalid runtime value: {runtime}")
 
+        if timeout is not None:
+            self.query_timeout = timeout
+        if max_turns is not None:
+            self.max_turns = max_turns
+
         if runtime == RuntimeType.STANDARD:
             self._print(
                 Panel(
@@ -651,5 +851,8 @@ class SwiftAgent:
                     await asyncio.sleep(1)
             except:
                 connection_task.cancel()
+            finally:
+                # Connection over: release the worker threads and processes
+                self.close(wait=False)
         else:
             raise ValueError(f"Unknown runtime: {runtime}")
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from swiftagent.memory.ingest import IngestStats
+from swiftagent.memory.semantic import SemanticMemory
+
+JOB_STATES = ("queued", "running", "completed", "failed")
+
+
+@dataclass
+class IngestJob:
+    """
+    One background ingestion into a semantic memory store.
+
+    `stats` is updated live by the ingestion pipeline, so `to_dict` can be
+    polled for progress while the job runs.
+    """
+
+    store_name: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "queued"
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    stats: IngestStats = field(default_factory=IngestStats)
+    _future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    async def wait(self) -> "IngestJob":
+        """Wait (without blocking the event loop) until the job finishes."""
+        if self._future is not None:
+            await asyncio.wrap_future(self._future)
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "store_name": self.store_name,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": {
+                "sources": self.stats.sources,
+                "skipped_sources": self.stats.skipped_sources,
+                "chunks": self.stats.chunks,
+                "embedded": self.stats.embedded,
+                "batches": self.stats.batches,
+                "seconds": round(self.stats.seconds, 3),
+                "chunks_per_second": round(self.stats.chunks_per_second, 1),
+            },
+        }
+
+
+class IngestJobManager:
+    """
+    Runs semantic-memory ingestion off the event loop, so a large ingest
+    does not stall the agent's other requests. At most `max_concurrent`
+    jobs run at once; further jobs wait in the queue. The most recent
+    `keep_finished` finished jobs stay queryable.
+
+    Example:
+
+        job = agent.ingest_jobs.submit(memory, "docs", "/data/report.pdf")
+        job.to_dict()["progress"]["chunks"]
+        await job.wait()
+    """
+
+    def __init__(self, max_concurrent: int = 2, keep_finished: int = 100):
+        """
+        Args:
+            max_concurrent: Ingest jobs running at the same time.
+            keep_finished: Finished jobs remembered for status queries.
+        """
+        self.max_concurrent = max_concurrent
+        self.keep_finished = keep_finished
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: OrderedDict[str, IngestJob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent,
+                thread_name_prefix="ingest-job",
+            )
+        return self._executor
+
+    def submit(
+        self,
+        memory: SemanticMemory,
+        store_name: str,
+        content: str | list[str],
+        **ingest_options,
+    ) -> IngestJob:
+        """
+        Queue `content` for ingestion into `memory` and return immediately.
+
+        Args:
+            memory: Destination memory.
+            store_name: Name reported in the job status.
+            content: Text, path or URL (or a list of them).
+            **ingest_options: Passed to SemanticMemory.ingest_many
+                (batch_size, workers, max_pending, convert_workers).
+        """
+        job = IngestJob(store_name=store_name)
+        sources = content if isinstance(content, list) else [content]
+
+        def run() -> None:
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                memory.ingest_many(sources, stats=job.stats, **ingest_options)
+                job.status = "completed"
+            except Exception as e:
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_finished()
+        job._future = self._get_executor().submit(run)
+        return job
+
+    def _forget_finished(self) -> None:
+        finished = [id for id, job in self._jobs.items() if job.done]
+        for id in finished[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[id]
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, store_name: Optional[str] = None) -> list[IngestJob]:
+        with self._lock:
+            return [
+                job
+                for job in self._jobs.values()
+                if store_name is None or job.store_name == store_name
+            ]
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -1,5 +1,5 @@
 import aiohttp
-from typing import Any, Literal
+from typing import Any, Callable, Literal, Optional
 
 import asyncio
 import websockets
@@ -42,6 +42,10 @@ class SwiftClient:
         # Keep track of pending requests => Future objects
         # key: request_id => value: Future that we set_result(...) upon receiving the response
         self.pending_ws_requests = {}
+
+        # key: request_id => callable invoked with each streamed chunk
+        self.ws_chunk_handlers: dict[str, Callable[[dict], Any]] = {}
+
         self.client_name = name
         self.console = Console(theme=client_cli_default)
 
@@ -55,8 +59,15 @@ class SwiftClient:
         query: str,
         agent: str | None = None,
         return_all: bool = False,
+        stream: bool = False,
     ):
         if self.mode == ClientConnectionMode.AGENT:
+            if stream:
+                result = None
+                async for event in self.process_query_stream(query, agent):
+                    if event["type"] == "final":
+                        result = event["content"]
+                return result
             return await self.process_query(query, agent)
         elif self.mode == ClientConnectionMode.SUITE:
             await self._connect_to_suite()
@@ -66,7 +77,9 @@ class SwiftClient:
                     query, return_all
                 )
             else:
-                response = await self.process_query_ws(agent, query)
+                response = await self.process_query_ws(
+                    agent, query, stream=stream
+                )
 
             await self._close_connection_to_suite()
 
@@ -135,6 +148,58 @@ class SwiftClient:
                     f"Failed to communicate with SwiftAgent: {str(e)}"
                 )
 
+    async def process_query_stream(self, query: str, agent_name: str):
+        """
+        Stream a query to a persistent SwiftAgent server.
+
+        Yields the agent's reasoning events as they arrive ("delta",
+        "tool_call", "tool_result" and finally "final"). Text deltas are
+        echoed to the console as they come in.
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+            ValueError: If the server reports an error mid-stream
+        """
+        self.console.print(
+            Panel(
+                f"[info]Query:[/info] {query}",
+                title=f"[ws]→ Sending to {agent_name}[/ws]",
+                box=box.ROUNDED,
+                border_style="blue",
+            )
+        )
+
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                f"http://{self.base_url}/{agent_name}/stream",
+                json={"query": query},
+                headers={"Content-Type": "application/json"},
+            ) as response:
+                response.raise_for_status()
+
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+
+                    event = json.loads(line[len("data:") :])
+                    if event.get("type") == "error":
+                        raise ValueError(
+                            f"Server error: {event.get('message')}"
+                        )
+
+                    self._print_chunk(event)
+                    yield event
+
+        self.console.print()
+
+    def _print_chunk(self, chunk: dict):
+        """Echo a streamed text delta to the console, without a newline."""
+        if chunk.get("type") == "delta":
+            self.console.print(
+                chunk.get("content", ""), end="", markup=False, highlight=False
+            )
+
     async def add_memory_store(self, agent_name: str, store_name: str):
         """
         Create a new memory store on the given agent (in persistent mode).
@@ -147,17 +212,79 @@ class SwiftClient:
                 return await resp.json()
 
     async def ingest_memory_store(
-        self, agent_name: str, store_name: str, content: str
-    ):
+        self,
+        agent_name: str,
+        store_name: str,
+        content: str | list[str],
+        wait: bool = True,
+        poll_interval: float = 0.5,
+        timeout: Optional[float] = None,
+    ) -> dict[str, Any]:
         """
-        Ingest text into an existing memory store on the given agent.
+        Ingest text (or files/URLs) into an existing memory store on the
+        given agent. The agent ingests in the background.
+
+        Args:
+            wait: Poll until the job finishes and return its final status;
+                with False, return the job handle right away (see
+                `get_ingest_job` / `wait_for_ingest_job`).
+            poll_interval: Seconds between status polls.
+            timeout: Give up waiting after this many seconds.
+
+        Returns:
+            The job status dict ("job_id", "status", "progress", ...).
+
+        Raises:
+            ValueError: If the ingestion fails.
         """
         async with aiohttp.ClientSession() as session:
             url = f"http://{self.base_url}/{agent_name}/ingest_memory_store"
             payload = {"store_name": store_name, "content": content}
             async with session.post(url, json=payload) as resp:
                 resp.raise_for_status()
-                return await resp.json()
+                result = await resp.json()
+
+        job = result["job"]
+        if not wait:
+            return job
+        return await self.wait_for_ingest_job(
+            agent_name, job["job_id"], poll_interval, timeout
+        )
+
+    async def get_ingest_job(
+        self, agent_name: str, job_id: str
+    ) -> dict[str, Any]:
+        """Current status and progress of an ingest job."""
+        async with aiohttp.ClientSession() as session:
+            url = f"http://{self.base_url}/{agent_name}/ingest_jobs/{job_id}"
+            async with session.get(url) as resp:
+                resp.raise_for_status()
+                return (await resp.json())["job"]
+
+    async def wait_for_ingest_job(
+        self,
+        agent_name: str,
+        job_id: str,
+        poll_interval: float = 0.5,
+        timeout: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """
+        Poll an ingest job until it finishes.
+
+        Raises:
+            ValueError: If the job failed.
+            TimeoutError: If `timeout` seconds pass first.
+        """
+        deadline = None if timeout is None else self.loop.time() + timeout
+        while True:
+            job = await self.get_ingest_job(agent_name, job_id)
+            if job["status"] == "failed":
+                raise ValueError(f"Ingestion failed: {job.get('error')}")
+            if job["status"] == "completed":
+                return job
+            if deadline is not None and self.loop.time() >= deadline:
+                raise TimeoutError(f"Ingest job {job_id} still {job['status']}")
+            await asyncio.sleep(poll_interval)
 
     ##############################
     # Hosted
@@ -191,10 +318,20 @@ class SwiftClient:
         if self.ws_listen_task:
             self.ws_listen_task.cancel()
 
-    async def process_query_ws(self, agent_name: str, query: str) -> str:
+    async def process_query_ws(
+        self,
+        agent_name: str,
+        query: str,
+        stream: bool = False,
+        on_chunk: Optional[Callable[[dict], Any]] = None,
+    ) -> str:
         """
         Send a query via WebSocket to the SwiftSuite for agent_name and wait for response.
         Returns the result as a string.
+
+        With `stream=True` the agent streams its reasoning events; each one is
+        passed to `on_chunk` (default: echo text deltas to the console) before
+        the final result arrives.
         """
         if not self.connection:
             raise ConnectionError(
@@ -218,16 +355,27 @@ class SwiftClient:
             )
         )
 
+        if stream:
+            self.ws_chunk_handlers[request_id] = on_chunk or self._print_chunk
+
         await self._send_message_to_suite(
             message_type="client_query",
             agent_name=agent_name,
             query=query,
             request_id=request_id,
+            stream=stream,
         )
 
-        # Show thinking animation while waiting
-        with Status("[ws]Agent thinking...[/ws]", spinner="dots") as status:
-            result = await future
+        if stream:
+            try:
+                result = await future
+            finally:
+                self.ws_chunk_handlers.pop(request_id, None)
+            self.console.print()
+        else:
+            # Show thinking animation while waiting
+            with Status("[ws]Agent thinking...[/ws]", spinner="dots") as status:
+                result = await future
 
         # Show result
         self.console.print(
@@ -268,6 +416,12 @@ class SwiftClient:
                         fut = self.pending_ws_requests.pop(req_id)
                         fut.set_result(data["result"])
 
+                # Streamed chunk of a single-agent response
+                elif msg_type == "client_query_chunk":
+                    handler = self.ws_chunk_handlers.get(data.get("request_id"))
+                    if handler:
+                        handler(data.get("chunk") or {})
+
                 # Multi-agent pipeline final response
                 elif msg_type == "client_multi_agent_query_response":
                     req_id = data.get("request_id")
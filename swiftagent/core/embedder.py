@@ -1,8 +1,11 @@
 from typing import TypeAlias, Protocol, Callable, Union, List
 import numpy as np
 from functools import wraps
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from chromadb import Documents, EmbeddingFunction, Embeddings
 
+from swiftagent.core.embedding_cache import EmbeddingCache
+
 SwiftEmbedder: TypeAlias = EmbeddingFunction
 
 """
@@ -22,12 +25,67 @@ class SingleEmbedFunction(Protocol):
     def __call__(self, text: str) -> np.ndarray | list[float]: ...
 
 
-def embedder(func: SingleEmbedFunction) -> SwiftEmbedder:
+class BatchEmbedFunction(Protocol):
+    def __call__(self, texts: List[str]) -> np.ndarray: ...
+
+
+_unpickled_functions: dict[int, Callable] = {}
+
+
+def _embed_pickled(payload: bytes, texts: List[str]) -> np.ndarray:
+    """Process-pool trampoline; each worker unpickles the function once."""
+    key = hash(payload)
+    func = _unpickled_functions.get(key)
+    if func is None:
+        import cloudpickle
+
+        func = _unpickled_functions[key] = cloudpickle.loads(payload)
+    return np.asarray(func(texts), dtype=np.float32)
+
+
+def _resolve_cache(
+    cache: EmbeddingCache | bool, model_id: str | None
+) -> EmbeddingCache | None:
+    if isinstance(cache, EmbeddingCache):
+        return cache
+    if not cache:
+        return None
+    if not model_id:
+        # Function names are not unique (every script has its `embed`), so
+        # they cannot key a persistent cache
+        raise ValueError("cache=True needs an explicit model_id")
+    return EmbeddingCache.for_model(model_id)
+
+
+def embedder(
+    func: SingleEmbedFunction | None = None,
+    *,
+    cache: EmbeddingCache | bool = False,
+    model_id: str | None = None,
+) -> SwiftEmbedder:
+    """
+    Turn a single-text embedding function into a SwiftEmbedder.
+
+    Use as `@embedder` or `@embedder(cache=True, model_id="my-model")`. With
+    `cache`, vectors are served from the on-disk EmbeddingCache of
+    `model_id` (or from the given EmbeddingCache) and only unseen texts are
+    passed to `func`.
+    """
+    if func is None:
+        return lambda f: embedder(f, cache=cache, model_id=model_id)
+
+    embedding_cache = _resolve_cache(cache, model_id)
+
+    def embed_all(docs: list[str]) -> Embeddings:
+        return [func(doc) for doc in docs]
+
     # Create a function that will become our instance method
     def wrapped_call(self, input: Documents) -> Embeddings:
         if isinstance(input, str):
-            return [func(input)]
-        return [func(doc) for doc in input]
+            input = [input]
+        if embedding_cache is not None:
+            return embedding_cache.embed(list(input), embed_all)
+        return embed_all(input)
 
     # Create the wrapper class without trying to use @wraps
     class WrappedEmbeddingFunction(EmbeddingFunction):
@@ -36,8 +94,133 @@ def embedder(func: SingleEmbedFunction) -> SwiftEmbedder:
         __doc__ = func.__doc__
         __module__ = func.__module__
 
+        model_id = (
+            embedding_cache.model_id if embedding_cache is not None else None
+        )
+        # Lets collections know the vectors are already cached
+        cache = embedding_cache
+
         # Define call method
         __call__ = wrapped_call
 
     # Return an instance
     return WrappedEmbeddingFunction()
+
+
+def batch_embedder(
+    func: BatchEmbedFunction | None = None,
+    *,
+    batch_size: int = 64,
+    sort_by_length: bool = True,
+    parallel: str | Executor | None = None,
+    max_workers: int | None = None,
+    cache: EmbeddingCache | bool = False,
+    model_id: str | None = None,
+) -> SwiftEmbedder:
+    """
+    Turn a batch embedding function (`List[str] -> ndarray`) into a
+    SwiftEmbedder that keeps the model's batching.
+
+    Inputs are split into batches of `batch_size`, sorted by length first
+    so that each batch needs little padding, and the results are written
+    back in input order into one contiguous float32 matrix. Batches can be
+    fanned out to a pool: `parallel="thread"` (models that release the GIL,
+    remote APIs), `"process"` (the function is cloudpickled to the workers)
+    or any concurrent.futures Executor.
+
+    Calling the embedder goes through Chroma's validation, which returns the
+    matrix as a list of row views; `.embed(texts)` returns the matrix itself.
+
+    Example:
+
+        model = SentenceTransformer("all-MiniLM-L6-v2")
+
+        @batch_embedder(batch_size=128, cache=True, model_id="minilm-l6")
+        def embed(texts: list[str]) -> np.ndarray:
+            return model.encode(texts)
+    """
+    if func is None:
+        return lambda f: batch_embedder(
+            f,
+            batch_size=batch_size,
+            sort_by_length=sort_by_length,
+            parallel=parallel,
+            max_workers=max_workers,
+            cache=cache,
+            model_id=model_id,
+        )
+
+    embedding_cache = _resolve_cache(cache, model_id)
+
+    pool: Executor | None = parallel if isinstance(parallel, Executor) else None
+    payload: bytes | None = None
+
+    def get_pool() -> Executor | None:
+        nonlocal pool, payload
+        if pool is None and parallel == "thread":
+            pool = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="swiftagent-embed",
+            )
+        elif pool is None and parallel == "process":
+            import cloudpickle
+
+            payload = cloudpickle.dumps(func)
+            pool = ProcessPoolExecutor(max_workers=max_workers)
+        return pool
+
+    def run_batch(batch: List[str]) -> np.ndarray:
+        if payload is not None:
+            return _embed_pickled(payload, batch)
+        return np.asarray(func(batch), dtype=np.float32)
+
+    def embed_all(texts: List[str]) -> np.ndarray:
+        order = list(range(len(texts)))
+        if sort_by_length:
+            order.sort(key=lambda i: len(texts[i]))
+        slices = [
+            order[start : start + batch_size]
+            for start in range(0, len(order), batch_size)
+        ]
+        batches = [[texts[i] for i in indices] for indices in slices]
+
+        executor = get_pool() if len(batches) > 1 else None
+        if executor is None:
+            results = [run_batch(batch) for batch in batches]
+        elif payload is not None:
+            results = list(
+                executor.map(_embed_pickled, [payload] * len(batches), batches)
+            )
+        else:
+            results = list(executor.map(run_batch, batches))
+
+        out = np.empty((len(texts), results[0].shape[1]), dtype=np.float32)
+        for indices, result in zip(slices, results):
+            out[indices] = result
+        return out
+
+    def embed(self, input: Documents) -> np.ndarray:
+        texts = [input] if isinstance(input, str) else list(input)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if embedding_cache is not None:
+            return np.stack(embedding_cache.embed(texts, embed_all))
+        return embed_all(texts)
+
+    class WrappedBatchEmbeddingFunction(EmbeddingFunction):
+        __name__ = func.__name__
+        __doc__ = func.__doc__
+        __module__ = func.__module__
+
+        model_id = (
+            embedding_cache.model_id if embedding_cache is not None else None
+        )
+        # Lets collections know the vectors are already cached
+        cache = embedding_cache
+
+        __call__ = embed
+
+    # Chroma wraps __call__ with its validation; `embed` stays raw
+    WrappedBatchEmbeddingFunction.embed = embed
+
+    return WrappedBatchEmbeddingFunction()
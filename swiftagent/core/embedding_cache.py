@@ -0,0 +1,305 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+
+from swiftagent.constants import CACHE_DIR
+
+DIGEST_SIZE = 32  # sha256
+
+
+def embedding_model_id(embedding_function: Any) -> str:
+    """
+    Stable identifier of the model behind an embedding function, used to
+    keep cached vectors of different models apart: its `model_id`
+    attribute, or Chroma's `name()` of a built-in embedding function (plus
+    its model name). Raises ValueError when neither is available, since a
+    function name alone does not identify a model.
+    """
+    model_id = getattr(embedding_function, "model_id", None)
+    if model_id:
+        return str(model_id)
+
+    try:
+        name = embedding_function.name()
+    except Exception:
+        name = None
+    if not isinstance(name, str):
+        raise ValueError(
+            "Cannot derive a model id for the embedding cache from "
+            f"{embedding_function!r}; pass `model_id` (e.g. "
+            "@embedder(cache=True, model_id=...)) or an EmbeddingCache."
+        )
+
+    parts = [name]
+    for attribute in ("model_name", "_model_name"):
+        value = getattr(embedding_function, attribute, None)
+        if isinstance(value, str):
+            parts.append(value)
+            break
+
+    return ":".join(parts)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of embeddings for one model.
+
+    Vectors are keyed by the sha256 of the text and stored as float32 rows
+    appended to `vectors.f32`, read back through a memory map; the digest of
+    row i sits at offset 32 * i of `digests.bin`. An in-RAM LRU sits in front
+    of the memory map. Caches are shared per model through `for_model`, so
+    every collection using the same model appends to the same files.
+
+    The files are append-only and meant for a single writing process.
+
+    Example:
+
+        cache = EmbeddingCache.for_model("all-MiniLM-L6-v2")
+        vectors = cache.embed(texts, embedding_function)
+    """
+
+    _shared: dict[str, "EmbeddingCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        model_id: str,
+        path: Optional[str | Path] = None,
+        max_memory_entries: int = 4096,
+    ):
+        """
+        Args:
+            model_id: Identifies the embedding model (see embedding_model_id).
+            path: Directory of the cache files (defaults to
+                CACHE_DIR/embedding_cache/<model_id>).
+            max_memory_entries: Size of the in-RAM LRU.
+        """
+        self.model_id = model_id
+        if path is None:
+            dir_name = re.sub(r"[^\w.-]", "_", model_id)
+            path = CACHE_DIR / "embedding_cache" / dir_name
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_memory_entries = max_memory_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._rows: dict[bytes, int] = {}
+        self._mmap: Optional[np.memmap] = None
+        self.dimension: Optional[int] = None
+
+        self._load()
+
+    @classmethod
+    def for_model(cls, model_id: str, **options) -> "EmbeddingCache":
+        """Return the process-wide cache of `model_id`."""
+        with cls._shared_lock:
+            cache = cls._shared.get(model_id)
+            if cache is None:
+                cache = cls._shared[model_id] = cls(model_id, **options)
+            return cache
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.path / "vectors.f32"
+
+    @property
+    def _digests_path(self) -> Path:
+        return self.path / "digests.bin"
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.path / "meta.json"
+
+    def _load(self) -> None:
+        if not self._meta_path.exists():
+            return
+        meta = json.loads(self._meta_path.read_text())
+        self.dimension = meta["dimension"]
+
+        digests = (
+            self._digests_path.read_bytes()
+            if self._digests_path.exists()
+            else b""
+        )
+        vector_rows = (
+            os.path.getsize(self._vectors_path) // (4 * self.dimension)
+            if self._vectors_path.exists()
+            else 0
+        )
+        # Rows are written before their digests; drop any torn tail so
+        # that the next append stays aligned
+        rows = min(len(digests) // DIGEST_SIZE, vector_rows)
+        if vector_rows > rows or len(digests) > rows * DIGEST_SIZE:
+            os.truncate(self._vectors_path, rows * 4 * self.dimension)
+            os.truncate(self._digests_path, rows * DIGEST_SIZE)
+        for row in range(rows):
+            digest = digests[row * DIGEST_SIZE : (row + 1) * DIGEST_SIZE]
+            self._rows[digest] = row
+
+    @staticmethod
+    def digest(text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    def _read_row(self, row: int) -> np.ndarray:
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            rows = os.path.getsize(self._vectors_path) // (4 * self.dimension)
+            self._mmap = np.memmap(
+                self._vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(rows, self.dimension),
+            )
+        return np.array(self._mmap[row])
+
+    def _remember(self, digest: bytes, vector: np.ndarray) -> None:
+        self._memory[digest] = vector
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: Sequence[str]) -> list[Optional[np.ndarray]]:
+        """Cached vector per text, or None where it is not cached."""
+        out: list[Optional[np.ndarray]] = []
+        with self._lock:
+            for text in texts:
+                digest = self.digest(text)
+                vector = self._memory.get(digest)
+                if vector is None and digest in self._rows:
+                    vector = self._read_row(self._rows[digest])
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._remember(digest, vector)
+                out.append(vector)
+        return out
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Any]) -> None:
+        """Store vectors for texts (already cached texts are skipped)."""
+        rows = np.asarray(vectors, dtype=np.float32)
+        if rows.ndim != 2 or len(rows) != len(texts):
+            raise ValueError("Expected one vector per text")
+
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = int(rows.shape[1])
+                self._meta_path.write_text(
+                    json.dumps(
+                        {"model_id": self.model_id, "dimension": self.dimension}
+                    )
+                )
+            elif rows.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {rows.shape[1]} does not match "
+                    f"cached dimension {self.dimension} for {self.model_id}"
+                )
+
+            new_digests: dict[bytes, np.ndarray] = {}
+            for text, vector in zip(texts, rows):
+                digest = self.digest(text)
+                self._remember(digest, vector)
+                if digest not in self._rows:
+                    new_digests[digest] = vector
+            if not new_digests:
+                return
+
+            first_row = len(self._rows)
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.stack(list(new_digests.values())).tobytes())
+            with open(self._digests_path, "ab") as f:
+                f.write(b"".join(new_digests))
+            for offset, digest in enumerate(new_digests):
+                self._rows[digest] = first_row + offset
+
+    def embed(
+        self,
+        texts: Sequence[str],
+        embed_fn: Callable[[list[str]], Sequence[Any]],
+    ) -> list[np.ndarray]:
+        """
+        Vectors for `texts`, calling `embed_fn` once with only the texts that
+        are not cached yet.
+        """
+        vectors = self.get_many(texts)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            # Embed each distinct missing text once
+            pending = list(dict.fromkeys(texts[i] for i in missing))
+            computed = embed_fn(pending)
+            self.put_many(pending, computed)
+            by_text = dict(zip(pending, computed))
+            for i in missing:
+                vectors[i] = np.asarray(by_text[texts[i]], dtype=np.float32)
+        return vectors
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._rows.clear()
+            self._mmap = None
+            self.dimension = None
+            for path in (
+                self._vectors_path,
+                self._digests_path,
+                self._meta_path,
+            ):
+                path.unlink(missing_ok=True)
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._rows),
+        }
+
+
+class CachedEmbeddingFunction:
+    """
+    Wraps any embedding function (called with a list of texts) so that it is
+    served from an EmbeddingCache. Usable as the embedding function of any
+    VectorCollection implementation.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Any,
+        cache: Optional[EmbeddingCache] = None,
+    ):
+        self.embedding_function = embedding_function
+        self.cache = cache or EmbeddingCache.for_model(
+            embedding_model_id(embedding_function)
+        )
+        self.model_id = self.cache.model_id
+
+    def __eq__(self, other: Any) -> bool:
+        # Collections wrapping the same function are interchangeable, which
+        # lets RecallCoordinator embed a query once for all of them
+        return (
+            isinstance(other, CachedEmbeddingFunction)
+            and other.embedding_function is self.embedding_function
+            and other.cache is self.cache
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.embedding_function), id(self.cache)))
+
+    def __call__(self, input: str | list[str]) -> list[np.ndarray]:
+        texts = [input] if isinstance(input, str) else list(input)
+        return self.cache.embed(texts, self.embedding_function)
@@ -0,0 +1,111 @@
+from typing import Any, Optional
+
+_COMPARISONS = {
+    "$eq": lambda a, b: a == b,
+    "$ne": lambda a, b: a != b,
+    "$gt": lambda a, b: a is not None and a > b,
+    "$gte": lambda a, b: a is not None and a >= b,
+    "$lt": lambda a, b: a is not None and a < b,
+    "$lte": lambda a, b: a is not None and a <= b,
+    "$in": lambda a, b: a in b,
+    "$nin": lambda a, b: a not in b,
+}
+
+
+def match_where(metadata: Optional[dict], where: Optional[dict]) -> bool:
+    """
+    Evaluate a Chroma-style `where` filter against one metadata dict, so that
+    every VectorCollection implementation accepts the same filters.
+
+    Supported: `{"field": value}`, `{"field": {"$op": value}}` with $eq, $ne,
+    $gt, $gte, $lt, $lte, $in, $nin, and `{"$and": [...]}` / `{"$or": [...]}`.
+    Several fields in one dict must all match.
+
+    Example:
+
+        match_where({"type": "ACTION", "ts": 5}, {"ts": {"$gte": 3}})  # True
+    """
+    if not where:
+        return True
+    metadata = metadata or {}
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(match_where(metadata, c) for c in condition):
+                return False
+        elif key == "$or":
+            if not any(match_where(metadata, c) for c in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                compare = _COMPARISONS.get(op)
+                if compare is None:
+                    raise ValueError(f"Unsupported where operator: {op}")
+                try:
+                    if not compare(value, operand):
+                        return False
+                except TypeError:
+                    # e.g. comparing None or mismatched types
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+
+    return True
+
+
+def build_where(
+    item_type: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    where: Optional[dict] = None,
+    timestamp_field: str = "timestamp",
+) -> Optional[dict]:
+    """
+    Combine the common memory filters into one `where` clause.
+
+    Args:
+        item_type: Required value of the "type" field (e.g. "ACTION").
+        since: Minimum epoch timestamp (inclusive).
+        until: Maximum epoch timestamp (inclusive).
+        where: Any further filter, and-ed with the others.
+        timestamp_field: Metadata field holding the epoch timestamp.
+
+    Example:
+
+        build_where("ACTION", since=time.time() - 86400)
+        # {"$and": [{"type": "ACTION"}, {"timestamp": {"$gte": ...}}]}
+    """
+    clauses = []
+    if item_type is not None:
+        clauses.append({"type": item_type})
+    if since is not None:
+        clauses.append({timestamp_field: {"$gte": since}})
+    if until is not None:
+        clauses.append({timestamp_field: {"$lte": until}})
+    if where:
+        clauses.append(where)
+
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def to_chroma_where(where: Optional[dict]) -> Optional[dict]:
+    """
+    Rewrite a filter into the stricter form Chroma accepts: one field (or
+    one $and/$or) per dict and a single operator per field.
+    """
+    if not where:
+        return None
+
+    clauses = []
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            clauses.append({key: [to_chroma_where(c) for c in condition]})
+        elif isinstance(condition, dict) and len(condition) > 1:
+            clauses.extend({key: {op: v}} for op, v in condition.items())
+        else:
+            clauses.append({key: condition})
+
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
@@ -1,3 +1,4 @@
+import hashlib
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any, TypeVar, Union
 import numpy as np
@@ -6,6 +7,23 @@ import numpy as np
 EmbeddingFunctionType = TypeVar("EmbeddingFunctionType")
 
 
+def content_id(
+    collection: str, content: str | bytes, source: Optional[str] = None
+) -> str:
+    """
+    Deterministic record id: a hash of (collection, source key, content), so
+    re-adding the same chunk overwrites it instead of duplicating it.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    digest = hashlib.sha256()
+    for part in (collection.encode("utf-8"), (source or "").encode("utf-8")):
+        digest.update(part)
+        digest.update(b"\0")
+    digest.update(content)
+    return digest.hexdigest()[:32]
+
+
 class VectorDatabase(ABC):
     """
     Abstract base class for managing vector database connections and collections.
@@ -25,6 +43,8 @@ class VectorDatabase(ABC):
         self,
         name: str,
         embedding_function: Optional[EmbeddingFunctionType] = None,
+        index: Optional[str] = None,
+        **index_options,
     ) -> "VectorCollection":
         """
         Get or create a collection with the given name.
@@ -32,6 +52,9 @@ class VectorDatabase(ABC):
         Args:
             name: Collection name
             embedding_function: Optional collection-specific embedding function
+            index: Index type of the collection (implementation specific,
+                e.g. "flat" / "ivf" / "hnsw"); None for the default
+            **index_options: Index parameters (e.g. nlist, nprobe, ef)
         """
         pass
 
@@ -62,23 +85,30 @@ class VectorCollection(ABC):
         vectors: np.ndarray,
         texts: Optional[List[str]] = None,
         metadata: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
     ) -> List[str]:
         """
-        Add vectors to the collection.
+        Add vectors to the collection. Records whose id already exists are
+        replaced (upsert).
 
         Args:
             vectors: Array of vectors to add
             texts: Optional list of text content corresponding to the vectors
             metadata: Optional list of metadata dictionaries
+            ids: Optional ids (defaults to `content_ids`)
 
         Returns:
-            List of generated IDs for the added vectors
+            List of IDs of the added vectors
         """
         pass
 
     @abstractmethod
     def search(
-        self, query_vector: np.ndarray, k: int = 5, include_text: bool = True
+        self,
+        query_vector: np.ndarray,
+        k: int = 5,
+        include_text: bool = True,
+        where: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search for similar vectors.
@@ -87,6 +117,9 @@ class VectorCollection(ABC):
             query_vector: Vector to search for
             k: Number of results to return
             include_text: Whether to include the text content in results
+            where: Optional Chroma-style metadata filter (see
+                swiftagent.core.filters.match_where), applied by the
+                backend before ranking
         """
         pass
 
@@ -106,7 +139,8 @@ class VectorCollection(ABC):
         self, texts: List[str], metadata: Optional[List[Dict[str, Any]]] = None
     ) -> List[str]:
         """
-        Helper method to embed texts and add them to the collection.
+        Helper method to embed texts and add them to the collection. Texts
+        whose content id is already stored are not embedded again.
 
         Args:
             texts: List of texts to embed and store
@@ -114,9 +148,49 @@ class VectorCollection(ABC):
         """
         pass
 
+    def existing_ids(self, ids: List[str]) -> set:
+        """The subset of `ids` already stored in the collection."""
+        found = set()
+        for id in dict.fromkeys(ids):
+            try:
+                self.get_vector(id, include_text=False)
+            except KeyError:
+                continue
+            found.add(id)
+        return found
+
+    def content_ids(
+        self,
+        vectors: Optional[np.ndarray] = None,
+        texts: Optional[List[str]] = None,
+        metadata: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[str]:
+        """
+        Default ids of new records: a hash of the collection name, the
+        record's `source` metadata and its text (or vector bytes if there
+        is no text).
+        """
+        contents = (
+            texts
+            if texts is not None
+            else [np.asarray(v, dtype=np.float32).tobytes() for v in vectors]
+        )
+        return [
+            content_id(
+                self.name,
+                content,
+                (metadata[i] or {}).get("source") if metadata else None,
+            )
+            for i, content in enumerate(contents)
+        ]
+
     @abstractmethod
     def search_by_text(
-        self, text: str, k: int = 5, include_text: bool = True
+        self,
+        text: str,
+        k: int = 5,
+        include_text: bool = True,
+        where: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search by text query.
@@ -125,6 +199,7 @@ class VectorCollection(ABC):
             text: Text to search for
             k: Number of results to return
             include_text: Whether to include the text content in results
+            where: Optional metadata filter (see `search`)
         """
         pass
 
@@ -155,3 +230,21 @@ class VectorCollection(ABC):
     def name(self) -> str:
         """Get collection name."""
         pass
+
+    @property
+    def sidecar_directory(self) -> Optional[str]:
+        """
+        Directory, owned by this collection, where other components keep
+        files that belong with it (ingestion manifest, lexical index).
+        Implementations remove it when the collection is cleared or
+        deleted. None if the collection is not persisted.
+        """
+        return None
+
+    @property
+    def embedding_function(self) -> Optional[EmbeddingFunctionType]:
+        """
+        Embedding function used by `add_texts` / `search_by_text`, if any.
+        Lets callers embed a query once and `search` several collections.
+        """
+        return None
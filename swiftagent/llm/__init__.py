@@ -1,3 +1,7 @@
 from .base import (
     LLM,
 )
+
+from .cache import LLMCache
+
+from .limiter import ModelScheduler, RateLimit
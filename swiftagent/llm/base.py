@@ -1,14 +1,129 @@
+import asyncio
+import copy
+
 from litellm import acompletion
 from dotenv import load_dotenv
 
+from swiftagent.llm.cache import LLMCache
+from swiftagent.llm.limiter import ModelScheduler, RateLimit, estimate_tokens
+from swiftagent.llm.singleflight import SingleFlight
+from swiftagent.llm.utils import canonical_request_key, is_deterministic
+
 load_dotenv()
 
 
 class LLM:
-    def __init__(self, name, *args, **kwargs):
+    def __init__(
+        self,
+        name,
+        *args,
+        cache: LLMCache | bool | None = None,
+        coalesce: bool = False,
+        rate_limit: RateLimit | None = None,
+        **kwargs,
+    ):
+        """
+        Args:
+            name: litellm model name, e.g. "gpt-4o"
+            cache: Opt-in response cache. Pass an LLMCache, or True for one
+                stored under CACHE_DIR with default limits.
+            coalesce: Share one in-flight `acompletion` call between
+                concurrent identical deterministic requests (temperature
+                0); each caller gets its own copy of the response. Sampled
+                requests are never coalesced.
+            rate_limit: Opt-in limits for this model (and api_key, if
+                given), including retries on 429. They are shared by every
+                LLM targeting the same model with a rate_limit. None sends
+                calls directly, with no retries.
+            *args, **kwargs: Forwarded to every `acompletion` call.
+        """
         self.name = name
         self.args = args
         self.kwargs = kwargs
 
-    async def inference(self):
-        return await acompletion(model=self.name, *self.args, **self.kwargs)
+        if cache is True:
+            cache = LLMCache()
+        self.cache: LLMCache | None = cache or None
+
+        self.coalesce = coalesce
+        self._inflight = SingleFlight()
+
+        # Without rate_limit, calls go straight to the provider: no shared
+        # limits, no 429 retries
+        self.scheduler: ModelScheduler | None = None
+        if rate_limit is not None:
+            self.scheduler = ModelScheduler.for_model(
+                name, api_key=kwargs.get("api_key"), limits=rate_limit
+            )
+
+    async def inference(self, *args, **kwargs):
+        # Callers historically pass `model=<LLM>`; the model is always ours.
+        kwargs.pop("model", None)
+        request = {**self.kwargs, **kwargs}
+
+        if request.get("stream") or (self.cache is None and not self.coalesce):
+            return await self._schedule(
+                lambda: acompletion(
+                    model=self.name, *self.args, *args, **request
+                ),
+                request,
+            )
+
+        key = canonical_request_key(
+            self.name, request, args=(*self.args, *args)
+        )
+
+        if self.cache is not None:
+            # SQLite I/O stays off the event loop
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                return cached
+
+        async def _complete():
+            completion = await self._schedule(
+                lambda: acompletion(
+                    model=self.name, *self.args, *args, **request
+                ),
+                request,
+            )
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.set, key, completion)
+            return completion
+
+        if not self.coalesce or not is_deterministic(request):
+            return await _complete()
+
+        # Callers may mutate their response; never hand out a shared one
+        return copy.deepcopy(await self._inflight.do(key, _complete))
+
+    async def stream(self, *args, **kwargs):
+        """
+        Streaming variant of `inference`: an async generator over litellm's
+        stream chunks. Streamed calls bypass the response cache and
+        single-flight coalescing, but still respect the rate limits.
+        """
+        kwargs.pop("model", None)
+        request = {**self.kwargs, **kwargs, "stream": True}
+
+        response = await self._schedule(
+            lambda: acompletion(model=self.name, *self.args, *args, **request),
+            request,
+        )
+        async for chunk in response:
+            yield chunk
+
+    async def _schedule(self, factory, request: dict):
+        """Run a provider call under the shared per-model rate limits."""
+        if self.scheduler is None:
+            return await factory()
+        tokens = 0
+        if self.scheduler.limits.tpm:
+            tokens = estimate_tokens(self.name, request)
+        return await self.scheduler.run(factory, tokens=tokens)
+
+    @property
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the response cache (empty if disabled)."""
+        if self.cache is None:
+            return {}
+        return self.cache.stats
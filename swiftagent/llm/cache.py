@@ -0,0 +1,72 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+from litellm import ModelResponse
+
+from swiftagent.constants import CACHE_DIR
+from swiftagent.core.diskcache import DiskCache
+
+
+class LLMCache:
+    """
+    On-disk cache of chat completions, keyed by the canonical request hash.
+
+    Cached completions are rebuilt as litellm `ModelResponse` objects so that
+    callers (`BaseReasoning.flow`, `SwiftRouter.route`, ...) cannot tell a
+    hit from a live call.
+
+    Example:
+
+        llm = LLM("gpt-4o", cache=LLMCache(ttl=24 * 3600))
+        ...
+        llm.cache.stats  # {"hits": 3, "misses": 1, ...}
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        max_entries: Optional[int] = 10_000,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Args:
+            path: SQLite file to use. Defaults to CACHE_DIR/llm_cache.sqlite3
+            max_entries: LRU cap on the number of stored completions.
+            max_bytes: LRU cap on the total size of stored completions.
+            ttl: Time-to-live in seconds (None means entries never expire).
+        """
+        if path is None:
+            path = CACHE_DIR / "llm_cache.sqlite3"
+
+        self._store = DiskCache(
+            path, max_entries=max_entries, max_bytes=max_bytes, ttl=ttl
+        )
+
+    def get(self, key: str) -> Optional[ModelResponse]:
+        raw = self._store.get(key)
+        if raw is None:
+            return None
+
+        try:
+            return ModelResponse(**json.loads(raw))
+        except Exception:
+            # Entry written by an incompatible litellm version; drop it.
+            self._store.delete(key)
+            return None
+
+    def set(self, key: str, completion: ModelResponse) -> None:
+        if hasattr(completion, "model_dump_json"):
+            raw = completion.model_dump_json()
+        else:
+            raw = json.dumps(completion)
+
+        self._store.set(key, raw)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    @property
+    def stats(self) -> dict:
+        return self._store.stats
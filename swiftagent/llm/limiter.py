@@ -0,0 +1,334 @@
+import asyncio
+import json
+import random
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional
+
+import litellm
+from litellm import RateLimitError
+
+from swiftagent.llm.utils import to_jsonable
+
+
+@dataclass
+class RateLimit:
+    """
+    Limits applied to every call made against one (model, api key) pair.
+
+    Attributes:
+        max_in_flight: Maximum number of concurrent requests.
+        rpm: Requests per minute.
+        tpm: Tokens per minute (prompt estimate + `max_tokens`).
+        max_retries: Retries after a 429 before the error is raised.
+        base_backoff: First backoff (seconds) when no Retry-After is given.
+        max_backoff: Upper bound on a single backoff.
+    """
+
+    max_in_flight: Optional[int] = None
+    rpm: Optional[float] = None
+    tpm: Optional[float] = None
+    max_retries: int = 5
+    base_backoff: float = 1.0
+    max_backoff: float = 60.0
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `per_minute / 60` per second.
+    The level may go negative when actual usage exceeds the estimate that was
+    reserved up front; later callers then wait for the debt to refill.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(
+            self.capacity, self.level + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def adjust(self, delta: float) -> None:
+        """Give back (positive) or charge (negative) tokens after the fact."""
+        self._refill()
+        self.level = min(self.capacity, self.level + delta)
+
+    def set_rate(self, per_minute: float) -> None:
+        """Change the rate, keeping the current level (and any debt)."""
+        self._refill()
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.level = min(self.capacity, self.level)
+
+
+def _rebucket(
+    bucket: Optional[TokenBucket], per_minute: Optional[float]
+) -> Optional[TokenBucket]:
+    if not per_minute:
+        return None
+    if bucket is None:
+        return TokenBucket(per_minute)
+    bucket.set_rate(per_minute)
+    return bucket
+
+
+class InFlightLimit:
+    """
+    Concurrency cap for the calls of one event loop. Unlike a semaphore its
+    limit can change while calls are running: those calls keep counting
+    against the new limit, and waiters are admitted once there is room.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, limit: Optional[int]):
+        self.loop = loop
+        self.limit = limit
+        self.count = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    def _has_room(self) -> bool:
+        return not self.limit or self.count < self.limit
+
+    async def acquire(self) -> None:
+        if not self._waiters and self._has_room():
+            self.count += 1
+            return
+        waiter = self.loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as we were cancelled: pass the slot on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.count -= 1
+        self._wake()
+
+    def resize(self, limit: Optional[int]) -> None:
+        """Change the limit; safe to call from any thread or loop."""
+        self.limit = limit
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self) -> None:
+        while self._waiters and self._has_room():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.count += 1
+                waiter.set_result(None)
+
+
+class ModelScheduler:
+    """
+    Process-wide admission control for one (model, api key) pair.
+
+    Every `LLM` targeting the same model shares the same scheduler, so the
+    concurrency cap and the request/token buckets hold across agents, suites
+    and executor tiers. A 429 pauses *all* callers of the model until the
+    provider's Retry-After (or an exponential backoff) has elapsed.
+
+    Example:
+
+        ModelScheduler.for_model("gpt-4o").configure(
+            RateLimit(max_in_flight=8, rpm=500, tpm=150_000)
+        )
+    """
+
+    _registry: dict[tuple[str, Optional[str]], "ModelScheduler"] = {}
+
+    def __init__(self, model: str, limits: Optional[RateLimit] = None):
+        self.model = model
+        self.limits = RateLimit()
+        # Event loop -> InFlightLimit of the calls running on it
+        self._in_flight: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._request_bucket: Optional[TokenBucket] = None
+        self._token_bucket: Optional[TokenBucket] = None
+
+        self._cooldown_until = 0.0
+        self._consecutive_429s = 0
+
+        self.configure(limits or RateLimit())
+
+    @classmethod
+    def for_model(
+        cls,
+        model: str,
+        api_key: Optional[str] = None,
+        limits: Optional[RateLimit] = None,
+    ) -> "ModelScheduler":
+        """
+        Return the shared scheduler for (model, api_key), creating it on
+        first use. Passing `limits` that differ from the current ones
+        reconfigures the shared scheduler.
+        """
+        key = (model, api_key)
+        scheduler = cls._registry.get(key)
+        if scheduler is None:
+            scheduler = cls._registry[key] = cls(model, limits)
+        elif limits is not None and limits != scheduler.limits:
+            scheduler.configure(limits)
+        return scheduler
+
+    def configure(self, limits: RateLimit) -> "ModelScheduler":
+        """
+        Apply `limits`. Calls already running keep counting against the new
+        concurrency cap, and the buckets keep their level (and any debt
+        left by earlier calls) at the new rates.
+        """
+        self.limits = limits
+        for in_flight in list(self._in_flight.values()):
+            in_flight.resize(limits.max_in_flight)
+        self._request_bucket = _rebucket(self._request_bucket, limits.rpm)
+        self._token_bucket = _rebucket(self._token_bucket, limits.tpm)
+        return self
+
+    def _in_flight_limit(self) -> InFlightLimit:
+        # asyncio primitives are bound to one loop, so keep one per loop.
+        loop = asyncio.get_running_loop()
+        in_flight = self._in_flight.get(loop)
+        if in_flight is None:
+            in_flight = InFlightLimit(loop, self.limits.max_in_flight)
+            self._in_flight[loop] = in_flight
+        return in_flight
+
+    async def _admit(self, tokens: int) -> None:
+        """Wait out any 429 cooldown and the request/token buckets."""
+        while True:
+            delay = self._cooldown_until - time.monotonic()
+            if self._request_bucket:
+                delay = max(delay, self._request_bucket.delay_for(1))
+            if self._token_bucket:
+                delay = max(delay, self._token_bucket.delay_for(tokens))
+
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+
+        if self._request_bucket:
+            self._request_bucket.take(1)
+        if self._token_bucket:
+            self._token_bucket.take(tokens)
+
+    def _backoff(self, error: RateLimitError) -> None:
+        self._consecutive_429s += 1
+
+        delay = retry_after_seconds(error)
+        if delay is None:
+            delay = self.limits.base_backoff * 2 ** (self._consecutive_429s - 1)
+            delay *= 1 + random.random() * 0.25
+        delay = min(delay, self.limits.max_backoff)
+
+        self._cooldown_until = max(
+            self._cooldown_until, time.monotonic() + delay
+        )
+
+    async def run(
+        self, factory: Callable[[], Awaitable[Any]], tokens: int = 0
+    ) -> Any:
+        """
+        Run `factory()` under this model's limits, retrying on 429.
+
+        Args:
+            factory: Zero-argument callable returning the request coroutine.
+            tokens: Estimated tokens the request will consume.
+        """
+        attempt = 0
+        while True:
+            # Counted even without max_in_flight, so a cap configured later
+            # accounts for the calls already running
+            in_flight = self._in_flight_limit()
+            await in_flight.acquire()
+            try:
+                await self._admit(tokens)
+                result = await factory()
+            except RateLimitError as error:
+                # The rejected call consumed no tokens: return the reservation
+                if self._token_bucket:
+                    self._token_bucket.adjust(tokens)
+                self._backoff(error)
+                attempt += 1
+                if attempt > self.limits.max_retries:
+                    raise
+                continue
+            finally:
+                in_flight.release()
+
+            self._consecutive_429s = 0
+            self._reconcile(tokens, result)
+            return result
+
+    def _reconcile(self, estimated: int, result: Any) -> None:
+        """Correct the token bucket with the provider-reported usage."""
+        if not self._token_bucket:
+            return
+        usage = getattr(result, "usage", None)
+        actual = getattr(usage, "total_tokens", None)
+        if actual:
+            self._token_bucket.adjust(estimated - actual)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Extract a Retry-After delay (seconds) from a rate limit error."""
+    header_sources = [
+        getattr(error, "headers", None),
+        getattr(error, "litellm_response_headers", None),
+        getattr(getattr(error, "response", None), "headers", None),
+    ]
+    for headers in header_sources:
+        if not headers:
+            continue
+        try:
+            value = headers.get("retry-after") or headers.get("Retry-After")
+        except AttributeError:
+            continue
+        if value is None:
+            continue
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(
+                0.0, parsedate_to_datetime(value).timestamp() - time.time()
+            )
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def estimate_tokens(model: str, request: dict[str, Any]) -> int:
+    """Prompt token estimate plus the requested completion budget."""
+    messages = to_jsonable(request.get("messages") or [])
+    try:
+        prompt_tokens = litellm.token_counter(
+            model=model, messages=messages, tools=request.get("tools")
+        )
+    except Exception:
+        prompt_tokens = len(json.dumps(messages, default=str)) // 4
+
+    return prompt_tokens + int(request.get("max_tokens") or 0)
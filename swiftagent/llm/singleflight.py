@@ -0,0 +1,63 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class _Call:
+    __slots__ = ("task", "loop", "waiters")
+
+    def __init__(self, task: asyncio.Task, loop: asyncio.AbstractEventLoop):
+        self.task = task
+        self.loop = loop
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    The first caller (the leader) starts the work as a task; every caller,
+    leader included, awaits a shielded view of that task. Cancelling one
+    caller therefore never cancels the others: the shared task keeps running
+    until its last waiter goes away, and only then is it cancelled.
+
+    Example:
+
+        flights = SingleFlight()
+        result = await flights.do(key, lambda: acompletion(**request))
+    """
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await the in-flight call for `key`, starting it via `factory()` if
+        there is none.
+        """
+        loop = asyncio.get_running_loop()
+        call = self._calls.get(key)
+
+        if call is None or call.task.done() or call.loop is not loop:
+            task = asyncio.ensure_future(factory())
+            call = _Call(task, loop)
+            self._calls[key] = call
+            task.add_done_callback(
+                lambda _task, key=key, call=call: self._forget(key, call)
+            )
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every interested caller was cancelled: stop the work.
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+import tiktoken
+
+# Request kwargs that change how a call is transported, not what it returns.
+# They are left out of the canonical request so they do not split cache keys.
+# The endpoint (api_base / base_url) stays in: different deployments may
+# serve different models under the same name.
+NON_SEMANTIC_KWARGS = {
+    "api_key",
+    "timeout",
+    "num_retries",
+    "max_retries",
+    "metadata",
+    "stream",
+    "stream_options",
+    "extra_headers",
+}
+
+
+def to_jsonable(obj: Any) -> Any:
+    """
+    Recursively converts litellm/pydantic objects (e.g. an assistant `Message`
+    appended back onto `messages`) into plain JSON types.
+
+    Keys whose value is None are dropped so that a `Message` object and the
+    equivalent hand-written dict produce the same representation.
+    """
+    if hasattr(obj, "model_dump"):
+        obj = obj.model_dump()
+
+    if isinstance(obj, dict):
+        return {str(k): to_jsonable(v) for k, v in obj.items() if v is not None}
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(v) for v in obj]
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+
+    return str(obj)
+
+
+def canonical_request(
+    model: str, request: dict[str, Any], args: Sequence[Any] = ()
+) -> str:
+    """
+    Returns a stable JSON string describing an LLM request: the model name
+    plus every semantic kwarg (messages, tools, response_format, ...) and
+    any positional `args` passed to the completion call.
+    """
+    payload = {
+        k: to_jsonable(v)
+        for k, v in request.items()
+        if k not in NON_SEMANTIC_KWARGS and v is not None
+    }
+    payload["model"] = model
+    if args:
+        payload["args"] = to_jsonable(list(args))
+
+    return json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+def is_deterministic(request: dict[str, Any]) -> bool:
+    """
+    Whether identical requests are expected to return the same completion
+    (greedy decoding of a single choice), so one call can answer them all.
+    """
+    return request.get("temperature") == 0 and request.get("n") in (None, 1)
+
+
+def canonical_request_key(
+    model: str, request: dict[str, Any], args: Sequence[Any] = ()
+) -> str:
+    """sha256 hex digest of `canonical_request`."""
+    return hashlib.sha256(
+        canonical_request(model, request, args).encode("utf-8")
+    ).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _tokenizer(model: str) -> Optional[tiktoken.Encoding]:
+    """tiktoken encoding for `model`, falling back to cl100k_base."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        pass
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # No tokenizer available (e.g. offline): count_tokens estimates
+        return None
+
+
+# Words and single punctuation marks, the pieces BPE tokenizers start from
+_ESTIMATE_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_token_ends(text: str) -> list[int]:
+    """
+    End offset of each estimated token of `text`, for when no tokenizer is
+    available: a punctuation mark is one token and a word one token per six
+    characters, which tracks cl100k_base on prose far better than chars / 4.
+    """
+    ends = []
+    for match in _ESTIMATE_PIECES.finditer(text):
+        start, end = match.span()
+        ends.extend(range(min(start + 6, end), end, 6))
+        ends.append(end)
+    return ends
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Token count of `text`, memoized since history is re-counted per turn."""
+    encoding = _tokenizer(model)
+    if encoding is None:
+        return len(estimate_token_ends(text))
+    return len(encoding.encode(text, disallowed_special=()))
@@ -1,8 +1,13 @@
+import time
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Any, Optional
 from enum import Enum
 from dataclasses import dataclass
 
+# Format of the local-time stamps WorkingMemory used to produce
+LEGACY_TIMESTAMP_FORMAT = "%H:%M:%S %m/%d/%y"
+
 
 class Memory(ABC):
     """
@@ -51,13 +56,54 @@ class MemoryItemType(Enum):
     ACTION = "ACTION"
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryItem:
     """
     A simple container for a single memory entry, such as an action or piece of text.
+
+    Slotted (no per-instance __dict__), since working memories of many
+    sessions keep lots of them. `timestamp` is epoch seconds; render it with
+    `format_timestamp` when building prompts.
     """
 
     item_type: MemoryItemType
     content: str
-    # Optional: you can add timestamps, metadata, embeddings, etc.
     timestamp: Optional[float] = None
+
+
+def to_epoch(timestamp: Any = None) -> float:
+    """
+    Normalize a timestamp to epoch seconds, so it can be range-filtered.
+
+    Accepts numbers, ISO-8601 strings, the legacy "hh:mm:ss mm/dd/yy" local
+    time stamps and datetimes; None (or anything unparseable) means now.
+    """
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        return float(timestamp)
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    if isinstance(timestamp, str):
+        try:
+            return float(timestamp)
+        except ValueError:
+            pass
+        for parse in (
+            datetime.fromisoformat,
+            lambda s: datetime.strptime(s, LEGACY_TIMESTAMP_FORMAT),
+        ):
+            try:
+                return parse(timestamp).timestamp()
+            except ValueError:
+                continue
+    return time.time()
+
+
+def format_timestamp(timestamp: Any) -> str:
+    """Human-readable local time of a stored timestamp, for prompts."""
+    if timestamp is None or timestamp == "":
+        return "???"
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        return datetime.fromtimestamp(timestamp).strftime(
+            LEGACY_TIMESTAMP_FORMAT
+        )
+    return str(timestamp)
@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+from swiftagent.constants import CACHE_DIR
+from swiftagent.core.diskcache import DiskCache
+from swiftagent.memory.utils import determine_type
+
+# Read as is, without any conversion backend
+TEXT_EXTENSIONS = (".txt", ".md", ".markdown", ".rst", ".csv", ".log", "")
+
+URL_TIMEOUT_SECONDS = 30
+
+_markitdown = None
+_markitdown_lock = threading.Lock()
+
+
+def _get_markitdown():
+    """MarkItDown instance, imported and built on first use only."""
+    global _markitdown
+    if _markitdown is None:
+        with _markitdown_lock:
+            if _markitdown is None:
+                try:
+                    from markitdown import MarkItDown
+                except ImportError as e:
+                    raise ImportError(
+                        "Converting documents requires markitdown "
+                        "(pip install 'markitdown[pdf,docx]')."
+                    ) from e
+                _markitdown = MarkItDown(enable_plugins=False)
+    return _markitdown
+
+
+def convert_file(path: str) -> str:
+    """
+    Markdown of a local file. Text files are read directly; HTML, PDF, DOCX
+    and the other formats MarkItDown knows are converted offline (PDF and
+    DOCX need MarkItDown's `pdf` / `docx` extras).
+    """
+    if os.path.splitext(path)[1].lower() in TEXT_EXTENSIONS:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    return _get_markitdown().convert_local(path).text_content
+
+
+def _normalize_url(url: str) -> str:
+    return url if urlparse(url).scheme else f"https://{url}"
+
+
+class MarkdownConverter:
+    """
+    Converts files and URLs to Markdown, caching the result on disk.
+
+    Local files are keyed by path, mtime and size, so an edited file is
+    converted again and an untouched one never is. URLs are revalidated with
+    a conditional request (ETag / Last-Modified); a 304, or a network error,
+    serves the cached copy.
+
+    Example:
+
+        converter = MarkdownConverter()
+        converter.convert("/data/report.pdf")
+        converter.convert_many(paths, max_workers=8)
+        converter.stats  # {"hits": ..., "misses": ..., ...}
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        max_entries: Optional[int] = 10_000,
+        max_bytes: Optional[int] = 1024 * 1024 * 1024,
+    ):
+        """
+        Args:
+            path: SQLite file of the cache. Defaults to
+                CACHE_DIR/markdown_cache.sqlite3
+            max_entries: LRU cap on the number of cached documents.
+            max_bytes: LRU cap on the total size of cached Markdown.
+        """
+        if path is None:
+            path = CACHE_DIR / "markdown_cache.sqlite3"
+        self._store = DiskCache(
+            path, max_entries=max_entries, max_bytes=max_bytes
+        )
+
+    @staticmethod
+    def _file_key(path: str) -> str:
+        stat = os.stat(path)
+        return (
+            f"file:{os.path.realpath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+        )
+
+    def _is_file(self, source: str) -> bool:
+        return os.path.isfile(os.path.expanduser(source))
+
+    def convert(self, source: str) -> str:
+        """Markdown of a local file or a URL."""
+        if self._is_file(source):
+            path = os.path.expanduser(source)
+            key = self._file_key(path)
+            cached = self._store.get(key)
+            if cached is not None:
+                return cached.decode("utf-8")
+            markdown = convert_file(path)
+            self._store.set(key, markdown)
+            return markdown
+        if determine_type(source) != "url":
+            raise FileNotFoundError(f"No such file or URL: {source}")
+        return self._convert_url(_normalize_url(source))
+
+    def _convert_url(self, url: str) -> str:
+        import requests
+
+        key = f"url:{url}"
+        raw = self._store.get(key)
+        cached = json.loads(raw) if raw is not None else None
+
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            response = requests.get(
+                url, headers=headers, timeout=URL_TIMEOUT_SECONDS
+            )
+        except requests.RequestException:
+            if cached is not None:
+                return cached["markdown"]
+            raise
+        if response.status_code == 304 and cached is not None:
+            return cached["markdown"]
+        response.raise_for_status()
+
+        markdown = _get_markitdown().convert_response(response).text_content
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._store.set(
+                key,
+                json.dumps(
+                    {
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "markdown": markdown,
+                    }
+                ),
+            )
+        return markdown
+
+    def convert_many(
+        self, sources: Iterable[str], max_workers: Optional[int] = None
+    ) -> list[str]:
+        """
+        Markdown of every source, in order. Cache misses among local files
+        are converted in parallel in a process pool of `max_workers`
+        processes (default: one per CPU); URLs are fetched in this process.
+        """
+        sources = list(sources)
+        results: list[Optional[str]] = [None] * len(sources)
+        misses: dict[str, list[int]] = {}
+
+        for i, source in enumerate(sources):
+            if not self._is_file(source):
+                results[i] = self.convert(source)
+                continue
+            path = os.path.expanduser(source)
+            cached = self._store.get(self._file_key(path))
+            if cached is not None:
+                results[i] = cached.decode("utf-8")
+            else:
+                misses.setdefault(path, []).append(i)
+
+        if len(misses) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                converted = list(executor.map(convert_file, misses))
+        else:
+            converted = map(convert_file, misses)
+
+        for (path, indices), markdown in zip(misses.items(), converted):
+            self._store.set(self._file_key(path), markdown)
+            for i in indices:
+                results[i] = markdown
+        return results
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    @property
+    def stats(self) -> dict:
+        return self._store.stats
+
+
+_default_converter: Optional[MarkdownConverter] = None
+
+
+def get_default_converter() -> MarkdownConverter:
+    global _default_converter
+    if _default_converter is None:
+        _default_converter = MarkdownConverter()
+    return _default_converter
@@ -0,0 +1,228 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+# Characters read from a file per step
+READ_BLOCK_CHARS = 64 * 1024
+
+# Characters buffered before the splitter runs on them
+SPLIT_WINDOW_CHARS = 32 * 1024
+
+
+@dataclass
+class IngestStats:
+    """
+    Counters of one streaming ingestion.
+
+    Attributes:
+        sources: Sources read.
+        skipped_sources: Sources skipped because the manifest showed them
+            unchanged.
+        chunks: Chunks produced by the splitter.
+        embedded: Chunks that were not stored yet and got embedded.
+        batches: Batches written.
+        seconds: Wall time of the whole ingestion.
+    """
+
+    sources: int = 0
+    skipped_sources: int = 0
+    chunks: int = 0
+    embedded: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    source_ids: dict[str, list[str]] = field(default_factory=dict, repr=False)
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+
+def iter_file(path: str, block_chars: int = READ_BLOCK_CHARS) -> Iterator[str]:
+    """Read a text file incrementally."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            block = f.read(block_chars)
+            if not block:
+                return
+            yield block
+
+
+def iter_chunks(
+    pieces: Iterable[str],
+    splitter: Callable[[str], list[str]],
+    window_chars: int = SPLIT_WINDOW_CHARS,
+) -> Iterator[str]:
+    """
+    Split a stream of text pieces lazily. Text is buffered up to
+    `window_chars`, split, and every chunk but the last is emitted; the last
+    (possibly cut) chunk is carried over into the next window, so memory
+    stays bounded by the window whatever the size of the input.
+
+    Splitters with their own `stream` method (RecursiveTextSplitter) are
+    left to stream the pieces themselves.
+    """
+    stream = getattr(splitter, "stream", None)
+    if stream is not None:
+        yield from stream(pieces, window_chars)
+        return
+
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        if len(buffer) < window_chars:
+            continue
+        chunks = splitter(buffer)
+        if len(chunks) < 2:
+            continue
+        yield from chunks[:-1]
+        buffer = chunks[-1]
+    if buffer.strip():
+        yield from splitter(buffer)
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_pipeline(
+    chunks: Iterable[tuple[str, str]],
+    collection: Any,
+    on_written: Callable[[list[str], list[str]], None],
+    stats: IngestStats,
+    batch_size: int = 64,
+    workers: int | Executor | None = None,
+    max_pending: int = 4,
+) -> IngestStats:
+    """
+    Embed and write (source, chunk) pairs in fixed-size batches.
+
+    The chunk iterator is only advanced while fewer than `max_pending`
+    batches are being embedded (backpressure), and batches are written in
+    order as they finish. Chunks whose content id is already stored are
+    neither embedded nor written.
+
+    Args:
+        chunks: (source key, chunk text) pairs, produced lazily.
+        collection: Destination VectorCollection.
+        on_written: Called with (ids, texts) of every new chunk written.
+        stats: Counters to update.
+        batch_size: Chunks per embedding call and per write.
+        workers: Threads embedding batches concurrently (an int or an
+            Executor; None or 0 embeds in the calling thread).
+        max_pending: Batches in flight before reading pauses.
+    """
+    embedding_function = collection.embedding_function
+    if embedding_function is None:
+        raise ValueError("No embedding function set at the collection level.")
+
+    executor: Optional[Executor] = None
+    owns_executor = False
+    if isinstance(workers, Executor):
+        executor = workers
+    elif workers:
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ingest-embed"
+        )
+        owns_executor = True
+
+    def prepare(batch: list[tuple[str, str]]):
+        texts = [text for _, text in batch]
+        metadata = [{"source": source} for source, _ in batch]
+        ids = collection.content_ids(texts=texts, metadata=metadata)
+        for (source, _), id in zip(batch, ids):
+            stats.source_ids.setdefault(source, []).append(id)
+
+        stored = collection.existing_ids(ids)
+        # New rows, one per distinct id
+        rows = [
+            row
+            for id, row in {id: row for row, id in enumerate(ids)}.items()
+            if id not in stored
+        ]
+        return (
+            [ids[r] for r in rows],
+            [texts[r] for r in rows],
+            [metadata[r] for r in rows],
+        )
+
+    def embed(texts: list[str]) -> np.ndarray:
+        return np.asarray(embedding_function(texts), dtype=np.float32)
+
+    def write(ids, texts, metadata, vectors) -> None:
+        stats.batches += 1
+        if not ids:
+            return
+        collection.add_vectors(vectors, texts=texts, metadata=metadata, ids=ids)
+        stats.embedded += len(ids)
+        on_written(ids, texts)
+
+    pending: deque[tuple[list, list, list, Future | np.ndarray]] = deque()
+
+    def drain_one() -> None:
+        ids, texts, metadata, vectors = pending.popleft()
+        if isinstance(vectors, Future):
+            vectors = vectors.result()
+        write(ids, texts, metadata, vectors)
+
+    start = time.perf_counter()
+    try:
+        for batch in batched(chunks, batch_size):
+            stats.chunks += len(batch)
+            ids, texts, metadata = prepare(batch)
+            if not ids:
+                vectors = np.zeros((0, 0), dtype=np.float32)
+            elif executor is None:
+                vectors = embed(texts)
+            else:
+                vectors = executor.submit(embed, texts)
+            pending.append((ids, texts, metadata, vectors))
+
+            while len(pending) > (max_pending if executor else 0):
+                drain_one()
+        while pending:
+            drain_one()
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=True)
+        stats.seconds += time.perf_counter() - start
+
+    return stats
+
+
+def iter_source_text(
+    source: str,
+    information_type: str,
+    to_markdown: Callable[[str], str],
+) -> Iterator[str]:
+    """Text of a source: plain text as is, text files read incrementally,
+    anything else converted to Markdown."""
+    if information_type == "plain_string":
+        yield source
+    elif needs_conversion(source, information_type):
+        yield to_markdown(source)
+    else:
+        yield from iter_file(source)
+
+
+def needs_conversion(source: str, information_type: str) -> bool:
+    """Whether `source` goes through the Markdown converter (URLs and
+    documents) rather than being read as text."""
+    if information_type == "plain_string":
+        return False
+    return not (
+        information_type != "url"
+        and os.path.isfile(source)
+        and os.path.splitext(source)[1].lower() in (".txt", ".md", "")
+    )
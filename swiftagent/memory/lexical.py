@@ -0,0 +1,241 @@
+import heapq
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Optional, Sequence
+
+# Words, plus compound identifiers such as "ERR-404", "arXiv:2301.00001"
+# or "BRK.B", which are also indexed as their parts
+_TOKEN_RE = re.compile(r"\w+(?:[-.:/]\w+)*")
+_PART_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        tokens.append(token)
+        parts = _PART_RE.findall(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = 60
+) -> list[tuple[str, float]]:
+    """
+    Fuse ranked id lists: each id scores sum(1 / (k + rank)) over the lists
+    it appears in (rank starting at 1). Best first.
+    """
+    scores: dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, id in enumerate(ranking, start=1):
+            scores[id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """
+    Incremental BM25 inverted index over the chunks of a vector collection,
+    for exact tokens (tickers, error codes, paper ids) that embeddings
+    recall poorly.
+
+    Documents are appended to a JSONL log next to the collection. The
+    postings are rebuilt from it lazily, on first use, and then maintained
+    incrementally by `add` / `remove`. Replaced and removed documents stay
+    in the log until `compact` rewrites it from the live documents, which
+    happens automatically once `auto_compact` of its entries are dead.
+
+    Example:
+
+        index = BM25Index("/data/chroma_db/docs.lexical.jsonl")
+        index.add(ids, chunks)
+        index.search("ERR-404", k=5)  # [(id, score), ...]
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+        auto_compact: Optional[float] = 0.5,
+    ):
+        """
+        Args:
+            path: JSONL log of the indexed documents (None keeps the index
+                in memory only).
+            k1: BM25 term-frequency saturation.
+            b: BM25 length normalization.
+            auto_compact: Fraction of dead log entries that triggers
+                compaction (None disables it).
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.auto_compact = auto_compact
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._postings: dict[str, dict[str, int]] = defaultdict(dict)
+        self._lengths: dict[str, int] = {}
+        self._texts: dict[str, str] = {}
+        self._total_length = 0
+        # Entries in the log, live or not
+        self._log_entries = 0
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        good_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn last line
+                if entry.get("op") == "delete":
+                    self._remove(entry["id"])
+                else:
+                    self._add(entry["id"], entry["text"])
+                good_bytes += len(line)
+                self._log_entries += 1
+        if os.path.getsize(self.path) > good_bytes:
+            os.truncate(self.path, good_bytes)
+        self._maybe_compact()
+
+    def _append(self, entries: list[dict]) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(
+                "".join(
+                    json.dumps(e, ensure_ascii=False) + "\n" for e in entries
+                )
+            )
+        self._log_entries += len(entries)
+
+    def _maybe_compact(self) -> None:
+        if not self.path or self.auto_compact is None or not self._log_entries:
+            return
+        dead = self._log_entries - len(self._lengths)
+        if dead / self._log_entries >= self.auto_compact:
+            self._compact()
+
+    def compact(self) -> None:
+        """Rewrite the log with only the live documents."""
+        with self._lock:
+            self._ensure_loaded()
+            self._compact()
+
+    def _compact(self) -> None:
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for id, text in self._texts.items():
+                f.write(
+                    json.dumps(
+                        {"op": "add", "id": id, "text": text},
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+        os.replace(tmp_path, self.path)
+        self._log_entries = len(self._texts)
+
+    def _add(self, id: str, text: str) -> None:
+        if id in self._lengths:
+            self._remove(id)
+        counts = Counter(tokenize(text))
+        for term, tf in counts.items():
+            self._postings[term][id] = tf
+        length = sum(counts.values())
+        self._lengths[id] = length
+        self._texts[id] = text
+        self._total_length += length
+
+    def _remove(self, id: str) -> None:
+        length = self._lengths.pop(id, None)
+        if length is None:
+            return
+        for term in set(tokenize(self._texts.pop(id))):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= length
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        if len(ids) != len(texts):
+            raise ValueError("Number of ids must match number of texts")
+        with self._lock:
+            self._ensure_loaded()
+            self._append(
+                [{"op": "add", "id": i, "text": t} for i, t in zip(ids, texts)]
+            )
+            for id, text in zip(ids, texts):
+                self._add(id, text)
+            self._maybe_compact()
+
+    def remove(self, ids: Sequence[str]) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            ids = [i for i in ids if i in self._lengths]
+            self._append([{"op": "delete", "id": i} for i in ids])
+            for id in ids:
+                self._remove(id)
+            self._maybe_compact()
+
+    def clear(self) -> None:
+        with self._lock:
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+            self._postings.clear()
+            self._lengths.clear()
+            self._texts.clear()
+            self._total_length = 0
+            self._log_entries = 0
+            self._loaded = True
+
+    def text(self, id: str) -> Optional[str]:
+        with self._lock:
+            self._ensure_loaded()
+            return self._texts.get(id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._lengths)
+
+    def search(self, query: str, k: int = 5) -> list[tuple[str, float]]:
+        """Best `k` (id, BM25 score) pairs for `query`."""
+        with self._lock:
+            self._ensure_loaded()
+            n = len(self._lengths)
+            if n == 0 or k <= 0:
+                return []
+            average_length = self._total_length / n
+
+            scores: dict[str, float] = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(
+                    1 + (n - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for id, tf in postings.items():
+                    relative_length = self._lengths[id] / average_length
+                    norm = self.k1 * (1 - self.b + self.b * relative_length)
+                    scores[id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
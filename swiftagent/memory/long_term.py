@@ -1,6 +1,7 @@
 from typing import List, Any, Optional
 
-from .base import Memory, MemoryItem, MemoryItemType
+from .base import Memory, MemoryItem, MemoryItemType, to_epoch
+from swiftagent.core.filters import build_where
 from swiftagent.core.storage import VectorCollection
 from swiftagent.prebuilt.storage.chroma import ChromaDatabase, ChromaCollection
 
@@ -10,7 +11,8 @@ from swiftagent.constants import CACHE_DIR
 class LongTermMemory(Memory):
     """
     Long-term memory that persists both text and action items in a vector store.
-    We store `type` and `timestamp` in the Chroma metadata so we can reconstruct them.
+    We store `type` and `timestamp` (epoch seconds) in the metadata so we can
+    reconstruct them, and so recalls can filter on them inside the index.
     """
 
     def __init__(
@@ -30,14 +32,11 @@ class LongTermMemory(Memory):
     def ingest(self, information: str) -> "LongTermMemory":
         """
         For minimal compliance with `Memory` base class:
-        This will store a plain text string as a TEXT item (with no timestamp).
+        This will store a plain text string as a TEXT item, stamped now.
         """
         item = MemoryItem(
             item_type=MemoryItemType.TEXT,
             content=information,
-            # If you want a timestamp here, you can generate a local one,
-            # or rely on caller passing one. E.g.
-            # timestamp=datetime.now().strftime("%H:%M:%S %d/%m/%y"),
         )
         self.ingest_item(item)
         return self
@@ -47,11 +46,17 @@ class LongTermMemory(Memory):
         Ingest a MemoryItem (either TEXT or ACTION).
         We'll store `item.content` as the main text,
         plus `type` and `timestamp` in the metadata.
+        The timestamp is stored as epoch seconds (now if the item has none).
+        Re-ingesting the same item is a no-op, while the same text at another
+        time is kept as a separate event.
         """
         text = item.content
+        timestamp = to_epoch(item.timestamp)
         metadata = {
             "type": item.item_type.value,
-            "timestamp": item.timestamp,  # <-- store local-time stamp if present
+            "timestamp": timestamp,
+            # Part of the content-hash id of the record
+            "source": f"{item.item_type.value}@{timestamp!r}",
         }
         self.collection.add_texts([text], [metadata])
 
@@ -71,15 +76,62 @@ class LongTermMemory(Memory):
         )
         self.ingest_item(item)
 
-    def recall(self, phrase: str, number: int = 5) -> List[dict]:
+    def recall(
+        self,
+        phrase: str,
+        number: int = 5,
+        item_type: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        where: Optional[dict] = None,
+    ) -> List[dict]:
         """
         Recall both text and action items from the vector store that match `phrase`.
         Returns up to `number` best matches. Instead of returning a plain string,
         we return a dictionary with text, type, timestamp, etc.
+
+        The optional filters are pushed down to the vector store, so the
+        search ranks only matching items:
+
+            ltm.recall("deploy", item_type="ACTION", since=time.time() - 86400)
+
+        Args:
+            item_type: "TEXT" or "ACTION".
+            since / until: Epoch-seconds bounds on the item timestamp.
+            where: Any other metadata filter (see core.filters.match_where).
         """
         results = self.collection.search_by_text(
-            phrase, k=number, include_text=True
+            phrase,
+            k=number,
+            include_text=True,
+            where=build_where(item_type, since, until, where),
+        )
+        return self._to_items(results)
+
+    @property
+    def embedding_function(self) -> Any:
+        return self.collection.embedding_function
+
+    def recall_vector(
+        self,
+        query_vector,
+        number: int = 5,
+        item_type: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        where: Optional[dict] = None,
+    ) -> List[dict]:
+        """`recall` with a query that has already been embedded."""
+        results = self.collection.search(
+            query_vector,
+            k=number,
+            include_text=True,
+            where=build_where(item_type, since, until, where),
         )
+        return self._to_items(results)
+
+    @staticmethod
+    def _to_items(results: List[dict]) -> List[dict]:
         # Construct a more structured return
         output = []
         for r in results:
@@ -89,50 +141,36 @@ class LongTermMemory(Memory):
                     "text": r["text"],
                     "type": meta.get("type", "UNKNOWN"),
                     "timestamp": meta.get("timestamp", "???"),
-                    # you can also add "score" or "distance" if you want
+                    "distance": r.get("distance"),
                 }
             )
         return output
 
-    def recall_actions(self, phrase: str, number: int = 5) -> List[dict]:
+    def recall_actions(
+        self,
+        phrase: str,
+        number: int = 5,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[dict]:
         """
         Specifically recall 'ACTION' items from LTM that match `phrase`.
-        We'll filter after the search_by_text.
+        The type filter runs inside the vector search.
         """
-        results = self.collection.search_by_text(
-            phrase, k=number * 2, include_text=True
+        return self.recall(
+            phrase, number, item_type="ACTION", since=since, until=until
         )
-        filtered = []
-        for r in results:
-            if r["metadata"].get("type") == "ACTION":
-                filtered.append(
-                    {
-                        "text": r["text"],
-                        "type": "ACTION",
-                        "timestamp": r["metadata"].get("timestamp", "???"),
-                    }
-                )
-                if len(filtered) >= number:
-                    break
-        return filtered
-
-    def recall_text(self, phrase: str, number: int = 5) -> List[dict]:
+
+    def recall_text(
+        self,
+        phrase: str,
+        number: int = 5,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[dict]:
         """
         Specifically recall 'TEXT' items from LTM that match `phrase`.
         """
-        results = self.collection.search_by_text(
-            phrase, k=number * 2, include_text=True
+        return self.recall(
+            phrase, number, item_type="TEXT", since=since, until=until
         )
-        filtered = []
-        for r in results:
-            if r["metadata"].get("type") == "TEXT":
-                filtered.append(
-                    {
-                        "text": r["text"],
-                        "type": "TEXT",
-                        "timestamp": r["metadata"].get("timestamp", "???"),
-                    }
-                )
-                if len(filtered) >= number:
-                    break
-        return filtered
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+
+def content_digest(content: str | bytes) -> str:
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class IngestionManifest:
+    """
+    Record of what a memory has already ingested: for every source key, the
+    digest of its content and the ids of the chunks stored for it. Lets
+    `SemanticMemory.ingest` skip unchanged sources without embedding or
+    writing anything, and drop the stale chunks of sources that changed.
+
+    Stored as one JSON file, rewritten atomically on every change.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: JSON file of the manifest (None keeps it in memory only).
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[dict[str, dict]] = None
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path and os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+        return self._entries
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, source: str) -> Optional[dict]:
+        """{"digest": ..., "chunks": [...]} of `source`, if ingested."""
+        with self._lock:
+            return self._load().get(source)
+
+    def is_unchanged(self, source: str, digest: str) -> bool:
+        entry = self.get(source)
+        return entry is not None and entry["digest"] == digest
+
+    def record(self, source: str, digest: str, chunk_ids: list[str]) -> None:
+        with self._lock:
+            self._load()[source] = {"digest": digest, "chunks": chunk_ids}
+            self._save()
+
+    def remove(self, source: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._load().pop(source, None)
+            if entry is not None:
+                self._save()
+            return entry
+
+    def sources(self) -> list[str]:
+        with self._lock:
+            return list(self._load())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
@@ -0,0 +1,167 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+
+from swiftagent.memory.base import Memory
+from swiftagent.llm.utils import count_tokens
+
+
+@dataclass
+class RecallResult:
+    """
+    Outcome of one coordinated recall.
+
+    Attributes:
+        items: Recalled items per source name, best first.
+        latency: Seconds spent searching each source.
+        embed_seconds: Seconds spent embedding the query.
+        embed_calls: Number of embedding calls made for the query.
+    """
+
+    items: dict[str, list[dict]] = field(default_factory=dict)
+    latency: dict[str, float] = field(default_factory=dict)
+    embed_seconds: float = 0.0
+    embed_calls: int = 0
+
+
+class RecallCoordinator:
+    """
+    Recalls one query from several memories while embedding it only once.
+
+    Memories exposing `embedding_function` and `recall_vector` (SemanticMemory,
+    LongTermMemory) share a single query vector per distinct embedding
+    function; their searches then run concurrently in threads. Other memories
+    fall back to their own `recall`. The merged hits are kept under one
+    token budget, nearest first.
+
+    Example:
+
+        result = await RecallCoordinator(token_budget=1500).recall(
+            task, [("docs", docs_memory, 2), ("ltm", long_term_memory, 3)]
+        )
+        result.items["docs"], result.latency["ltm"]
+    """
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        model: str = "gpt-4o",
+    ):
+        """
+        Args:
+            token_budget: Maximum tokens of recalled text across all sources
+                (None keeps everything).
+            model: Model whose tokenizer is used for the budget.
+        """
+        self.token_budget = token_budget
+        self.model = model
+
+    async def recall(
+        self,
+        query: str,
+        sources: list[tuple[str, Memory, int]],
+    ) -> RecallResult:
+        """
+        Args:
+            query: Text to recall.
+            sources: (name, memory, number of results) per memory.
+        """
+        result = RecallResult()
+        if not sources or not query.strip():
+            return result
+
+        # One query vector per distinct embedding function
+        vectors: dict[Any, Any] = {}
+        start = time.perf_counter()
+        for _, memory, _ in sources:
+            ef = self._embedding_function(memory)
+            key = self._key(ef)
+            if ef is not None and key not in vectors:
+                vectors[key] = await asyncio.to_thread(
+                    lambda: np.asarray(ef([query])[0])
+                )
+                result.embed_calls += 1
+        result.embed_seconds = time.perf_counter() - start
+
+        async def search(name: str, memory: Memory, number: int):
+            started = time.perf_counter()
+            ef = self._embedding_function(memory)
+            if ef is not None and getattr(memory, "lexical_index", None):
+                # Hybrid memories also need the text for their lexical half
+                hits = await asyncio.to_thread(
+                    memory.recall_vector,
+                    vectors[self._key(ef)],
+                    number,
+                    phrase=query,
+                )
+            elif ef is not None:
+                hits = await asyncio.to_thread(
+                    memory.recall_vector, vectors[self._key(ef)], number
+                )
+            else:
+                hits = await asyncio.to_thread(memory.recall, query, number)
+            result.latency[name] = time.perf_counter() - started
+            return name, hits
+
+        searched = await asyncio.gather(
+            *(search(name, memory, n) for name, memory, n in sources)
+        )
+
+        for name, hits in self._within_budget(searched):
+            result.items[name] = hits
+        return result
+
+    @staticmethod
+    def _key(embedding_function: Any) -> Any:
+        """Equal embedding functions share a key (identity if unhashable)."""
+        try:
+            hash(embedding_function)
+        except TypeError:
+            return id(embedding_function)
+        return embedding_function
+
+    @staticmethod
+    def _embedding_function(memory: Memory) -> Any:
+        if not hasattr(memory, "recall_vector"):
+            return None
+        return getattr(memory, "embedding_function", None)
+
+    def _within_budget(self, searched: list[tuple[str, list[dict]]]):
+        if self.token_budget is None:
+            return searched
+
+        # Rank all hits together, nearest first (unscored hits last)
+        ranked = sorted(
+            (
+                (
+                    (
+                        hit.get("distance")
+                        if hit.get("distance") is not None
+                        else float("inf")
+                    ),
+                    rank,
+                    name,
+                    hit,
+                )
+                for name, hits in searched
+                for rank, hit in enumerate(hits)
+            ),
+            key=lambda entry: entry[:2],
+        )
+
+        used = 0
+        kept: set[int] = set()
+        for _, _, _, hit in ranked:
+            tokens = count_tokens(hit.get("text") or "", self.model)
+            if used + tokens > self.token_budget:
+                continue
+            used += tokens
+            kept.add(id(hit))
+
+        return [
+            (name, [hit for hit in hits if id(hit) in kept])
+            for name, hits in searched
+        ]
@@ -1,18 +1,45 @@
+import hashlib
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
 from swiftagent.constants import CACHE_DIR
 from swiftagent.core.storage import VectorCollection
 
 from swiftagent.memory.base import Memory
+from swiftagent.memory.lexical import BM25Index, reciprocal_rank_fusion
+from swiftagent.memory.ingest import (
+    IngestStats,
+    iter_chunks,
+    iter_source_text,
+    needs_conversion,
+    run_pipeline,
+)
+from swiftagent.memory.manifest import IngestionManifest, content_digest
 
 from swiftagent.memory.utils import (
     text_splitter,
     determine_type,
     source_to_markdown,
+    sources_to_markdown,
 )
 
-from typing import Any
-
 from swiftagent.prebuilt.storage.chroma import ChromaDatabase
 
+RECALL_MODES = ("vector", "lexical", "hybrid")
+
+# Runs the lexical half of hybrid recalls next to the vector search
+_lexical_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_lexical_pool() -> ThreadPoolExecutor:
+    global _lexical_pool
+    if _lexical_pool is None:
+        _lexical_pool = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="lexical-recall"
+        )
+    return _lexical_pool
+
 
 class SemanticMemory(Memory):
     def __init__(
@@ -20,7 +47,25 @@ class SemanticMemory(Memory):
         name: str = "default_semantic_memory",
         container_collection: VectorCollection | None = None,
         text_splitter: Any = text_splitter,
+        hybrid: bool = False,
+        lexical_index: Optional[BM25Index] = None,
+        rrf_k: int = 60,
+        manifest: Optional[IngestionManifest] = None,
     ):
+        """
+        Args:
+            name: Name of the memory section.
+            container_collection: Vector collection holding the chunks.
+            text_splitter: Splits ingested text into chunks.
+            hybrid: Also keep a BM25 index of the chunks (persisted next to
+                the collection) and fuse it with the vector search in
+                `recall`, so exact tokens such as tickers, error codes and
+                paper ids are found.
+            lexical_index: Use this BM25Index (implies hybrid).
+            rrf_k: Reciprocal rank fusion constant.
+            manifest: Record of ingested sources (defaults to a JSON file
+                next to the collection, created on first ingest).
+        """
         if container_collection is None:
             container_collection = ChromaDatabase(
                 str(CACHE_DIR / "chroma_db")
@@ -29,25 +74,314 @@ class SemanticMemory(Memory):
         self.text_splitter = text_splitter
         self.name = name
 
-    def ingest(self, information: str | list[str]):
+        if hybrid and lexical_index is None:
+            lexical_index = BM25Index(
+                self._sidecar_path(container_collection, "lexical.jsonl")
+            )
+        self.lexical_index = lexical_index
+        self.rrf_k = rrf_k
+        self._manifest = manifest
+
+    @staticmethod
+    def _sidecar_path(collection: VectorCollection, suffix: str) -> str:
+        """Path of a file kept with `collection` (removed when the collection
+        is cleared or deleted)."""
+        directory = getattr(collection, "sidecar_directory", None)
+        if directory:
+            return os.path.join(directory, suffix)
+        return os.path.join(
+            str(CACHE_DIR / "semantic_memory"), f"{collection.name}.{suffix}"
+        )
+
+    @property
+    def manifest(self) -> IngestionManifest:
+        if self._manifest is None:
+            self._manifest = IngestionManifest(
+                self._sidecar_path(self.container_collection, "manifest.json")
+            )
+        return self._manifest
+
+    def ingest(
+        self, information: str | list[str], source: Optional[str] = None
+    ):
+        """
+        Ingest text, a file or a URL. Ingestion is idempotent: a source whose
+        content is unchanged since the last ingest is skipped (no embedding,
+        no writes), and the chunks of a changed source replace its old ones.
+
+        Args:
+            information: Plain text, a file path or a URL (or a list).
+            source: Key identifying the source (defaults to the path/URL,
+                or to the digest of plain text).
+        """
         if type(information) == list:
-            for i in information:
-                self.ingest(i)
-            return self
+            self.ingest_many(information)
+        else:
+            self.ingest_many([(source, information) if source else information])
+        return self
 
-        information_type = determine_type(information)
+    def ingest_many(
+        self,
+        sources: Iterable[str | tuple[str, str]],
+        batch_size: int = 64,
+        workers: int | Executor | None = None,
+        max_pending: int = 4,
+        stats: Optional[IngestStats] = None,
+        convert_workers: Optional[int] = None,
+    ) -> IngestStats:
+        """
+        Stream many sources into the memory with bounded RAM: files are read
+        incrementally, text is chunked lazily, chunks from all sources are
+        embedded in fixed-size batches (optionally on `workers` threads) and
+        each batch is written as soon as it is embedded. Reading pauses
+        while `max_pending` batches are in flight.
 
-        if not information_type == "plain_string":
-            information = source_to_markdown(information)
+        Example:
 
-        _split_texts = self.text_splitter(information)
+            stats = memory.ingest_many(paths, batch_size=128, workers=4)
+            print(f"{stats.chunks_per_second:.0f} chunks/s")
 
-        self.container_collection.add_texts(_split_texts)
+        Args:
+            sources: Texts, file paths or URLs, or (source key, information)
+                pairs. May be a generator.
+            batch_size: Chunks per embedding call / write.
+            workers: Embedding threads (or an Executor).
+            max_pending: Batches in flight before reading pauses.
+            stats: Counters to update in place (e.g. to watch progress
+                from another thread).
+            convert_workers: Convert the documents among `sources` (PDF,
+                DOCX, HTML, ...) up front in a pool of this many processes,
+                instead of one by one as they are reached.
+        """
+        stats = stats if stats is not None else IngestStats()
+        if convert_workers:
+            sources = list(sources)
+            documents = [
+                information
+                for information in (
+                    item[1] if isinstance(item, tuple) else item
+                    for item in sources
+                )
+                if needs_conversion(information, determine_type(information))
+                and os.path.isfile(information)
+            ]
+            # Fills the conversion cache that source_to_markdown reads
+            sources_to_markdown(documents, max_workers=convert_workers)
+        digests: dict[str, str] = {}
 
-        return self
+        def chunk_stream():
+            for item in sources:
+                source, information = (
+                    item if isinstance(item, tuple) else (None, item)
+                )
+                stats.sources += 1
+                information_type = determine_type(information)
+                key, digest = self._source_key(
+                    information, information_type, source
+                )
+                if digest is not None and self._is_ingested(key, digest):
+                    stats.skipped_sources += 1
+                    continue
+
+                hasher = hashlib.sha256()
+
+                def pieces():
+                    for piece in iter_source_text(
+                        information, information_type, source_to_markdown
+                    ):
+                        hasher.update(piece.encode("utf-8"))
+                        yield piece
+
+                stats.source_ids.setdefault(key, [])
+                for chunk in iter_chunks(pieces(), self.text_splitter):
+                    yield key, chunk
+                digests[key] = digest or hasher.hexdigest()
+
+        self._run(chunk_stream(), stats, batch_size, workers, max_pending)
+        for key, digest in digests.items():
+            self._finish_source(key, digest, stats.source_ids[key])
+        return stats
+
+    def ingest_stream(
+        self,
+        pieces: Iterable[str],
+        source: str,
+        batch_size: int = 64,
+        workers: int | Executor | None = None,
+        max_pending: int = 4,
+    ) -> IngestStats:
+        """
+        Ingest one source given as a stream of text pieces (an open text
+        file, a generator of pages, ...), without ever holding all of it.
+        See `ingest_many` for the batching options.
+        """
+        stats = IngestStats(sources=1)
+        hasher = hashlib.sha256()
+
+        def chunk_stream():
+            def hashed():
+                for piece in pieces:
+                    hasher.update(piece.encode("utf-8"))
+                    yield piece
 
-    def recall(self, phrase: str, number: int):
-        search_results = self.container_collection.search_by_text(
-            phrase, k=number
+            stats.source_ids.setdefault(source, [])
+            for chunk in iter_chunks(hashed(), self.text_splitter):
+                yield source, chunk
+
+        self._run(chunk_stream(), stats, batch_size, workers, max_pending)
+        self._finish_source(
+            source, hasher.hexdigest(), stats.source_ids[source]
+        )
+        return stats
+
+    def _run(self, chunks, stats, batch_size, workers, max_pending) -> None:
+        def on_written(ids: list[str], texts: list[str]) -> None:
+            if self.lexical_index is not None:
+                self.lexical_index.add(ids, texts)
+
+        run_pipeline(
+            chunks,
+            self.container_collection,
+            on_written,
+            stats,
+            batch_size=batch_size,
+            workers=workers,
+            max_pending=max_pending,
+        )
+
+    @staticmethod
+    def _source_key(
+        information: str, information_type: str, source: Optional[str]
+    ) -> tuple[str, Optional[str]]:
+        """
+        Source key of `information`, and its digest when it can be known
+        before reading the whole source (plain text and local files).
+        """
+        if information_type == "plain_string":
+            digest = content_digest(information)
+            return source or f"text:{digest}", digest
+
+        digest = None
+        if information_type != "url" and os.path.isfile(information):
+            hasher = hashlib.sha256()
+            with open(information, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    hasher.update(block)
+            digest = hasher.hexdigest()
+        return source or information, digest
+
+    def _is_ingested(self, source: str, digest: str) -> bool:
+        """
+        Whether the manifest shows `source` unchanged and its chunks are all
+        still stored (the collection may have been cleared since).
+        """
+        if not self.manifest.is_unchanged(source, digest):
+            return False
+        chunks = set(self.manifest.get(source)["chunks"])
+        stored = self.container_collection.existing_ids(list(chunks))
+        return len(stored) == len(chunks)
+
+    def _finish_source(self, source: str, digest: str, ids: list[str]):
+        """Drop the chunks a source no longer has and record it."""
+        ids = list(dict.fromkeys(ids))
+        previous = self.manifest.get(source)
+        stale = list(set(previous["chunks"]) - set(ids)) if previous else []
+        if stale:
+            self.container_collection.delete_vectors(stale)
+            if self.lexical_index is not None:
+                self.lexical_index.remove(stale)
+        self.manifest.record(source, digest, ids)
+
+    def recall(self, phrase: str, number: int, mode: Optional[str] = None):
+        """
+        Args:
+            phrase: Query text.
+            number: Number of chunks to return.
+            mode: "vector", "lexical" or "hybrid" (defaults to "hybrid"
+                when the memory has a lexical index, else "vector").
+        """
+        mode = mode or ("vector" if self.lexical_index is None else "hybrid")
+        if mode not in RECALL_MODES:
+            raise ValueError(f"Unknown mode '{mode}', expected {RECALL_MODES}")
+        if mode != "vector" and self.lexical_index is None:
+            raise ValueError(f"SemanticMemory '{self.name}' is not hybrid")
+
+        if mode == "vector":
+            return self.container_collection.search_by_text(phrase, k=number)
+        if mode == "lexical":
+            return self._fuse([], phrase, number)
+        return self._hybrid(
+            lambda depth: self.container_collection.search_by_text(
+                phrase, k=depth
+            ),
+            phrase,
+            number,
         )
-        return search_results
+
+    @property
+    def embedding_function(self) -> Any:
+        return self.container_collection.embedding_function
+
+    def recall_vector(
+        self, query_vector, number: int, phrase: Optional[str] = None
+    ):
+        """
+        `recall` with a query that has already been embedded. Pass the query
+        `phrase` as well to get hybrid results from a hybrid memory.
+        """
+        if phrase is None or self.lexical_index is None:
+            return self.container_collection.search(query_vector, k=number)
+        return self._hybrid(
+            lambda depth: self.container_collection.search(
+                query_vector, k=depth
+            ),
+            phrase,
+            number,
+        )
+
+    def _hybrid(
+        self,
+        vector_search: Callable[[int], list[dict]],
+        phrase: str,
+        number: int,
+    ) -> list[dict]:
+        # Fetch deeper than `number` from both retrievers so that fusion
+        # has overlap to work with
+        depth = max(4 * number, 20)
+        lexical = _get_lexical_pool().submit(
+            self.lexical_index.search, phrase, depth
+        )
+        vector_hits = vector_search(depth)
+        return self._fuse(vector_hits, phrase, number, lexical.result())
+
+    def _fuse(
+        self,
+        vector_hits: list[dict],
+        phrase: str,
+        number: int,
+        lexical_hits: Optional[list[tuple[str, float]]] = None,
+    ) -> list[dict]:
+        if lexical_hits is None:
+            lexical_hits = self.lexical_index.search(phrase, number)
+        if lexical_hits:
+            # The index may outlive records of a cleared collection
+            stored = self.container_collection.existing_ids(
+                [id for id, _ in lexical_hits]
+            )
+            lexical_hits = [hit for hit in lexical_hits if hit[0] in stored]
+
+        by_id = {hit["id"]: hit for hit in vector_hits}
+        fused = reciprocal_rank_fusion(
+            [list(by_id), [id for id, _ in lexical_hits]], k=self.rrf_k
+        )
+
+        results = []
+        for id, score in fused[:number]:
+            hit = by_id.get(id) or {
+                "id": id,
+                "metadata": {},
+                "distance": None,
+                "text": self.lexical_index.text(id),
+            }
+            results.append({**hit, "score": score})
+        return results
@@ -0,0 +1,229 @@
+from collections import deque
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    Sequence,
+)
+
+DEFAULT_SEPARATORS = ("\n\n", "\n", " ", "")
+
+# Characters buffered by `RecursiveTextSplitter.stream` before splitting
+STREAM_WINDOW_CHARS = 32 * 1024
+
+
+@lru_cache(maxsize=8)
+def get_tokenizer(encoding: str = "cl100k_base"):
+    """tiktoken encoding `encoding`, loaded once per process."""
+    try:
+        import tiktoken
+    except ImportError as e:
+        raise ImportError(
+            "Token-based splitting requires tiktoken (pip install tiktoken)."
+        ) from e
+    return tiktoken.get_encoding(encoding)
+
+
+class RecursiveTextSplitter:
+    """
+    Recursive character splitter: text is cut on the first separator that
+    occurs in it ("\\n\\n", then "\\n", then " ", then between characters),
+    pieces still longer than `chunk_size` are cut again on the next
+    separator, and neighbouring pieces are merged back into chunks of up to
+    `chunk_size` that overlap by up to `chunk_overlap`. Separators stay at
+    the start of the piece that follows them and chunks are stripped of
+    surrounding whitespace, so the chunks are exactly those of LangChain's
+    RecursiveCharacterTextSplitter with the same settings.
+
+    The work is done on (start, end) offsets into the source string: no
+    intermediate strings are built, and `spans` returns offsets only.
+
+    Example:
+
+        splitter = RecursiveTextSplitter(chunk_size=1500, chunk_overlap=150)
+        splitter.spans(text)  # [(0, 1498), (1362, 2871), ...]
+        splitter(text)  # the chunks themselves
+
+        by_tokens = RecursiveTextSplitter(512, 64, length="tokens")
+        for chunk in by_tokens.stream(open("/data/huge.txt")):
+            ...
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1500,
+        chunk_overlap: int = 150,
+        separators: Sequence[str] = DEFAULT_SEPARATORS,
+        length: Literal["chars", "tokens"] = "chars",
+        tokenizer: str | Any = "cl100k_base",
+    ):
+        """
+        Args:
+            chunk_size: Maximum length of a chunk.
+            chunk_overlap: Maximum overlap between consecutive chunks.
+            separators: Separators tried in order ("" splits between
+                characters).
+            length: Measure lengths in characters or in tokens.
+            tokenizer: Used when `length="tokens"`: the name of a tiktoken
+                encoding, or any object with an `encode(text)` method.
+        """
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"chunk_overlap ({chunk_overlap}) is larger than "
+                f"chunk_size ({chunk_size})"
+            )
+        if length not in ("chars", "tokens"):
+            raise ValueError(f"Unknown length {length!r}")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators)
+        self.length = length
+        self.tokenizer = tokenizer
+
+    def _length_function(self, text: str) -> Callable[[int, int], int]:
+        if self.length == "chars":
+            return lambda start, end: end - start
+        if isinstance(self.tokenizer, str):
+            encoding = get_tokenizer(self.tokenizer)
+            return lambda start, end: len(
+                encoding.encode(text[start:end], disallowed_special=())
+            )
+        encode = self.tokenizer.encode
+        return lambda start, end: len(encode(text[start:end]))
+
+    def spans(
+        self, text: str, start: int = 0, end: Optional[int] = None
+    ) -> list[tuple[int, int]]:
+        """(start, end) offsets of the chunks of `text[start:end]`."""
+        end = len(text) if end is None else end
+        chunks: list[tuple[int, int]] = []
+        self._split(text, start, end, 0, self._length_function(text), chunks)
+        return chunks
+
+    def split(self, text: str) -> list[str]:
+        return [text[start:end] for start, end in self.spans(text)]
+
+    __call__ = split
+
+    def stream(
+        self,
+        pieces: Iterable[str],
+        window_chars: int = STREAM_WINDOW_CHARS,
+    ) -> Iterator[str]:
+        """
+        Chunks of a text given as a stream of pieces (an open file, pages,
+        ...), keeping only about `window_chars` of it in memory. The text
+        from the start of the last chunk of each window is carried over into
+        the next window, so chunks never end at a window boundary.
+        """
+        buffer = ""
+        for piece in pieces:
+            buffer += piece
+            if len(buffer) < window_chars:
+                continue
+            spans = self.spans(buffer)
+            if len(spans) < 2:
+                continue
+            for start, end in spans[:-1]:
+                yield buffer[start:end]
+            buffer = buffer[spans[-1][0] :]
+        if buffer.strip():
+            yield from self.split(buffer)
+
+    def _split(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        level: int,
+        length: Callable[[int, int], int],
+        chunks: list[tuple[int, int]],
+    ) -> None:
+        separators = self.separators
+        level = next(
+            (
+                i
+                for i in range(level, len(separators))
+                if not separators[i]
+                or text.find(separators[i], start, end) >= 0
+            ),
+            len(separators) - 1,
+        )
+        separator = separators[level]
+        can_recurse = bool(separator) and level + 1 < len(separators)
+
+        good: list[tuple[int, int, int]] = []
+        for piece_start, piece_end in self._pieces(text, start, end, separator):
+            piece_length = length(piece_start, piece_end)
+            if piece_length < self.chunk_size:
+                good.append((piece_start, piece_end, piece_length))
+                continue
+            if good:
+                self._merge(text, good, chunks)
+                good = []
+            if can_recurse:
+                self._split(
+                    text, piece_start, piece_end, level + 1, length, chunks
+                )
+            else:
+                self._emit(text, piece_start, piece_end, chunks)
+        if good:
+            self._merge(text, good, chunks)
+
+    @staticmethod
+    def _pieces(
+        text: str, start: int, end: int, separator: str
+    ) -> Iterator[tuple[int, int]]:
+        """Non-empty pieces of text[start:end], each separator kept at the
+        start of the piece that follows it."""
+        if not separator:
+            for i in range(start, end):
+                yield i, i + 1
+            return
+        piece_start = start
+        position = text.find(separator, start, end)
+        while position >= 0:
+            if position > piece_start:
+                yield piece_start, position
+            piece_start = position
+            position = text.find(separator, position + len(separator), end)
+        if end > piece_start:
+            yield piece_start, end
+
+    def _merge(
+        self,
+        text: str,
+        pieces: list[tuple[int, int, int]],
+        chunks: list[tuple[int, int]],
+    ) -> None:
+        """Merge consecutive (start, end, length) pieces into chunks."""
+        current: deque[tuple[int, int, int]] = deque()
+        total = 0
+        for piece in pieces:
+            piece_length = piece[2]
+            if total + piece_length > self.chunk_size and current:
+                self._emit(text, current[0][0], current[-1][1], chunks)
+                while total > self.chunk_overlap or (
+                    total + piece_length > self.chunk_size and total > 0
+                ):
+                    total -= current.popleft()[2]
+            current.append(piece)
+            total += piece_length
+        if current:
+            self._emit(text, current[0][0], current[-1][1], chunks)
+
+    @staticmethod
+    def _emit(
+        text: str, start: int, end: int, chunks: list[tuple[int, int]]
+    ) -> None:
+        """Add text[start:end], stripped of whitespace, unless empty."""
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if end > start:
+            chunks.append((start, end))
@@ -1,25 +1,12 @@
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 import re
 from urllib.parse import urlparse
 
-# from markitdown import MarkItDown
+from typing import Literal, Optional
 
-from typing import Literal
+from swiftagent.memory.splitter import RecursiveTextSplitter
 
-_text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1500,
-    chunk_overlap=150,
-    length_function=len,
-    is_separator_regex=False,
-)
-
-# _markitdown = MarkItDown()
-
-
-def text_splitter(text: str) -> list[str]:
-    texts = _text_splitter.create_documents([text])
-
-    return [text.page_content for text in texts]
+# Default splitter of SemanticMemory: text_splitter(text) -> list[str]
+text_splitter = RecursiveTextSplitter(chunk_size=1500, chunk_overlap=150)
 
 
 def determine_type(
@@ -64,9 +51,20 @@ def determine_type(
     return "plain_string"
 
 
-def source_to_markdown(source: str):
+def source_to_markdown(source: str) -> str:
     """
-    Light wrapper around Microsoft's Markitdown
+    Markdown of a file or URL, converted with Microsoft's MarkItDown (loaded
+    on first use) and cached on disk; see `MarkdownConverter`.
     """
-    # return _markitdown.convert(source).text_content
-    return ""
+    from swiftagent.memory.convert import get_default_converter
+
+    return get_default_converter().convert(source)
+
+
+def sources_to_markdown(
+    sources: list[str], max_workers: Optional[int] = None
+) -> list[str]:
+    """Markdown of many files or URLs, converting files in parallel."""
+    from swiftagent.memory.convert import get_default_converter
+
+    return get_default_converter().convert_many(sources, max_workers)
@@ -1,9 +1,8 @@
 # swiftagent/memory/working.py
 import time
-from datetime import datetime
-from typing import List, Optional, Any
-from enum import Enum
-from dataclasses import dataclass, field
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Optional, Any
 
 from .base import Memory, MemoryItemType, MemoryItem
 from .long_term import LongTermMemory
@@ -19,10 +18,12 @@ class WorkingMemory(Memory):
     Each entry is a MemoryItem, containing:
       - item_type: TEXT or ACTION
       - content: The actual string
-      - timestamp: Local time in "hh:mm:ss dd/mm/yy" format
+      - timestamp: Epoch seconds (formatted only when building prompts)
 
     We maintain a max capacity (`max_items`). If we exceed capacity,
     the oldest item is evicted. You can optionally store evicted items into LTM.
+    `history` is a deque bounded by `max_items` (when `auto_evict` is set),
+    so evictions are O(1).
     """
 
     def __init__(
@@ -38,8 +39,10 @@ class WorkingMemory(Memory):
         self.max_items = max_items
         self.auto_evict = auto_evict
 
-        # Unified list of memory items. Each item is a MemoryItem.
-        self.history: List[MemoryItem] = []
+        # Unified timeline of memory items. Each item is a MemoryItem.
+        self.history: Deque[MemoryItem] = deque(
+            maxlen=max_items if auto_evict else None
+        )
 
         # Optionally link to a LongTermMemory, so that when we evict,
         # we can push them to LTM if they are "salient".
@@ -63,7 +66,7 @@ class WorkingMemory(Memory):
         """
         if not phrase:
             # Return the last `number` items if no phrase given
-            return self.history[-number:]
+            return self.get_recent_items(number)
 
         # Otherwise search from the end
         matching = []
@@ -74,23 +77,28 @@ class WorkingMemory(Memory):
                 break
         return matching
 
-    def add_item(self, item_type: MemoryItemType, content: str):
+    def add_item(
+        self,
+        item_type: MemoryItemType,
+        content: str,
+        timestamp: Optional[float] = None,
+    ):
         """
         Add a new MemoryItem (TEXT or ACTION) into the unified history,
-        automatically tagging it with a local-time timestamp.
+        stamped with the current epoch time unless `timestamp` is given.
         """
-        # Generate local-time timestamp in "hh:mm:ss dd/mm/yy"
-        local_timestamp = datetime.now().strftime("%H:%M:%S %m/%d/%y")
-
-        item = MemoryItem(
-            item_type=item_type,
-            content=content,
-            timestamp=local_timestamp,
-        )
-        self.history.append(item)
-
         if self.auto_evict:
-            self._maybe_evict_items()
+            # Make room first: a full bounded deque would drop the oldest
+            # item on append without it going through _handle_eviction
+            self._maybe_evict_items(reserve=1)
+
+        self.history.append(
+            MemoryItem(
+                item_type=item_type,
+                content=content,
+                timestamp=time.time() if timestamp is None else timestamp,
+            )
+        )
 
     def add_text(self, text_content: str) -> None:
         """
@@ -108,14 +116,17 @@ class WorkingMemory(Memory):
         """
         Return the last `limit` items from the unified memory stream.
         """
-        return self.history[-limit:]
+        if limit <= 0:
+            return []
+        return list(islice(reversed(self.history), limit))[::-1]
 
-    def _maybe_evict_items(self):
+    def _maybe_evict_items(self, reserve: int = 0):
         """
-        Evict oldest items if over capacity.
+        Evict oldest items if over capacity (keeping room for `reserve`
+        more items).
         """
-        while len(self.history) > self.max_items:
-            oldest_item = self.history.pop(0)
+        while self.history and len(self.history) + reserve > self.max_items:
+            oldest_item = self.history.popleft()
             self._handle_eviction(oldest_item)
 
     def _handle_eviction(self, item: MemoryItem):
@@ -132,7 +143,7 @@ class WorkingMemory(Memory):
         If you want them in LTM, decide here.
         """
         while self.history:
-            oldest_item = self.history.pop(0)
+            oldest_item = self.history.popleft()
             if await self.decide_salient_for_ltm(oldest_item.content):
                 long_term_memory.ingest_item(oldest_item)
 
@@ -4,7 +4,7 @@ import cloudpickle  # or dill
 from pathlib import Path
 
 from swiftagent.constants import CACHE_DIR
-from swiftagent.memory.base import MemoryItem, MemoryItemType
+from swiftagent.memory.base import MemoryItemType, to_epoch
 
 from typing import TYPE_CHECKING
 
@@ -63,6 +63,15 @@ class AgentRegistry:
                     "description": action_obj.description,
                     "params": action_obj.params,
                     "strict": action_obj.strict,
+                    "execution": (
+                        action_obj.execution.value
+                        if action_obj.execution
+                        else None
+                    ),
+                    "cache": (
+                        action_obj.cache.config if action_obj.cache else None
+                    ),
+                    "timeout": action_obj.timeout,
                     # We do not store "source_code" now—just a reference to .pkl
                     "pickle_path": f"actions/{action_name}.pkl",
                 }
@@ -167,6 +176,11 @@ class AgentRegistry:
                 instructions=agent.instruction,
                 working_memory=agent.working_memory,
                 long_term_memory=agent.long_term_memory,
+                max_parallel_actions=agent.reasoning.max_parallel_actions,
+                action_executor=agent.reasoning.action_executor,
+                context=agent.reasoning.context,
+                action_retriever=agent.reasoning.action_retriever,
+                recall_coordinator=agent.reasoning.recall_coordinator,
             )
 
         # 2) Load actions
@@ -198,6 +212,9 @@ class AgentRegistry:
                     description=a_desc,
                     params=a_params,
                     strict=a_strict,
+                    execution=meta.get("execution"),
+                    cache=meta.get("cache"),
+                    timeout=meta.get("timeout"),
                 )
                 agent.add_action(a_name, action_obj)
 
@@ -225,14 +242,18 @@ class AgentRegistry:
                         mtype_str = item_data.get("item_type", "TEXT")
                         mtype = MemoryItemType(mtype_str)
                         content = item_data.get("content", "")
-                        timestamp = item_data.get("timestamp", "")
-
-                        mem_item = MemoryItem(
-                            item_type=mtype,
-                            content=content,
-                            timestamp=timestamp,
+                        timestamp = item_data.get("timestamp")
+                        # Older saves hold "hh:mm:ss mm/dd/yy" local times
+                        if timestamp not in (None, ""):
+                            timestamp = to_epoch(timestamp)
+                        else:
+                            timestamp = None
+
+                        # add_item, so that items beyond max_items are
+                        # evicted through _handle_eviction like at runtime
+                        agent.working_memory.add_item(
+                            mtype, content, timestamp=timestamp
                         )
-                        agent.working_memory.history.append(mem_item)
 
             if "long_term_memory" in memconf:
                 from swiftagent.memory.long_term import LongTermMemory
@@ -1 +1,3 @@
-from .chroma import ChromaCollection, ChromaDatabase
+from .chroma import ChromaClientRegistry, ChromaCollection, ChromaDatabase
+from .numpy_store import NumpyCollection, NumpyDatabase
+from .quantization import ProductQuantizer, ScalarQuantizer
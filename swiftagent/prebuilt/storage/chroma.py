@@ -1,3 +1,8 @@
+import atexit
+import os
+import shutil
+import threading
+
 import chromadb
 from chromadb.config import Settings
 
@@ -7,33 +12,145 @@ import numpy as np
 
 from chromadb.utils import embedding_functions
 from swiftagent.core.embedder import SwiftEmbedder as EmbeddingFunction
+from swiftagent.core.embedding_cache import (
+    CachedEmbeddingFunction,
+    EmbeddingCache,
+)
+from swiftagent.core.filters import to_chroma_where
 
 from swiftagent.constants import CACHE_DIR
 
 default_embedding_function = embedding_functions.DefaultEmbeddingFunction()
 
+# Directory, inside the persist directory, holding the sidecar directory of
+# every collection (see VectorCollection.sidecar_directory)
+SIDECARS_DIR = "swiftagent_sidecars"
+
+
+class ChromaClientRegistry:
+    """
+    Process-wide pool of Chroma clients, one per (persist directory,
+    settings). Every ChromaDatabase on the same path shares one client (and
+    its SQLite connection and file handles) instead of opening its own.
+    Clients are reference counted: the last `release` closes the client, and
+    any clients still open are closed at interpreter exit.
+
+    Example:
+
+        client = ChromaClientRegistry.acquire("/data/chroma_db")
+        ...
+        ChromaClientRegistry.release("/data/chroma_db")
+    """
+
+    _clients: dict[tuple, list] = {}  # key -> [client, refcount]
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: str, settings: Optional[dict]) -> tuple:
+        options = {"allow_reset": True, **(settings or {})}
+        return (
+            os.path.realpath(path),
+            tuple(sorted((k, repr(v)) for k, v in options.items())),
+        )
+
+    @classmethod
+    def acquire(
+        cls, path: str, settings: Optional[dict] = None
+    ) -> chromadb.ClientAPI:
+        """
+        Shared client of `path`, created on first use.
+
+        Args:
+            path: Persist directory.
+            settings: Extra chromadb Settings fields (allow_reset is on by
+                default).
+        """
+        key = cls._key(path, settings)
+        with cls._lock:
+            entry = cls._clients.get(key)
+            if entry is None:
+                client = chromadb.PersistentClient(
+                    path=path,
+                    settings=Settings(
+                        **{"allow_reset": True, **(settings or {})}
+                    ),
+                )
+                entry = cls._clients[key] = [client, 0]
+            entry[1] += 1
+            return entry[0]
+
+    @classmethod
+    def release(cls, path: str, settings: Optional[dict] = None) -> None:
+        """Drop one reference; the last one closes the client."""
+        key = cls._key(path, settings)
+        with cls._lock:
+            entry = cls._clients.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del cls._clients[key]
+        cls._close(entry[0])
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every pooled client, whatever its reference count."""
+        with cls._lock:
+            clients = [client for client, _ in cls._clients.values()]
+            cls._clients.clear()
+        for client in clients:
+            cls._close(client)
+
+    @classmethod
+    def refcount(cls, path: str, settings: Optional[dict] = None) -> int:
+        entry = cls._clients.get(cls._key(path, settings))
+        return entry[1] if entry else 0
+
+    @staticmethod
+    def _close(client: chromadb.ClientAPI) -> None:
+        close = getattr(client, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+
+atexit.register(ChromaClientRegistry.close_all)
+
 
 class ChromaDatabase(VectorDatabase):
     def __init__(
         self,
         persist_directory: Optional[str] = None,
         embedding_function: Optional[EmbeddingFunction | Any] = None,
+        embedding_cache: EmbeddingCache | bool = False,
+        settings: Optional[dict] = None,
     ):
         """
-        Initialize ChromaDB database.
+        Initialize ChromaDB database. Databases on the same directory share
+        one client through ChromaClientRegistry; call `close` (or use the
+        database as a context manager) to release it early.
 
         Args:
             persist_directory: Directory for persistent storage.
             embedding_function: A custom embedding function instance that provides:
                 - embed(text: str) -> np.ndarray
                 - embedm(texts: List[str]) -> List[np.ndarray]
+            embedding_cache: Serve repeated texts/queries from the on-disk
+                embedding cache (True: shared cache of the model under
+                CACHE_DIR, which needs an embedding function with a
+                `model_id` or a Chroma built-in; or an EmbeddingCache
+                instance). Off by default.
+            settings: Extra chromadb Settings fields.
         """
         if persist_directory is None:
             persist_directory = str(CACHE_DIR / "chroma_db")
 
-        self._client = chromadb.PersistentClient(
-            path=persist_directory, settings=Settings(allow_reset=True)
-        )
+        self._client = ChromaClientRegistry.acquire(persist_directory, settings)
+        self._settings = settings
+        self._closed = False
 
         self.persist_directory = persist_directory
 
@@ -42,10 +159,14 @@ class ChromaDatabase(VectorDatabase):
         else:
             self._embedding_function = embedding_function
 
+        self.embedding_cache = embedding_cache
+
     def get_or_create_collection(
         self,
         name: str,
         embedding_function: Optional[EmbeddingFunction | Any] = None,
+        index: Optional[str] = None,
+        **index_options,
     ) -> "ChromaCollection":
         """
         Get or create a collection.
@@ -54,14 +175,33 @@ class ChromaDatabase(VectorDatabase):
             name: Collection name.
             embedding_function: Optional collection-specific embedding function.
                 If not provided, uses the database-level embedding function.
+            index: Chroma always uses an HNSW graph; only "hnsw" (or None)
+                is accepted.
+            **index_options: HNSW parameters stored as `hnsw:<name>`
+                collection metadata, e.g. search_ef=100, M=32,
+                construction_ef=200 (`ef` is an alias of search_ef).
         """
+        if index not in (None, "hnsw"):
+            raise ValueError(
+                f"ChromaDatabase only supports the 'hnsw' index, got '{index}'"
+            )
+
         ef = embedding_function or self._embedding_function
 
+        metadata = {
+            f"hnsw:{'search_ef' if key == 'ef' else key}": value
+            for key, value in index_options.items()
+        }
         collection = self._client.get_or_create_collection(
-            name=name, embedding_function=ef
+            name=name, embedding_function=ef, metadata=metadata or None
         )
 
-        return ChromaCollection(collection, embedding_function=ef)
+        return ChromaCollection(
+            collection,
+            embedding_function=ef,
+            path=self.persist_directory,
+            embedding_cache=self.embedding_cache,
+        )
 
     def list_collections(self) -> List[str]:
         return self._client.list_collections()
@@ -69,14 +209,34 @@ class ChromaDatabase(VectorDatabase):
     def delete_collection(self, name: str) -> bool:
         try:
             self._client.delete_collection(name)
-            return True
         except Exception as e:
             print(f"Error deleting collection: {e}")
             return False
+        shutil.rmtree(
+            ChromaCollection.sidecar_path(self.persist_directory, name),
+            ignore_errors=True,
+        )
+        return True
 
     def clear(self):
+        shutil.rmtree(
+            os.path.join(self.persist_directory, SIDECARS_DIR),
+            ignore_errors=True,
+        )
         return self._client.reset()
 
+    def close(self) -> None:
+        """Release this database's reference to the shared client."""
+        if not self._closed:
+            self._closed = True
+            ChromaClientRegistry.release(self.persist_directory, self._settings)
+
+    def __enter__(self) -> "ChromaDatabase":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
 
 class ChromaCollection(VectorCollection):
     def __init__(
@@ -84,6 +244,7 @@ class ChromaCollection(VectorCollection):
         collection: chromadb.Collection,
         embedding_function: Optional[EmbeddingFunction | Any] = None,
         path: Optional[str] = None,
+        embedding_cache: EmbeddingCache | bool = False,
     ):
         """
         Initialize ChromaDB collection wrapper.
@@ -91,8 +252,23 @@ class ChromaCollection(VectorCollection):
         Args:
             collection: ChromaDB collection instance.
             embedding_function: The embedding function to use at the collection level.
+            embedding_cache: Cache the embeddings computed by `add_texts` and
+                `search_by_text` (True or an EmbeddingCache instance).
         """
         self._collection = collection
+        if (
+            embedding_function is not None
+            and embedding_cache
+            and getattr(embedding_function, "cache", None) is None
+        ):
+            embedding_function = CachedEmbeddingFunction(
+                embedding_function,
+                (
+                    embedding_cache
+                    if isinstance(embedding_cache, EmbeddingCache)
+                    else None
+                ),
+            )
         self._embedding_function = embedding_function
         self._dimension: Optional[int] = None
 
@@ -105,47 +281,62 @@ class ChromaCollection(VectorCollection):
         vectors: np.ndarray,
         texts: Optional[List[str]] = None,
         metadata: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
     ) -> List[str]:
         """
         Add vectors to the collection with optional texts and metadata.
+        Existing ids are overwritten (upsert), so adding the same content
+        twice stores it once.
 
         Args:
             vectors: Array of vectors to add
             texts: Optional list of text content corresponding to the vectors
             metadata: Optional list of metadata dictionaries
+            ids: Optional ids (defaults to content hashes, see content_ids)
         """
-        ids = [
-            f"vec_{i}_{np.random.randint(0, 1000000)}"
-            for i in range(len(vectors))
-        ]
+        vectors = np.asarray(vectors)
+        if texts is not None and len(texts) != len(vectors):
+            raise ValueError("Number of texts must match number of vectors")
+        if ids is None:
+            ids = self.content_ids(vectors, texts, metadata)
+        elif len(ids) != len(vectors):
+            raise ValueError("Number of ids must match number of vectors")
+        if len(ids) == 0:
+            return []
 
         # Handle metadata
         if metadata is None:
             metadata = [{"default": True} for _ in range(len(vectors))]
+        else:
+            metadata = [dict(m or {"default": True}) for m in metadata]
 
         # Add text content to metadata if provided
         if texts is not None:
-            if len(texts) != len(vectors):
-                raise ValueError("Number of texts must match number of vectors")
             for i, text in enumerate(texts):
                 metadata[i]["text_content"] = text
 
         if self._dimension is None:
             self._dimension = vectors.shape[1]
 
-        self._collection.add(
-            embeddings=vectors.tolist(),
-            metadatas=metadata,
-            ids=ids,
+        # Chroma rejects repeated ids within one call; the last one wins
+        rows = list({id: row for row, id in enumerate(ids)}.values())
+        self._collection.upsert(
+            embeddings=vectors[rows].tolist(),
+            metadatas=[metadata[row] for row in rows],
+            ids=[ids[row] for row in rows],
             documents=(
-                texts if texts is not None else None
+                [texts[row] for row in rows] if texts is not None else None
             ),  # Store texts in documents field
         )
 
-        return ids
+        return list(ids)
 
     def search(
-        self, query_vector: np.ndarray, k: int = 5, include_text: bool = True
+        self,
+        query_vector: np.ndarray,
+        k: int = 5,
+        include_text: bool = True,
+        where: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search for similar vectors.
@@ -154,6 +345,8 @@ class ChromaCollection(VectorCollection):
             query_vector: Vector to search for
             k: Number of results to return
             include_text: Whether to include the text content in results
+            where: Optional metadata filter, passed to Chroma as its
+                `where` clause
         """
         query_vector = (
             query_vector.reshape(1, -1)
@@ -163,6 +356,7 @@ class ChromaCollection(VectorCollection):
         results = self._collection.query(
             query_embeddings=query_vector.tolist(),
             n_results=k,
+            where=to_chroma_where(where),
             include=(
                 ["metadatas", "distances", "documents"]
                 if include_text
@@ -215,7 +409,8 @@ class ChromaCollection(VectorCollection):
         self, texts: List[str], metadata: Optional[List[Dict[str, Any]]] = None
     ) -> List[str]:
         """
-        Helper method to embed texts and add them to the collection.
+        Helper method to embed texts and add them to the collection. Texts
+        that are already stored are neither embedded nor written again.
 
         Args:
             texts: List of texts to embed and store
@@ -225,11 +420,38 @@ class ChromaCollection(VectorCollection):
             raise ValueError(
                 "No embedding function set at the collection level."
             )
-        vectors = np.array(self._embedding_function(texts))
-        return self.add_vectors(vectors, texts=texts, metadata=metadata)
+        ids = self.content_ids(texts=texts, metadata=metadata)
+        if not ids:
+            return []
+
+        # Only embed and write what is not stored yet
+        stored = self.existing_ids(ids)
+        new = [
+            row
+            for id, row in {id: row for row, id in enumerate(ids)}.items()
+            if id not in stored
+        ]
+        if new:
+            new_texts = [texts[row] for row in new]
+            vectors = np.array(self._embedding_function(new_texts))
+            self.add_vectors(
+                vectors,
+                texts=new_texts,
+                metadata=(
+                    [metadata[row] for row in new]
+                    if metadata is not None
+                    else None
+                ),
+                ids=[ids[row] for row in new],
+            )
+        return ids
 
     def search_by_text(
-        self, text: str, k: int = 5, include_text: bool = True
+        self,
+        text: str,
+        k: int = 5,
+        include_text: bool = True,
+        where: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search by text query.
@@ -238,6 +460,7 @@ class ChromaCollection(VectorCollection):
             text: Text to search for
             k: Number of results to return
             include_text: Whether to include the text content in results
+            where: Optional metadata filter (see `search`)
         """
 
         if not self._embedding_function:
@@ -247,7 +470,16 @@ class ChromaCollection(VectorCollection):
 
         query_vector = self._embedding_function([text])[0]
 
-        return self.search(query_vector, k, include_text=include_text)
+        return self.search(
+            query_vector, k, include_text=include_text, where=where
+        )
+
+    def existing_ids(self, ids: List[str]) -> set:
+        """The subset of `ids` already stored in the collection."""
+        if not ids:
+            return set()
+        unique = list(dict.fromkeys(ids))
+        return set(self._collection.get(ids=unique, include=[])["ids"])
 
     def delete_vectors(self, ids: List[str]) -> bool:
         try:
@@ -260,10 +492,19 @@ class ChromaCollection(VectorCollection):
     def clear(self) -> bool:
         try:
             self._collection.delete(ids=self._collection.get()["ids"])
-            return True
         except Exception as e:
             print(f"Error clearing collection: {e}")
             return False
+        shutil.rmtree(self.sidecar_directory, ignore_errors=True)
+        return True
+
+    @staticmethod
+    def sidecar_path(persist_directory: str, name: str) -> str:
+        return os.path.join(persist_directory, SIDECARS_DIR, name)
+
+    @property
+    def sidecar_directory(self) -> str:
+        return self.sidecar_path(self.path, self.name)
 
     @property
     def dimension(self) -> int:
@@ -278,3 +519,7 @@ class ChromaCollection(VectorCollection):
     @property
     def name(self) -> str:
         return self._collection.name
+
+    @property
+    def embedding_function(self) -> Optional[EmbeddingFunction | Any]:
+        return self._embedding_function
@@ -0,0 +1,245 @@
+import os
+from typing import Optional
+
+import numpy as np
+
+# Assignment / k-means work is done in blocks of this many rows
+BLOCK_ROWS = 65536
+
+
+def _prepare(vectors: np.ndarray, metric: str) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if metric == "cosine":
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+    return vectors
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid (L2) of every row, computed in blocks."""
+    half_sq = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), BLOCK_ROWS):
+        block = vectors[start : start + BLOCK_ROWS]
+        out[start : start + len(block)] = np.argmax(
+            block @ centroids.T - half_sq, axis=1
+        )
+    return out
+
+
+def kmeans(
+    vectors: np.ndarray,
+    k: int,
+    iterations: int = 20,
+    seed: int = 0,
+) -> np.ndarray:
+    """Plain Lloyd's k-means; empty clusters are re-seeded from random rows."""
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    centroids = vectors[rng.choice(n, size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assign = _nearest(vectors, centroids)
+        counts = np.bincount(assign, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = vectors[rng.choice(n, size=int(empty.sum()))]
+
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file index: k-means centroids partition the vectors into
+    `nlist` lists, and a query only scores the rows of its `nprobe` nearest
+    lists. Raising `nprobe` trades latency for recall (nprobe = nlist is an
+    exact search).
+
+    The index trains itself once `min_train_rows` vectors have been added
+    (until then the collection scans everything). Later inserts are assigned
+    to the existing centroids incrementally. Centroids are saved to
+    `ivf_centroids.npy` and the list of every row is appended to
+    `ivf_assign.bin`, in the collection directory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        metric: str = "cosine",
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        min_train_rows: int = 4096,
+        max_train_rows: int = 100_000,
+    ):
+        """
+        Args:
+            path: Collection directory holding the index files.
+            metric: Distance of the collection ("cosine", "l2" or "ip").
+            nlist: Number of lists (defaults to ~sqrt(rows) at training).
+            nprobe: Lists scanned per query by default.
+            min_train_rows: Rows needed before the index is trained.
+            max_train_rows: Sample size used to train the centroids.
+        """
+        self.path = path
+        self.metric = metric
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_rows = min_train_rows
+        self.max_train_rows = max_train_rows
+
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: list[list[int]] = []
+        self._arrays: dict[int, np.ndarray] = {}
+        self._rows = 0
+
+    @property
+    def _centroids_path(self) -> str:
+        return os.path.join(self.path, "ivf_centroids.npy")
+
+    @property
+    def _assign_path(self) -> str:
+        return os.path.join(self.path, "ivf_assign.bin")
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def config(self) -> dict:
+        return {
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "min_train_rows": self.min_train_rows,
+            "max_train_rows": self.max_train_rows,
+        }
+
+    def load(self, rows: int, matrix: Optional[np.ndarray]) -> None:
+        """
+        Restore the index for a collection of `rows` rows, assigning any
+        rows missing from the file (e.g. after a crash).
+        """
+        if not os.path.exists(self._centroids_path):
+            self._maybe_train(rows, matrix)
+            return
+
+        self.centroids = np.load(self._centroids_path)
+        self.nlist = len(self.centroids)
+        assign = (
+            np.fromfile(self._assign_path, dtype=np.int32)
+            if os.path.exists(self._assign_path)
+            else np.zeros(0, dtype=np.int32)
+        )
+        if len(assign) > rows:
+            os.truncate(self._assign_path, rows * 4)
+            assign = assign[:rows]
+        self._set_assignments(assign)
+
+        if len(assign) < rows:
+            self.add(len(assign), matrix[len(assign) : rows])
+
+    def _set_assignments(self, assign: np.ndarray) -> None:
+        self._lists = [[] for _ in range(self.nlist)]
+        for row, list_id in enumerate(assign.tolist()):
+            self._lists[list_id].append(row)
+        self._arrays = {}
+        self._rows = len(assign)
+
+    def _maybe_train(self, rows: int, matrix: Optional[np.ndarray]) -> None:
+        if self.trained or rows < self.min_train_rows or matrix is None:
+            return
+
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(
+            rng.choice(rows, size=min(rows, self.max_train_rows), replace=False)
+        )
+        sample = _prepare(matrix[sample_rows], self.metric)
+
+        nlist = self.nlist or max(1, int(np.sqrt(rows)))
+        nlist = min(nlist, len(sample))
+        self.centroids = kmeans(sample, nlist)
+        self.nlist = nlist
+        np.save(self._centroids_path, self.centroids)
+
+        if os.path.exists(self._assign_path):
+            os.remove(self._assign_path)
+        self._set_assignments(np.zeros(0, dtype=np.int32))
+        self.add(0, matrix[:rows])
+
+    def add(self, first_row: int, vectors: np.ndarray) -> None:
+        """Assign rows `first_row ...` (already stored) to their lists."""
+        if not self.trained:
+            return
+        assign = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), BLOCK_ROWS):
+            block = _prepare(vectors[start : start + BLOCK_ROWS], self.metric)
+            assign[start : start + len(block)] = _nearest(block, self.centroids)
+
+        with open(self._assign_path, "ab") as f:
+            f.write(assign.tobytes())
+        for offset, list_id in enumerate(assign.tolist()):
+            self._lists[list_id].append(first_row + offset)
+            self._arrays.pop(list_id, None)
+        self._rows = first_row + len(vectors)
+
+    def on_rows_added(self, rows: int, matrix: np.ndarray, first_row: int):
+        """Hook for the collection after an append of rows `first_row ...`."""
+        if self.trained:
+            self.add(first_row, matrix[first_row:rows])
+        else:
+            self._maybe_train(rows, matrix)
+
+    def candidates(
+        self, query: np.ndarray, nprobe: Optional[int] = None
+    ) -> Optional[np.ndarray]:
+        """Rows of the `nprobe` lists nearest to `query` (None if untrained)."""
+        if not self.trained:
+            return None
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+
+        q = _prepare(query.reshape(1, -1), self.metric)[0]
+        scores = self.centroids @ q - 0.5 * np.einsum(
+            "ij,ij->i", self.centroids, self.centroids
+        )
+        probes = np.argpartition(-scores, nprobe - 1)[:nprobe]
+
+        arrays = []
+        for list_id in probes.tolist():
+            array = self._arrays.get(list_id)
+            if array is None:
+                array = self._arrays[list_id] = np.asarray(
+                    self._lists[list_id], dtype=np.int64
+                )
+            arrays.append(array)
+        return np.concatenate(arrays) if arrays else np.zeros(0, np.int64)
+
+    def remap(self, live: np.ndarray) -> None:
+        """Renumber rows after compaction kept only the rows `live`."""
+        if not self.trained:
+            return
+        assign = np.empty(self._rows, dtype=np.int32)
+        for list_id, rows in enumerate(self._lists):
+            assign[rows] = list_id
+        assign = assign[live]
+        tmp_path = self._assign_path + ".tmp"
+        assign.tofile(tmp_path)
+        os.replace(tmp_path, self._assign_path)
+        self._set_assignments(assign)
+
+    def drop_row_file(self) -> None:
+        """Delete the row assignments; `load` reassigns the rows."""
+        if os.path.exists(self._assign_path):
+            os.remove(self._assign_path)
+
+    def reset(self) -> None:
+        """Forget the centroids; the index retrains once enough rows exist."""
+        for path in (self._centroids_path, self._assign_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.centroids = None
+        self._lists = []
+        self._arrays = {}
+        self._rows = 0
@@ -0,0 +1,956 @@
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from swiftagent.constants import CACHE_DIR
+from swiftagent.core.embedding_cache import (
+    CachedEmbeddingFunction,
+    EmbeddingCache,
+)
+from swiftagent.core.filters import match_where
+from swiftagent.core.storage import VectorCollection, VectorDatabase
+from swiftagent.prebuilt.storage.ivf import IVFIndex
+from swiftagent.prebuilt.storage.quantization import (
+    QUANTIZATIONS,
+    Quantizer,
+    make_quantizer,
+)
+
+# Rows scored per block, bounding the temporary float32 copy of float16 data
+SCORE_BLOCK_ROWS = 65536
+
+METRICS = ("cosine", "l2", "ip")
+
+INDEXES = ("flat", "ivf")
+
+
+class NumpyDatabase(VectorDatabase):
+    """
+    In-process vector database: one directory per collection, no server, no
+    SQLite and no graph index. Meant for the many small per-agent memories
+    where starting a Chroma client dominates startup time and RSS.
+
+    A collection directory is opened once per process: every NumpyDatabase
+    on the same directory gets the same NumpyCollection, since independent
+    instances would append to the same files from the same row.
+
+    Example:
+
+        db = NumpyDatabase()
+        memory = LongTermMemory(
+            container_collection=db.get_or_create_collection("agent_ltm")
+        )
+    """
+
+    # realpath of the collection directory -> (collection, embedding
+    # function it was opened with)
+    _open_collections: dict[str, tuple["NumpyCollection", Any]] = {}
+    _open_lock = threading.Lock()
+
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        embedding_function: Optional[Any] = None,
+        dtype: str = "float32",
+        metric: str = "cosine",
+        embedding_cache: EmbeddingCache | bool = False,
+        quantization: Optional[str] = None,
+        quantization_options: Optional[dict] = None,
+    ):
+        """
+        Args:
+            persist_directory: Root directory (defaults to CACHE_DIR/numpy_db).
+            embedding_function: Used by `add_texts` / `search_by_text`
+                (defaults to Chroma's default embedding function).
+            dtype: Storage type of new collections, "float32" or "float16".
+            metric: Distance of new collections: "cosine", "l2" or "ip".
+            embedding_cache: See ChromaDatabase.
+            quantization: Compression of new collections: None, "sq8" or
+                "pq" (see NumpyCollection).
+            quantization_options: Quantizer options, e.g. {"rerank": 50}.
+        """
+        if persist_directory is None:
+            persist_directory = str(CACHE_DIR / "numpy_db")
+        self.persist_directory = persist_directory
+        Path(persist_directory).mkdir(parents=True, exist_ok=True)
+
+        if embedding_function is None:
+            from swiftagent.prebuilt.storage.chroma import (
+                default_embedding_function,
+            )
+
+            embedding_function = default_embedding_function
+        self._embedding_function = embedding_function
+
+        self.dtype = dtype
+        self.metric = metric
+        self.embedding_cache = embedding_cache
+        self.quantization = quantization
+        self.quantization_options = quantization_options
+
+    def get_or_create_collection(
+        self,
+        name: str,
+        embedding_function: Optional[Any] = None,
+        index: Optional[str] = None,
+        **index_options,
+    ) -> "NumpyCollection":
+        """
+        Get or create a collection. Collections are shared process-wide
+        by directory, so every caller (through any NumpyDatabase on the same
+        path) gets the same instance and file handles.
+
+        Args:
+            name: Collection name.
+            embedding_function: Optional collection-specific embedding function.
+            index: "flat" (exact, default) or "ivf" (approximate, see
+                IVFIndex). Fixed when the collection is created.
+            **index_options: IVFIndex options, e.g. nlist=1024, nprobe=16.
+        """
+        path = os.path.join(self.persist_directory, name)
+        key = os.path.realpath(path)
+        ef = embedding_function or self._embedding_function
+        with NumpyDatabase._open_lock:
+            entry = NumpyDatabase._open_collections.get(key)
+            if entry is not None:
+                collection, opened_with = entry
+                if opened_with is not ef:
+                    raise ValueError(
+                        f"Collection '{name}' is already open with another "
+                        "embedding function"
+                    )
+                return collection
+
+            collection = NumpyCollection(
+                path=path,
+                embedding_function=ef,
+                dtype=self.dtype,
+                metric=self.metric,
+                embedding_cache=self.embedding_cache,
+                index=index,
+                index_options=index_options,
+                quantization=self.quantization,
+                quantization_options=self.quantization_options,
+            )
+            NumpyDatabase._open_collections[key] = (collection, ef)
+            return collection
+
+    def list_collections(self) -> List[str]:
+        return sorted(
+            entry.name
+            for entry in os.scandir(self.persist_directory)
+            if entry.is_dir()
+        )
+
+    def delete_collection(self, name: str) -> bool:
+        path = os.path.join(self.persist_directory, name)
+        with NumpyDatabase._open_lock:
+            NumpyDatabase._open_collections.pop(os.path.realpath(path), None)
+        if not os.path.isdir(path):
+            return False
+        shutil.rmtree(path)
+        return True
+
+    def clear(self):
+        for name in self.list_collections():
+            self.delete_collection(name)
+
+
+class NumpyCollection(VectorCollection):
+    """
+    A vector collection stored as:
+
+      - `vectors.bin`: a float32/float16 matrix, appended to and read back
+        through a memory map
+      - `records.jsonl`: an append-only log of adds (id, row, text, metadata)
+        and deletes (tombstones)
+
+    Search is exact by default: one vectorized matmul over the live rows
+    plus `argpartition`. With `index="ivf"` only the rows of the lists
+    nearest to the query are scored (see IVFIndex). With `quantization`
+    ("sq8" or "pq") searches scan compact codes instead of the full vectors,
+    optionally re-ranking the best candidates at full precision (see
+    ScalarQuantizer, ProductQuantizer and `quantization_report`). This cuts
+    the memory searches touch, not disk use: the codes are stored in
+    addition to `vectors.bin`. Deleted rows stay on
+    disk until `compact` rewrites the files, which happens automatically
+    once `auto_compact` of the rows are dead.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        embedding_function: Optional[Any] = None,
+        dtype: str = "float32",
+        metric: str = "cosine",
+        embedding_cache: EmbeddingCache | bool = False,
+        auto_compact: Optional[float] = 0.5,
+        index: Optional[str] = None,
+        index_options: Optional[dict] = None,
+        quantization: Optional[str] = None,
+        quantization_options: Optional[dict] = None,
+    ):
+        """
+        Args:
+            path: Directory of the collection files.
+            embedding_function: Used by `add_texts` / `search_by_text`.
+            dtype: "float32" or "float16" (ignored for existing collections).
+            metric: "cosine", "l2" or "ip" (ignored for existing collections).
+            embedding_cache: Cache the embeddings of `add_texts` and
+                `search_by_text` (True or an EmbeddingCache instance).
+            auto_compact: Fraction of dead rows that triggers compaction
+                on delete (None disables it).
+            index: "flat" or "ivf" (ignored for existing collections).
+            index_options: IVFIndex options (nlist, nprobe, ...).
+            quantization: None, "sq8" or "pq" (ignored for existing
+                collections).
+            quantization_options: Quantizer options (rerank, m, ...).
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected {METRICS}")
+        if index not in (None, *INDEXES):
+            raise ValueError(f"Unknown index '{index}', expected {INDEXES}")
+        if quantization not in (None, *QUANTIZATIONS):
+            raise ValueError(
+                f"Unknown quantization '{quantization}', "
+                f"expected {QUANTIZATIONS}"
+            )
+
+        self.path = path
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+        if (
+            embedding_function is not None
+            and embedding_cache
+            and getattr(embedding_function, "cache", None) is None
+        ):
+            embedding_function = CachedEmbeddingFunction(
+                embedding_function,
+                (
+                    embedding_cache
+                    if isinstance(embedding_cache, EmbeddingCache)
+                    else None
+                ),
+            )
+        self._embedding_function = embedding_function
+        self.auto_compact = auto_compact
+
+        self._lock = threading.RLock()
+        self._dtype = np.dtype(dtype)
+        self._metric = metric
+        self._dimension: Optional[int] = None
+        self._index_type = index or "flat"
+        self._index_options = dict(index_options or {})
+        self._index: Optional[IVFIndex] = None
+        self._quantization = quantization
+        self._quantization_options = dict(quantization_options or {})
+        self._quantizer: Optional[Quantizer] = None
+
+        # Row-aligned state
+        self._ids: list[str] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._sq_norms = np.zeros(0, dtype=np.float32)
+        # id -> (row, text, metadata) of live records
+        self._records: dict[str, tuple[int, Optional[str], dict]] = {}
+        self._matrix: Optional[np.memmap] = None
+
+        recovered = self._recover_compaction()
+        self._load()
+
+        if self._index_type == "ivf":
+            self._index = IVFIndex(
+                self.path, metric=self._metric, **self._index_options
+            )
+        if self._quantization is not None:
+            self._quantizer = make_quantizer(
+                self._quantization,
+                self.path,
+                metric=self._metric,
+                **self._quantization_options,
+            )
+        for index in (self._index, self._quantizer):
+            if index is not None:
+                if recovered:
+                    # Its rows may predate the compaction: rebuild them
+                    index.drop_row_file()
+                index.load(len(self._ids), self._get_matrix())
+        if recovered:
+            os.remove(self._compact_marker_path)
+
+    ##############################
+    # Files
+    ##############################
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, "vectors.bin")
+
+    @property
+    def _records_path(self) -> str:
+        return os.path.join(self.path, "records.jsonl")
+
+    @property
+    def _compact_marker_path(self) -> str:
+        return os.path.join(self.path, "compact.pending")
+
+    def _staged_files(self) -> list[tuple[str, str]]:
+        """(staged, live) paths of the files rewritten by `compact`."""
+        return [
+            (path + ".compact", path)
+            for path in (self._vectors_path, self._records_path)
+        ]
+
+    def _install_staged(self) -> None:
+        for staged, live in self._staged_files():
+            if os.path.exists(staged):
+                os.replace(staged, live)
+
+    def _recover_compaction(self) -> bool:
+        """
+        Settle a compaction interrupted by a crash: once its marker exists
+        both staged files are complete and it is rolled forward, otherwise
+        the partial staged files are dropped. True if it was rolled forward.
+        """
+        if os.path.exists(self._compact_marker_path):
+            self._install_staged()
+            return True
+        for staged, _ in self._staged_files():
+            if os.path.exists(staged):
+                os.remove(staged)
+        return False
+
+    def _write_meta(self) -> None:
+        with open(self._meta_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "dimension": self._dimension,
+                    "dtype": self._dtype.name,
+                    "metric": self._metric,
+                    "index": self._index_type,
+                    "index_options": self._index_options,
+                    "quantization": self._quantization,
+                    "quantization_options": self._quantization_options,
+                },
+                f,
+            )
+
+    def _load(self) -> None:
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self._dimension = meta["dimension"]
+        self._dtype = np.dtype(meta["dtype"])
+        self._metric = meta.get("metric", self._metric)
+        self._index_type = meta.get("index", "flat")
+        self._index_options = meta.get("index_options", {})
+        self._quantization = meta.get("quantization")
+        self._quantization_options = meta.get("quantization_options", {})
+        if self._dimension is None:
+            return
+
+        row_bytes = self._dimension * self._dtype.itemsize
+        vector_rows = (
+            os.path.getsize(self._vectors_path) // row_bytes
+            if os.path.exists(self._vectors_path)
+            else 0
+        )
+
+        ids: list[str] = []
+        records: dict[str, tuple[int, Optional[str], dict]] = {}
+        good_bytes = 0
+        if os.path.exists(self._records_path):
+            with open(self._records_path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn last line
+                    if entry["op"] == "add":
+                        if entry["row"] != len(ids) or entry["row"] >= (
+                            vector_rows
+                        ):
+                            break
+                        ids.append(entry["id"])
+                        records[entry["id"]] = (
+                            entry["row"],
+                            entry.get("text"),
+                            entry.get("metadata") or {},
+                        )
+                    elif entry["op"] == "delete":
+                        records.pop(entry["id"], None)
+                    good_bytes += len(line)
+
+        # Drop any torn tail (vectors are written before their records) so
+        # that later appends stay row-aligned
+        rows = len(ids)
+        if os.path.exists(self._records_path):
+            if os.path.getsize(self._records_path) > good_bytes:
+                os.truncate(self._records_path, good_bytes)
+        if vector_rows > rows:
+            os.truncate(self._vectors_path, rows * row_bytes)
+        self._ids = ids
+        self._records = records
+
+        self._alive = np.zeros(rows, dtype=bool)
+        for row, _, _ in self._records.values():
+            self._alive[row] = True
+
+        self._sq_norms = np.zeros(rows, dtype=np.float32)
+        matrix = self._get_matrix()
+        for start in range(0, rows, SCORE_BLOCK_ROWS):
+            block = np.asarray(
+                matrix[start : start + SCORE_BLOCK_ROWS], dtype=np.float32
+            )
+            self._sq_norms[start : start + len(block)] = np.einsum(
+                "ij,ij->i", block, block
+            )
+
+    def _get_matrix(self) -> Optional[np.memmap]:
+        rows = len(self._ids)
+        if rows == 0:
+            return None
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(
+                self._vectors_path,
+                dtype=self._dtype,
+                mode="r",
+                shape=(rows, self._dimension),
+            )
+        return self._matrix
+
+    def _append_records(self, entries: list[dict]) -> None:
+        with open(self._records_path, "a", encoding="utf-8") as f:
+            f.write(
+                "".join(
+                    json.dumps(e, ensure_ascii=False, default=str) + "\n"
+                    for e in entries
+                )
+            )
+
+    ##############################
+    # VectorCollection
+    ##############################
+
+    def add_vectors(
+        self,
+        vectors: np.ndarray,
+        texts: Optional[List[str]] = None,
+        metadata: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        Add vectors to the collection with optional texts and metadata.
+        Existing ids are replaced (upsert).
+
+        Args:
+            vectors: Array of vectors to add
+            texts: Optional list of text content corresponding to the vectors
+            metadata: Optional list of metadata dictionaries
+            ids: Optional ids (defaults to content hashes, see content_ids)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        n = len(vectors)
+        if texts is not None and len(texts) != n:
+            raise ValueError("Number of texts must match number of vectors")
+        if metadata is not None and len(metadata) != n:
+            raise ValueError("Number of metadata must match number of vectors")
+        if ids is None:
+            ids = self.content_ids(vectors, texts, metadata)
+        elif len(ids) != n:
+            raise ValueError("Number of ids must match number of vectors")
+        if n == 0:
+            return []
+        all_ids = list(ids)
+
+        # Repeated ids within the batch: the last one wins
+        rows = list({id: row for row, id in enumerate(ids)}.values())
+        if len(rows) < n:
+            vectors = vectors[rows]
+            texts = [texts[r] for r in rows] if texts is not None else None
+            metadata = (
+                [metadata[r] for r in rows] if metadata is not None else None
+            )
+            ids = [ids[r] for r in rows]
+            n = len(rows)
+
+        with self._lock:
+            if self._dimension is None:
+                self._dimension = int(vectors.shape[1])
+                self._write_meta()
+            elif vectors.shape[1] != self._dimension:
+                raise ValueError(
+                    f"Vector dimension {vectors.shape[1]} does not match "
+                    f"collection dimension {self._dimension}"
+                )
+
+            self._tombstone([i for i in ids if i in self._records])
+
+            first_row = len(self._ids)
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.astype(self._dtype).tobytes())
+
+            entries = []
+            for offset in range(n):
+                entries.append(
+                    {
+                        "op": "add",
+                        "id": ids[offset],
+                        "row": first_row + offset,
+                        "text": texts[offset] if texts is not None else None,
+                        "metadata": (
+                            metadata[offset] if metadata is not None else {}
+                        ),
+                    }
+                )
+            self._append_records(entries)
+
+            # Norms of the stored (possibly float16-rounded) vectors
+            stored = vectors.astype(self._dtype).astype(np.float32)
+            self._sq_norms = np.concatenate(
+                [self._sq_norms, np.einsum("ij,ij->i", stored, stored)]
+            )
+            self._alive = np.concatenate([self._alive, np.ones(n, bool)])
+            for entry in entries:
+                self._ids.append(entry["id"])
+                self._records[entry["id"]] = (
+                    entry["row"],
+                    entry["text"],
+                    entry["metadata"],
+                )
+            self._matrix = None
+
+            for index in (self._index, self._quantizer):
+                if index is not None:
+                    index.on_rows_added(
+                        len(self._ids), self._get_matrix(), first_row
+                    )
+
+        return all_ids
+
+    def _distances(
+        self, query: np.ndarray, rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Distances from `query` to `rows` (all rows if None)."""
+        matrix = self._get_matrix()
+        if rows is None:
+            dots = np.empty(len(self._ids), dtype=np.float32)
+            for start in range(0, len(dots), SCORE_BLOCK_ROWS):
+                block = np.asarray(
+                    matrix[start : start + SCORE_BLOCK_ROWS], dtype=np.float32
+                )
+                dots[start : start + len(block)] = block @ query
+            sq_norms = self._sq_norms
+        else:
+            dots = np.asarray(matrix[rows], dtype=np.float32) @ query
+            sq_norms = self._sq_norms[rows]
+
+        if self._metric == "ip":
+            return -dots
+        if self._metric == "l2":
+            return np.maximum(sq_norms - 2 * dots + float(query @ query), 0.0)
+
+        denom = np.sqrt(sq_norms) * float(np.linalg.norm(query))
+        return 1.0 - dots / np.maximum(denom, 1e-12)
+
+    def _candidate_rows(self, where: Optional[dict]) -> Optional[np.ndarray]:
+        """Live rows matching `where` (None means all live rows)."""
+        if not where:
+            return None
+        return np.array(
+            sorted(
+                row
+                for row, _, meta in self._records.values()
+                if match_where(meta, where)
+            ),
+            dtype=np.int64,
+        )
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        k: int = 5,
+        include_text: bool = True,
+        where: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        k-nearest-neighbour search (exact unless the collection has an IVF
+        index).
+
+        Args:
+            query_vector: Vector to search for
+            k: Number of results to return
+            include_text: Whether to include the text content in results
+            where: Optional Chroma-style metadata filter
+            nprobe: IVF lists to scan for this query (higher: better
+                recall, slower)
+        """
+        query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+
+        with self._lock:
+            if not self._records or k <= 0:
+                return []
+            rows = self._candidate_rows(where)
+
+            if self._index is not None:
+                probed = self._index.candidates(query, nprobe)
+                if probed is not None:
+                    probed = probed[self._alive[probed]]
+                    rows = (
+                        probed
+                        if rows is None
+                        else np.intersect1d(probed, rows, assume_unique=True)
+                    )
+
+            if rows is not None and len(rows) == 0:
+                return []
+
+            if self._quantizer is not None and self._quantizer.trained:
+                rows, distances = self._quantized_distances(query, rows, k)
+            else:
+                distances = self._distances(query, rows)
+                if rows is None:
+                    rows = np.arange(len(distances))
+                    distances = np.where(self._alive, distances, np.inf)
+
+            k = min(k, int(np.isfinite(distances).sum()))
+            if k == 0:
+                return []
+            top = np.argpartition(distances, k - 1)[:k]
+            top = top[np.argsort(distances[top], kind="stable")]
+
+            return [
+                self._result(
+                    int(rows[i]), float(distances[i]), include_text=include_text
+                )
+                for i in top
+            ]
+
+    def _quantized_distances(
+        self, query: np.ndarray, rows: Optional[np.ndarray], k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate distances from the codes, with the best `rerank`
+        candidates re-scored against the full-precision vectors.
+        """
+        distances = self._quantizer.distances(query, rows)
+        if rows is None:
+            rows = np.arange(len(distances))
+            distances = np.where(self._alive, distances, np.inf)
+
+        rerank = self._quantizer.rerank
+        if rerank:
+            n = min(max(k, rerank), int(np.isfinite(distances).sum()))
+            if n == 0:
+                return rows[:0], distances[:0]
+            top = np.argpartition(distances, n - 1)[:n]
+            rows = np.sort(rows[top])
+            distances = self._distances(query, rows)
+        return rows, distances
+
+    def quantization_report(
+        self, queries: Optional[np.ndarray] = None, k: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Size of the searched codes and recall@k of `search` against exact
+        search.
+
+        `bytes_per_vector` and `compression_ratio` describe the codes that
+        searches scan and keep resident, not the storage footprint: the
+        full-precision `vectors.bin` is kept next to the codes (for
+        training, compaction and re-ranking), so on disk a vector costs
+        `disk_bytes_per_vector`, more than without quantization.
+
+        Args:
+            queries: Query vectors (defaults to up to 100 stored vectors).
+            k: Number of neighbours compared per query.
+        """
+        with self._lock:
+            quantizer = self._quantizer
+            full_bytes = (self._dimension or 0) * self._dtype.itemsize
+            trained = bool(quantizer and quantizer.trained)
+            report: Dict[str, Any] = {
+                "quantization": self._quantization,
+                "trained": trained,
+                "bytes_per_vector": (
+                    quantizer.code_size if trained else full_bytes
+                ),
+                "disk_bytes_per_vector": full_bytes
+                + (quantizer.code_size if trained else 0),
+            }
+            report["compression_ratio"] = (
+                quantizer.compression_ratio(
+                    self._dimension, self._dtype.itemsize
+                )
+                if report["trained"]
+                else 1.0
+            )
+            if not self._records:
+                report["recall"] = None
+                return report
+
+            if queries is None:
+                live = np.flatnonzero(self._alive)
+                rng = np.random.default_rng(0)
+                sample = np.sort(
+                    rng.choice(live, size=min(100, len(live)), replace=False)
+                )
+                queries = np.asarray(self._get_matrix()[sample], np.float32)
+            queries = np.asarray(queries, dtype=np.float32).reshape(
+                -1, self._dimension
+            )
+
+            recalls = []
+            for query in queries:
+                exact = np.where(self._alive, self._distances(query), np.inf)
+                n = min(k, len(self._records))
+                expected = np.argpartition(exact, n - 1)[:n]
+                found = {h["id"] for h in self.search(query, k=n)}
+                recalls.append(
+                    len(found & {self._ids[row] for row in expected}) / n
+                )
+            report["recall"] = float(np.mean(recalls))
+            return report
+
+    def _result(
+        self, row: int, distance: float, include_text: bool = True
+    ) -> Dict[str, Any]:
+        id = self._ids[row]
+        _, text, meta = self._records[id]
+        return {
+            "id": id,
+            "metadata": meta,
+            "distance": distance,
+            "text": text if include_text else None,
+        }
+
+    def get_vector(self, id: str, include_text: bool = True) -> Dict[str, Any]:
+        """
+        Get a vector by ID.
+
+        Args:
+            id: Vector ID
+            include_text: Whether to include the text content
+        """
+        with self._lock:
+            if id not in self._records:
+                raise KeyError(f"Vector with id {id} not found")
+            row, text, meta = self._records[id]
+            response = {
+                "id": id,
+                "vector": np.asarray(self._get_matrix()[row], dtype=np.float32),
+                "metadata": meta,
+            }
+            if include_text:
+                response["text"] = text
+            return response
+
+    def add_texts(
+        self, texts: List[str], metadata: Optional[List[Dict[str, Any]]] = None
+    ) -> List[str]:
+        """
+        Helper method to embed texts and add them to the collection. Texts
+        that are already stored are neither embedded nor written again.
+
+        Args:
+            texts: List of texts to embed and store
+            metadata: Optional metadata for each text
+        """
+        if not self._embedding_function:
+            raise ValueError(
+                "No embedding function set at the collection level."
+            )
+        ids = self.content_ids(texts=texts, metadata=metadata)
+
+        # Only embed and write what is not stored yet
+        stored = self.existing_ids(ids)
+        new = [
+            row
+            for id, row in {id: row for row, id in enumerate(ids)}.items()
+            if id not in stored
+        ]
+        if new:
+            new_texts = [texts[row] for row in new]
+            vectors = np.asarray(
+                self._embedding_function(new_texts), np.float32
+            )
+            self.add_vectors(
+                vectors,
+                texts=new_texts,
+                metadata=(
+                    [metadata[row] for row in new]
+                    if metadata is not None
+                    else None
+                ),
+                ids=[ids[row] for row in new],
+            )
+        return ids
+
+    def search_by_text(
+        self,
+        text: str,
+        k: int = 5,
+        include_text: bool = True,
+        where: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search by text query.
+
+        Args:
+            text: Text to search for
+            k: Number of results to return
+            include_text: Whether to include the text content in results
+            where: Optional Chroma-style metadata filter
+            nprobe: IVF lists to scan for this query
+        """
+        if not self._embedding_function:
+            raise ValueError(
+                "No embedding function set at the collection level."
+            )
+        query_vector = self._embedding_function([text])[0]
+        return self.search(
+            query_vector,
+            k,
+            include_text=include_text,
+            where=where,
+            nprobe=nprobe,
+        )
+
+    def existing_ids(self, ids: List[str]) -> set:
+        """The subset of `ids` already stored in the collection."""
+        with self._lock:
+            return {id for id in ids if id in self._records}
+
+    def delete_vectors(self, ids: List[str]) -> bool:
+        """Tombstone `ids`; compacts once enough rows are dead."""
+        with self._lock:
+            # In order and without repeats: each id is tombstoned once
+            deleted = list(dict.fromkeys(i for i in ids if i in self._records))
+            if not deleted:
+                return False
+            self._tombstone(deleted)
+
+            dead = len(self._ids) - len(self._records)
+            if (
+                self.auto_compact is not None
+                and dead / len(self._ids) >= self.auto_compact
+            ):
+                self.compact()
+            return True
+
+    def _tombstone(self, ids: List[str]) -> None:
+        if not ids:
+            return
+        self._append_records([{"op": "delete", "id": i} for i in ids])
+        for i in ids:
+            row, _, _ = self._records.pop(i)
+            self._alive[row] = False
+
+    def compact(self) -> None:
+        """
+        Rewrite the files without deleted rows. Both files are staged next
+        to the live ones and a marker file commits the swap, so a crash at
+        any point leaves either the old or the new pair once reloaded.
+        """
+        with self._lock:
+            live = np.flatnonzero(self._alive)
+            matrix = self._get_matrix()
+
+            (staged_vectors, _), (staged_records, _) = self._staged_files()
+            with open(staged_vectors, "wb") as f:
+                for start in range(0, len(live), SCORE_BLOCK_ROWS):
+                    f.write(
+                        np.ascontiguousarray(
+                            matrix[live[start : start + SCORE_BLOCK_ROWS]]
+                        ).tobytes()
+                    )
+                f.flush()
+                os.fsync(f.fileno())
+            with open(staged_records, "w", encoding="utf-8") as f:
+                for new_row, old_row in enumerate(live):
+                    id = self._ids[old_row]
+                    _, text, meta = self._records[id]
+                    entry = {
+                        "op": "add",
+                        "id": id,
+                        "row": new_row,
+                        "text": text,
+                        "metadata": meta,
+                    }
+                    f.write(
+                        json.dumps(entry, ensure_ascii=False, default=str)
+                        + "\n"
+                    )
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self._compact_marker_path, "w") as f:
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Release the map before replacing the file underneath it
+            self._matrix = None
+            matrix = None
+            self._install_staged()
+
+            self._ids = [self._ids[row] for row in live]
+            self._records = {
+                id: (new_row, *self._records[id][1:])
+                for new_row, id in enumerate(self._ids)
+            }
+            self._sq_norms = self._sq_norms[live]
+            self._alive = np.ones(len(live), dtype=bool)
+            for index in (self._index, self._quantizer):
+                if index is not None:
+                    index.remap(live)
+            os.remove(self._compact_marker_path)
+
+    def clear(self) -> bool:
+        with self._lock:
+            self._matrix = None
+            for path in (self._vectors_path, self._records_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._ids = []
+            self._records = {}
+            self._alive = np.zeros(0, dtype=bool)
+            self._sq_norms = np.zeros(0, dtype=np.float32)
+            for index in (self._index, self._quantizer):
+                if index is not None:
+                    index.reset()
+            shutil.rmtree(self.sidecar_directory, ignore_errors=True)
+            return True
+
+    @property
+    def dimension(self) -> int:
+        if self._dimension is None:
+            raise ValueError("No vectors have been added yet")
+        return self._dimension
+
+    @property
+    def size(self) -> int:
+        return len(self._records)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(os.path.normpath(self.path))
+
+    @property
+    def sidecar_directory(self) -> str:
+        return os.path.join(self.path, "sidecars")
+
+    @property
+    def embedding_function(self) -> Optional[Any]:
+        return self._embedding_function
@@ -0,0 +1,400 @@
+import os
+from typing import Optional
+
+import numpy as np
+
+from swiftagent.prebuilt.storage.ivf import BLOCK_ROWS, _prepare, kmeans
+
+QUANTIZATIONS = ("sq8", "pq")
+
+
+class Quantizer:
+    """
+    Compressed copy of a collection's vectors, scored with asymmetric
+    distance computation (ADC): the query stays in float32 and only the
+    stored vectors are approximated.
+
+    Like IVFIndex, a quantizer trains itself once `min_train_rows` vectors
+    exist, then encodes later inserts incrementally. Its parameters are saved
+    to `quantizer.npz` and the codes are appended to `codes.bin`, in the
+    collection directory. The full-precision vectors stay on disk for
+    training, compaction and re-ranking; searches only touch the codes. The
+    compression is thus of the memory scanned per search: on disk the
+    codes come on top of the full vectors.
+    """
+
+    kind = ""
+    # Codes scored per block in `distances`
+    scan_block_rows = BLOCK_ROWS
+
+    def __init__(
+        self,
+        path: str,
+        metric: str = "cosine",
+        min_train_rows: int = 4096,
+        max_train_rows: int = 50_000,
+        rerank: int = 0,
+    ):
+        """
+        Args:
+            path: Collection directory holding the quantizer files.
+            metric: Distance of the collection ("cosine", "l2" or "ip").
+            min_train_rows: Rows needed before the quantizer is trained.
+            max_train_rows: Sample size used for training.
+            rerank: Re-score this many of the best approximate candidates
+                with the full-precision vectors (0 disables re-ranking).
+        """
+        self.path = path
+        self.metric = metric
+        self.min_train_rows = min_train_rows
+        self.max_train_rows = max_train_rows
+        self.rerank = rerank
+
+        self.trained = False
+        self.codes: Optional[np.ndarray] = None
+        # Squared norms of the reconstructed vectors (l2 only)
+        self._sq_norms = np.zeros(0, dtype=np.float32)
+
+    @property
+    def _params_path(self) -> str:
+        return os.path.join(self.path, "quantizer.npz")
+
+    @property
+    def _codes_path(self) -> str:
+        return os.path.join(self.path, "codes.bin")
+
+    @property
+    def config(self) -> dict:
+        return {
+            "min_train_rows": self.min_train_rows,
+            "max_train_rows": self.max_train_rows,
+            "rerank": self.rerank,
+        }
+
+    @property
+    def code_size(self) -> int:
+        """Bytes per encoded vector."""
+        raise NotImplementedError
+
+    def compression_ratio(self, dimension: int, itemsize: int = 4) -> float:
+        """Size of a full vector over that of its code (not disk savings)."""
+        return dimension * itemsize / self.code_size
+
+    ##############################
+    # Implemented by subclasses
+    ##############################
+
+    def _fit(self, sample: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _decode(self, codes: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _dots(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Inner products of `query` with the reconstructed `codes`."""
+        raise NotImplementedError
+
+    def _params(self) -> dict:
+        raise NotImplementedError
+
+    def _set_params(self, params: dict) -> None:
+        raise NotImplementedError
+
+    ##############################
+    # Lifecycle
+    ##############################
+
+    def load(self, rows: int, matrix: Optional[np.ndarray]) -> None:
+        """
+        Restore the quantizer for a collection of `rows` rows, encoding any
+        rows missing from the codes file (e.g. after a crash).
+        """
+        if not os.path.exists(self._params_path):
+            self._maybe_train(rows, matrix)
+            return
+
+        with np.load(self._params_path) as params:
+            self._set_params(dict(params))
+        self.trained = True
+
+        codes = (
+            np.fromfile(self._codes_path, dtype=np.uint8)
+            if os.path.exists(self._codes_path)
+            else np.zeros(0, dtype=np.uint8)
+        )
+        stored = min(len(codes) // self.code_size, rows)
+        if len(codes) > stored * self.code_size:
+            os.truncate(self._codes_path, stored * self.code_size)
+        self._set_codes(
+            codes[: stored * self.code_size].reshape(stored, self.code_size)
+        )
+
+        if stored < rows:
+            self.add(matrix[stored:rows])
+
+    def _set_codes(self, codes: np.ndarray) -> None:
+        self.codes = codes
+        self._sq_norms = np.zeros(0, dtype=np.float32)
+        if self.metric == "l2":
+            self._sq_norms = np.concatenate(
+                [
+                    self._reconstructed_sq_norms(
+                        codes[start : start + BLOCK_ROWS]
+                    )
+                    for start in range(0, len(codes), BLOCK_ROWS)
+                ]
+                or [self._sq_norms]
+            )
+
+    def _reconstructed_sq_norms(self, codes: np.ndarray) -> np.ndarray:
+        decoded = self._decode(codes)
+        return np.einsum("ij,ij->i", decoded, decoded)
+
+    def _maybe_train(self, rows: int, matrix: Optional[np.ndarray]) -> None:
+        if self.trained or rows < self.min_train_rows or matrix is None:
+            return
+
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(
+            rng.choice(rows, size=min(rows, self.max_train_rows), replace=False)
+        )
+        self._fit(_prepare(matrix[sample_rows], self.metric))
+        np.savez(self._params_path, **self._params())
+        self.trained = True
+
+        if os.path.exists(self._codes_path):
+            os.remove(self._codes_path)
+        self._set_codes(np.zeros((0, self.code_size), dtype=np.uint8))
+        self.add(matrix[:rows])
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Encode rows appended to the collection."""
+        if not self.trained:
+            return
+        blocks = [
+            self._encode(
+                _prepare(vectors[start : start + BLOCK_ROWS], self.metric)
+            )
+            for start in range(0, len(vectors), BLOCK_ROWS)
+        ]
+        if not blocks:
+            return
+        codes = np.concatenate(blocks)
+        with open(self._codes_path, "ab") as f:
+            f.write(codes.tobytes())
+        self.codes = np.concatenate([self.codes, codes])
+        if self.metric == "l2":
+            self._sq_norms = np.concatenate(
+                [self._sq_norms, self._reconstructed_sq_norms(codes)]
+            )
+
+    def on_rows_added(self, rows: int, matrix: np.ndarray, first_row: int):
+        """Hook for the collection after an append of rows `first_row ...`."""
+        if self.trained:
+            self.add(matrix[first_row:rows])
+        else:
+            self._maybe_train(rows, matrix)
+
+    def remap(self, live: np.ndarray) -> None:
+        """Keep only the codes of rows `live` after compaction."""
+        if not self.trained:
+            return
+        codes = np.ascontiguousarray(self.codes[live])
+        tmp_path = self._codes_path + ".tmp"
+        codes.tofile(tmp_path)
+        os.replace(tmp_path, self._codes_path)
+        self.codes = codes
+        if self.metric == "l2":
+            self._sq_norms = self._sq_norms[live]
+
+    def drop_row_file(self) -> None:
+        """Delete the per-row codes; `load` recomputes them from the vectors."""
+        if os.path.exists(self._codes_path):
+            os.remove(self._codes_path)
+
+    def reset(self) -> None:
+        """Forget the parameters; the quantizer retrains with enough rows."""
+        for path in (self._params_path, self._codes_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.trained = False
+        self.codes = None
+        self._sq_norms = np.zeros(0, dtype=np.float32)
+
+    ##############################
+    # Search
+    ##############################
+
+    def distances(
+        self, query: np.ndarray, rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Approximate distances from `query` to `rows` (all if None)."""
+        q = _prepare(query.reshape(1, -1), self.metric)[0]
+        codes = self.codes if rows is None else self.codes[rows]
+
+        dots = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), self.scan_block_rows):
+            block = codes[start : start + self.scan_block_rows]
+            dots[start : start + len(block)] = self._dots(q, block)
+
+        if self.metric == "ip":
+            return -dots
+        if self.metric == "l2":
+            sq_norms = self._sq_norms if rows is None else self._sq_norms[rows]
+            return np.maximum(sq_norms - 2 * dots + float(q @ q), 0.0)
+        # Cosine: the stored vectors were normalized before encoding
+        return 1.0 - dots
+
+
+class ScalarQuantizer(Quantizer):
+    """
+    8-bit scalar quantization (SQ8): every dimension is mapped linearly from
+    its trained [min, max] range onto 0..255. 4x smaller than float32 with
+    little loss of recall.
+    """
+
+    kind = "sq8"
+    # Small blocks keep the float32 copy of each block in cache
+    scan_block_rows = 1024
+
+    def __init__(self, path: str, metric: str = "cosine", **options):
+        super().__init__(path, metric=metric, **options)
+        self._low: Optional[np.ndarray] = None
+        self._scale: Optional[np.ndarray] = None
+
+    @property
+    def code_size(self) -> int:
+        return len(self._low)
+
+    def _fit(self, sample: np.ndarray) -> None:
+        self._low = sample.min(axis=0)
+        self._scale = np.maximum(sample.max(axis=0) - self._low, 1e-12) / 255
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        scaled = np.rint((vectors - self._low) / self._scale)
+        return np.clip(scaled, 0, 255).astype(np.uint8)
+
+    def _decode(self, codes: np.ndarray) -> np.ndarray:
+        return codes.astype(np.float32) * self._scale + self._low
+
+    def _dots(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        # q . (c * scale + low) = c . (q * scale) + q . low
+        # Cast the block so the product runs in float32 BLAS
+        return codes.astype(np.float32) @ (query * self._scale) + float(
+            query @ self._low
+        )
+
+    def _params(self) -> dict:
+        return {"low": self._low, "scale": self._scale}
+
+    def _set_params(self, params: dict) -> None:
+        self._low = params["low"]
+        self._scale = params["scale"]
+
+
+class ProductQuantizer(Quantizer):
+    """
+    Product quantization (PQ): vectors are split into `m` sub-vectors and
+    each is replaced by the id of its nearest of 256 trained sub-centroids,
+    so a vector costs `m` bytes. A query is scored by summing entries of an
+    `m x 256` lookup table built once per query.
+    """
+
+    kind = "pq"
+
+    def __init__(
+        self,
+        path: str,
+        metric: str = "cosine",
+        m: Optional[int] = None,
+        max_train_rows: int = 10_000,
+        **options,
+    ):
+        """
+        Args:
+            m: Number of sub-vectors; must divide the dimension. Defaults to
+                dimension / 4 (16x smaller than float32).
+            max_train_rows: Sample size used for training (~40 rows per
+                sub-centroid is enough; k-means runs once per sub-vector).
+        """
+        super().__init__(
+            path, metric=metric, max_train_rows=max_train_rows, **options
+        )
+        self.m = m
+        self._codebooks: Optional[np.ndarray] = None  # (m, 256, dsub)
+
+    @property
+    def config(self) -> dict:
+        return {**super().config, "m": self.m}
+
+    @property
+    def code_size(self) -> int:
+        return self.m
+
+    def _fit(self, sample: np.ndarray) -> None:
+        dimension = sample.shape[1]
+        if self.m is None:
+            self.m = max(1, dimension // 4)
+        if dimension % self.m:
+            raise ValueError(
+                f"PQ m={self.m} does not divide the dimension {dimension}"
+            )
+        dsub = dimension // self.m
+        ksub = min(256, len(sample))
+
+        sub_vectors = sample.reshape(len(sample), self.m, dsub)
+        self._codebooks = np.stack(
+            [
+                kmeans(
+                    np.ascontiguousarray(sub_vectors[:, j]),
+                    ksub,
+                    iterations=10,
+                    seed=j,
+                )
+                for j in range(self.m)
+            ]
+        )
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        sub_vectors = vectors.reshape(len(vectors), self.m, -1)
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for j, codebook in enumerate(self._codebooks):
+            half_sq = 0.5 * np.einsum("ij,ij->i", codebook, codebook)
+            codes[:, j] = np.argmax(sub_vectors[:, j] @ codebook.T - half_sq, 1)
+        return codes
+
+    def _decode(self, codes: np.ndarray) -> np.ndarray:
+        decoded = self._codebooks[np.arange(self.m), codes]  # (n, m, dsub)
+        return decoded.reshape(len(codes), -1)
+
+    def _dots(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        table = np.einsum(
+            "jkd,jd->jk", self._codebooks, query.reshape(self.m, -1)
+        )
+        # One contiguous gather per sub-vector is much faster than a 2-D
+        # fancy index over (rows, m)
+        columns = np.ascontiguousarray(codes.T)
+        dots = np.zeros(len(codes), dtype=np.float32)
+        for j in range(self.m):
+            dots += np.take(table[j], columns[j])
+        return dots
+
+    def _params(self) -> dict:
+        return {"codebooks": self._codebooks}
+
+    def _set_params(self, params: dict) -> None:
+        self._codebooks = params["codebooks"]
+        self.m = len(self._codebooks)
+
+
+def make_quantizer(
+    kind: str, path: str, metric: str = "cosine", **options
+) -> Quantizer:
+    if kind == "sq8":
+        return ScalarQuantizer(path, metric=metric, **options)
+    if kind == "pq":
+        return ProductQuantizer(path, metric=metric, **options)
+    raise ValueError(f"Unknown quantization '{kind}', expected {QUANTIZATIONS}")
@@ -1,3 +1,6 @@
 from .base import (
     BaseReasoning,
 )
+from .context import (
+    ContextManager,
+)
@@ -3,8 +3,23 @@ from swiftagent.llm import LLM
 from swiftagent.actions import (
     Action,
 )
+from swiftagent.actions.execution import (
+    ActionExecutor,
+    default_action_executor,
+)
 
 from swiftagent.actions.formatter import ActionFormatter
+from swiftagent.actions.retrieval import ActionRetriever
+
+from swiftagent.memory.recall import RecallCoordinator, RecallResult
+from swiftagent.reasoning.context import ContextManager
+from swiftagent.reasoning.streaming import JSONFieldStreamer
+
+from litellm import stream_chunk_builder
+
+from typing import AsyncIterator, Optional
+
+import asyncio
 
 import json
 
@@ -14,7 +29,16 @@ from pprint import pprint
 
 
 class BaseReasoning:
-    def __init__(self, name: str, instructions: str):
+    def __init__(
+        self,
+        name: str,
+        instructions: str,
+        max_parallel_actions: Optional[int] = None,
+        action_executor: Optional[ActionExecutor] = None,
+        context: Optional[ContextManager] = None,
+        action_retriever: Optional[ActionRetriever] = None,
+        recall_coordinator: Optional[RecallCoordinator] = None,
+    ):
         self.actions: dict[
             str,
             Action,
@@ -28,14 +52,75 @@ class BaseReasoning:
 
         self.instructions = instructions
 
+        # Upper bound on tool calls executed concurrently within one turn
+        # (None means no limit)
+        self.max_parallel_actions = max_parallel_actions
+
+        # Pools that synchronous actions are dispatched to
+        self.action_executor = action_executor or default_action_executor()
+
+        # Keeps the conversation within the model's context budget
+        self.context = context
+
+        # Optional top-k pre-selection of the actions offered to the model
+        self.action_retriever = action_retriever
+
+        # Embeds each query once for all memory recalls of a flow
+        self.recall_coordinator = recall_coordinator or RecallCoordinator()
+        self.last_recall: Optional[RecallResult] = None
+
     def set_action(
         self,
         action: Action,
     ):
         self.actions[action.name] = action
 
+        if self.action_retriever is not None:
+            self.action_retriever.add(action)
+
+        return self
+
+    def set_actions(self, actions: list[Action]):
+        """Register `actions`, embedding them for the retriever at once."""
+        for action in actions:
+            self.actions[action.name] = action
+
+        if self.action_retriever is not None:
+            self.action_retriever.add_many(actions)
+
         return self
 
+    async def _recall(
+        self, task: str, sources: tuple[tuple[str, object, int], ...] = ()
+    ) -> dict[str, list[dict]]:
+        """
+        Recall `task` from `sources` plus every semantic memory section
+        (2 results each) with one query embedding. Returns the hits per
+        source name; timings are kept in `last_recall`.
+        """
+        sources = list(sources)
+        names = {name for name, _, _ in sources}
+        for i, memory in enumerate(self.semantic_memories):
+            name = getattr(memory, "name", f"semantic_memory_{i}")
+            if name in names:
+                name = f"{name}_{i}"
+            names.add(name)
+            sources.append((name, memory, 2))
+
+        self.last_recall = await self.recall_coordinator.recall(task, sources)
+        return self.last_recall.items
+
+    async def _select_actions(self, task: str) -> list[Action]:
+        """Actions offered to the model for `task` (all, without retriever)."""
+        actions = list(self.actions.values())
+        if self.action_retriever is None:
+            return actions
+
+        # Embedding is blocking work; keep it off the event loop
+        return await asyncio.to_thread(
+            self.action_retriever.select, task, actions
+        )
+
     def set_resources(
         self,
         resources,
@@ -53,16 +138,255 @@ class BaseReasoning:
 
         return self
 
+    async def _complete(
+        self,
+        llm: LLM,
+        messages: list,
+        passable_actions: list,
+        events: Optional[asyncio.Queue] = None,
+    ):
+        """
+        Run one LLM turn. With an `events` queue the completion is streamed:
+        the decoded `response` text is pushed as "delta" events while the
+        tokens arrive, and the chunks are reassembled into a regular
+        completion (tool calls included) for the rest of the loop.
+        """
+        request = {
+            "messages": messages,
+            "response_format": {"type": "json_object"},
+        }
+        if passable_actions:
+            request["tools"] = passable_actions
+            request["tool_choice"] = "auto"
+
+        if events is None:
+            return await llm.inference(**request)
+
+        chunks = []
+        streamer = JSONFieldStreamer("response")
+
+        async for chunk in llm.stream(**request):
+            chunks.append(chunk)
+            if not chunk.choices:
+                continue
+            text = streamer.feed(chunk.choices[0].delta.content or "")
+            if text:
+                self._emit(events, {"type": "delta", "content": text})
+
+        return stream_chunk_builder(chunks)
+
+    async def _execute_action(
+        self,
+        action_name: str,
+        action_args: dict,
+        deadline: Optional[float] = None,
+    ):
+        action_to_call = self.actions.get(action_name)
+        if action_to_call is None:
+            return f"Error: No tool '{action_name}' found"
+
+        # Coroutines run on the loop, sync functions per their policy
+        return await self.action_executor.run(
+            action_to_call, action_args, timeout=self._remaining(deadline)
+        )
+
+    async def _execute_action_calls(
+        self,
+        action_calls: list,
+        events: Optional[asyncio.Queue] = None,
+        deadline: Optional[float] = None,
+    ) -> list[tuple[str, dict, dict]]:
+        """
+        Execute every tool call of one assistant turn concurrently (bounded
+        by `max_parallel_actions`).
+
+        Failures never abort the flow: bad arguments, an exception raised
+        by the action, or a call that outlives its timeout (or the query
+        `deadline`) become an error string in that call's tool message.
+
+        Returns:
+            (action_name, action_args, tool_message) per call, in the
+            original tool_call_id order.
+        """
+        semaphore = (
+            asyncio.Semaphore(self.max_parallel_actions)
+            if self.max_parallel_actions
+            else None
+        )
+
+        async def run(action_call) -> tuple[str, dict, dict]:
+            action_name = getattr(action_call.function, "name", None)
+            action_name = action_name or "UNKNOWN"
+            action_args: dict = {}
+
+            try:
+                action_args = json.loads(action_call.function.arguments or "{}")
+            except (TypeError, ValueError) as e:
+                content = (
+                    f"Error: could not parse arguments for '{action_name}': {e}"
+                )
+            else:
+                self._emit(
+                    events,
+                    {
+                        "type": "tool_call",
+                        "id": action_call.id,
+                        "name": action_name,
+                        "arguments": action_args,
+                    },
+                )
+                try:
+                    if semaphore is None:
+                        result = await self._execute_action(
+                            action_name, action_args, deadline
+                        )
+                    else:
+                        async with semaphore:
+                            result = await self._execute_action(
+                                action_name, action_args, deadline
+                            )
+                    content = str(result)
+                except asyncio.TimeoutError:
+                    content = f"Error: '{action_name}' timed out before returning a result"
+                except Exception as e:
+                    content = f"Error: '{action_name}' failed with {type(e).__name__}: {e}"
+
+            self._emit(
+                events,
+                {
+                    "type": "tool_result",
+                    "id": action_call.id,
+                    "name": action_name,
+                    "content": content,
+                },
+            )
+
+            return (
+                action_name,
+                action_args,
+                {
+                    "tool_call_id": action_call.id,
+                    "role": "tool",
+                    "name": action_name,
+                    "content": content,
+                },
+            )
+
+        return list(await asyncio.gather(*(run(c) for c in action_calls)))
+
+    @staticmethod
+    def _emit(events: Optional[asyncio.Queue], event: dict):
+        if events is not None:
+            events.put_nowait(event)
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        """Seconds left until `deadline` (a loop.time() value), if any."""
+        if deadline is None:
+            return None
+        return max(0.0, deadline - asyncio.get_running_loop().time())
+
+    async def _next_completion(
+        self,
+        llm: LLM,
+        messages: list,
+        passable_actions: list,
+        events: Optional[asyncio.Queue] = None,
+        turn: int = 0,
+        max_turns: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ):
+        """
+        `_complete` bounded by the query budget. When the turn limit is
+        reached or the deadline passes, a closing assistant message is
+        appended to `messages` and None is returned.
+
+        With a `context` manager, `messages` is compacted to its token
+        budget before the call.
+        """
+
+        async def complete():
+            if self.context is not None:
+                await self.context.compact(messages, llm)
+            return await self._complete(llm, messages, passable_actions, events)
+
+        stop_reason = None
+        if max_turns is not None and turn >= max_turns:
+            stop_reason = f"the limit of {max_turns} reasoning turns"
+        elif deadline is not None and self._remaining(deadline) <= 0:
+            stop_reason = "the query deadline"
+        else:
+            try:
+                return await asyncio.wait_for(
+                    complete(), self._remaining(deadline)
+                )
+            except asyncio.TimeoutError:
+                stop_reason = "the query deadline"
+
+        messages.append(
+            {
+                "role": "assistant",
+                "content": f"I had to stop before finishing: {stop_reason} was reached.",
+            }
+        )
+        return None
+
+    async def flow_stream(
+        self,
+        task: str = "",
+        llm: LLM = None,
+        **kwargs,
+    ) -> AsyncIterator[dict]:
+        """
+        Async-generator variant of `flow`. Yields events as they happen:
+
+            {"type": "delta", "content": str}
+            {"type": "tool_call", "id": str, "name": str, "arguments": dict}
+            {"type": "tool_result", "id": str, "name": str, "content": str}
+            {"type": "final", "content": str}
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        runner = asyncio.create_task(
+            self.flow(task=task, llm=llm, events=events, **kwargs)
+        )
+        runner.add_done_callback(lambda _: events.put_nowait(None))
+
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            messages = await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+
+        yield {"type": "final", "content": messages[-1]["content"]}
+
     async def flow(
         self,
         memory: None = None,
         task: str = "",
         llm: LLM = None,
+        events: Optional[asyncio.Queue] = None,
+        timeout: Optional[float] = None,
+        max_turns: Optional[int] = None,
     ):
+        """
+        Args:
+            timeout: Wall-clock budget (seconds) for the whole query.
+            max_turns: Maximum number of LLM turns.
+        """
+        deadline = (
+            asyncio.get_running_loop().time() + timeout
+            if timeout is not None
+            else None
+        )
+
+        selected_actions = await self._select_actions(task)
+
         system_message = (
             f"You are an AI agent{'.' if self.instructions is None else ', with instructions '+self.instructions} "
             + "You have  access to the following tools"
-            + self.formatter.format_actions(list(self.actions.values()))
+            + self.formatter.format_actions(selected_actions)
             + "\n"
             + """
         Solve the goal the user has, taking as many steps as needed. \
@@ -78,15 +402,11 @@ class BaseReasoning:
         """
         )
 
+        recalled = await self._recall(task)
         recall_semantic_information = "\n".join(
             [
-                "\n".join(
-                    [
-                        memory.get("text")
-                        for memory in memory_container.recall(task, 2)
-                    ]
-                )
-                for memory_container in self.semantic_memories
+                "\n".join([memory.get("text") for memory in hits])
+                for hits in recalled.values()
             ]
         )
 
@@ -111,24 +431,23 @@ class BaseReasoning:
         done = False
 
         passable_actions = self.formatter.format_actions_for_llm_call(
-            list(self.actions.values())
+            selected_actions
         )
 
+        turn = 0
         while not done:
-            if len(self.actions) != 0:
-                completion = await llm.inference(
-                    model=llm,
-                    messages=messages,
-                    tools=passable_actions,
-                    tool_choice="auto",
-                    response_format={"type": "json_object"},
-                )
-            else:
-                completion = await llm.inference(
-                    model=llm,
-                    messages=messages,
-                    response_format={"type": "json_object"},
-                )
+            completion = await self._next_completion(
+                llm,
+                messages,
+                passable_actions,
+                events,
+                turn=turn,
+                max_turns=max_turns,
+                deadline=deadline,
+            )
+            if completion is None:
+                break
+            turn += 1
 
             (
                 response,
@@ -141,35 +460,10 @@ class BaseReasoning:
             if actions:
                 messages.append(completion.choices[0].message)
 
-                for action in actions:
-                    try:
-                        (
-                            action_name,
-                            action_args,
-                        ) = (
-                            action.function.name,
-                            json.loads(action.function.arguments),
-                        )
-                    except:
-                        print("failed here")
-                    action_to_call = self.actions.get(action_name)
-
-                    # Check if the function is async
-                    if inspect.iscoroutinefunction(action_to_call.func):
-                        action_response = await action_to_call.func(
-                            **action_args
-                        )
-                    else:
-                        action_response = action_to_call.func(**action_args)
-
-                    messages.append(
-                        {
-                            "tool_call_id": action.id,
-                            "role": "tool",
-                            "name": action_name,
-                            "content": str(action_response),
-                        }
-                    )
+                for _, _, tool_message in await self._execute_action_calls(
+                    actions, events, deadline
+                ):
+                    messages.append(tool_message)
 
             if response:
 
@@ -0,0 +1,210 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Optional
+
+from swiftagent.llm import LLM
+from swiftagent.llm.utils import (
+    _tokenizer,
+    count_tokens,
+    estimate_token_ends,
+    to_jsonable,
+)
+
+# Per-message framing overhead in the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def _truncate_text(text: str, max_tokens: int, model: str) -> str:
+    encoding = _tokenizer(model)
+    if encoding is None:
+        ends = estimate_token_ends(text)
+        kept = text[: ends[max_tokens - 1]] if len(ends) > max_tokens else text
+    else:
+        kept = encoding.decode(
+            encoding.encode(text, disallowed_special=())[:max_tokens]
+        )
+    dropped = count_tokens(text, model) - count_tokens(kept, model)
+    return f"{kept}\n... [truncated {dropped} tokens]"
+
+
+class ContextManager:
+    """
+    Keeps the `messages` list of a reasoning flow within a token budget.
+
+    `compact` is called before every LLM turn. When the conversation is over
+    `max_tokens`, it applies these strategies in order until it fits again:
+
+      1. truncate the output of older tool calls to `max_tool_output_tokens`
+      2. drop the oldest turns, replacing them with an LLM-written summary
+         when `summarize` is set (otherwise a short placeholder note)
+
+    Leading system messages, the first user message (the task) and the last
+    `keep_recent_turns` turns are never touched. A "turn" is an assistant
+    message with tool calls together with its tool results, so a tool result
+    is never separated from the call that produced it.
+
+    Compaction happens in place: dropped turns do not come back, and once
+    over budget it shrinks to `low_watermark * max_tokens` so that the
+    (summarizing) work is not repeated on every turn.
+
+    Example:
+
+        reasoning = BaseReasoning(
+            name="agent",
+            instructions="...",
+            context=ContextManager(max_tokens=16_000, summarize=True),
+        )
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        model: str = "gpt-4o",
+        max_tool_output_tokens: int = 512,
+        keep_recent_turns: int = 2,
+        summarize: bool = False,
+        low_watermark: float = 0.75,
+    ):
+        """
+        Args:
+            max_tokens: Budget for the messages (None disables compaction).
+                Leave room for the tool schemas and the completion.
+            model: Model whose tokenizer is used for counting.
+            max_tool_output_tokens: Length old tool results are cut to.
+            keep_recent_turns: Most recent turns that are kept verbatim.
+            summarize: Summarize dropped turns with the flow's LLM.
+            low_watermark: Fraction of `max_tokens` to shrink to once the
+                budget is exceeded.
+        """
+        self.max_tokens = max_tokens
+        self.model = model
+        self.max_tool_output_tokens = max_tool_output_tokens
+        self.keep_recent_turns = keep_recent_turns
+        self.summarize = summarize
+        self.low_watermark = low_watermark
+
+        self._summaries: OrderedDict[str, str] = OrderedDict()
+
+    def count(self, message: Any) -> int:
+        """Token count of one chat message (dict or litellm Message)."""
+        fields = to_jsonable(message)
+        text = fields.get("content") or ""
+        if not isinstance(text, str):
+            text = json.dumps(text, ensure_ascii=False)
+        if fields.get("tool_calls"):
+            text += json.dumps(fields["tool_calls"], ensure_ascii=False)
+        return MESSAGE_OVERHEAD_TOKENS + count_tokens(text, self.model)
+
+    def total(self, messages: list) -> int:
+        return sum(self.count(m) for m in messages)
+
+    @staticmethod
+    def _role(message: Any) -> Optional[str]:
+        if isinstance(message, dict):
+            return message.get("role")
+        return getattr(message, "role", None)
+
+    def _turns(self, messages: list) -> tuple[int, list[list[int]]]:
+        """
+        Split `messages` into the protected head (leading system messages
+        and the task) and a list of turns, each a list of indices.
+        """
+        head = 0
+        while head < len(messages) and self._role(messages[head]) == "system":
+            head += 1
+        if head < len(messages) and self._role(messages[head]) == "user":
+            head += 1
+
+        turns: list[list[int]] = []
+        for i in range(head, len(messages)):
+            if self._role(messages[i]) == "tool" and turns:
+                turns[-1].append(i)
+            else:
+                turns.append([i])
+        return head, turns
+
+    async def compact(self, messages: list, llm: Optional[LLM] = None) -> list:
+        """Shrink `messages` in place if it is over budget; returns it."""
+        if self.max_tokens is None or self.total(messages) <= self.max_tokens:
+            return messages
+
+        target = int(self.max_tokens * self.low_watermark)
+        head, turns = self._turns(messages)
+        old_turns = turns[: max(0, len(turns) - self.keep_recent_turns)]
+
+        # 1) Truncate tool outputs of older turns
+        for turn in old_turns:
+            for i in turn:
+                message = messages[i]
+                if (
+                    not isinstance(message, dict)
+                    or message.get("role") != "tool"
+                ):
+                    continue
+                content = str(message.get("content") or "")
+                if (
+                    count_tokens(content, self.model)
+                    > self.max_tool_output_tokens
+                ):
+                    messages[i] = {
+                        **message,
+                        "content": _truncate_text(
+                            content, self.max_tool_output_tokens, self.model
+                        ),
+                    }
+
+        total = self.total(messages)
+        if total <= target:
+            return messages
+
+        # 2) Drop the oldest turns until the rest fits
+        dropped: list[int] = []
+        for turn in old_turns:
+            if total <= target:
+                break
+            total -= sum(self.count(messages[i]) for i in turn)
+            dropped.extend(turn)
+
+        if not dropped:
+            return messages
+
+        note = await self._summary_note(
+            [messages[i] for i in dropped], llm if self.summarize else None
+        )
+        messages[dropped[0] : dropped[-1] + 1] = [note]
+        return messages
+
+    async def _summary_note(self, dropped: list, llm: Optional[LLM]) -> dict:
+        if llm is None:
+            return {
+                "role": "user",
+                "content": f"[{len(dropped)} earlier messages were removed to save context]",
+            }
+
+        transcript = "\n".join(
+            f"{self._role(m)}: {json.dumps(to_jsonable(m).get('content') or to_jsonable(m).get('tool_calls'), ensure_ascii=False)}"
+            for m in dropped
+        )
+        key = hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+
+        summary = self._summaries.get(key)
+        if summary is None:
+            completion = await llm.inference(
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "Summarize the following agent steps in a few sentences. Keep every fact, number and tool result needed to finish the task.",
+                    },
+                    {"role": "user", "content": transcript},
+                ]
+            )
+            summary = completion.choices[0].message.content or ""
+            self._summaries[key] = summary
+            while len(self._summaries) > 128:
+                self._summaries.popitem(last=False)
+
+        return {
+            "role": "user",
+            "content": f"Summary of earlier steps: {summary}",
+        }
@@ -1,14 +1,20 @@
 # swiftagent/reasoning/salient.py
 
 from typing import List, Optional
+import asyncio
 import json
 import inspect
 
 from swiftagent.reasoning.base import BaseReasoning
 from swiftagent.llm import LLM
 from swiftagent.actions.formatter import ActionFormatter
+from swiftagent.actions.execution import ActionExecutor
+from swiftagent.actions.retrieval import ActionRetriever
+from swiftagent.reasoning.context import ContextManager
+from swiftagent.memory.base import format_timestamp
 from swiftagent.memory.working import WorkingMemory
 from swiftagent.memory.long_term import LongTermMemory
+from swiftagent.memory.recall import RecallCoordinator
 
 
 class SalientMemoryReasoning(BaseReasoning):
@@ -26,14 +32,33 @@ class SalientMemoryReasoning(BaseReasoning):
         instructions: str,
         working_memory: Optional[WorkingMemory] = None,
         long_term_memory: Optional[LongTermMemory] = None,
+        max_parallel_actions: Optional[int] = None,
+        action_executor: Optional[ActionExecutor] = None,
+        context: Optional[ContextManager] = None,
+        action_retriever: Optional[ActionRetriever] = None,
+        recall_coordinator: Optional[RecallCoordinator] = None,
     ):
-        super().__init__(name=name, instructions=instructions)
+        super().__init__(
+            name=name,
+            instructions=instructions,
+            max_parallel_actions=max_parallel_actions,
+            action_executor=action_executor,
+            context=context,
+            action_retriever=action_retriever,
+            recall_coordinator=recall_coordinator,
+        )
         self.working_memory = working_memory
         self.long_term_memory = long_term_memory
         # self.formatter = ActionFormatter()  # For listing available actions
 
     async def flow(
-        self, task: str = "", llm: LLM = None, **kwargs
+        self,
+        task: str = "",
+        llm: LLM = None,
+        events: Optional[asyncio.Queue] = None,
+        timeout: Optional[float] = None,
+        max_turns: Optional[int] = None,
+        **kwargs,
     ) -> List[dict]:
         """
         This method:
@@ -42,8 +67,16 @@ class SalientMemoryReasoning(BaseReasoning):
           3) Iterates calls to LLM (tool usage enabled)
           4) ONLY stores user query, tool calls/results, and final answer.
 
+        `timeout` (seconds) bounds the whole query and every tool call in
+        it; `max_turns` bounds the number of LLM calls.
+
         Returns the list of all messages used or generated in final conversation.
         """
+        deadline = (
+            asyncio.get_running_loop().time() + timeout
+            if timeout is not None
+            else None
+        )
 
         st_items = []
         if self.working_memory:
@@ -54,30 +87,35 @@ class SalientMemoryReasoning(BaseReasoning):
         st_context_lines = []
         for it in st_items:
             # e.g. "[12:34:56 12/02/25] (TEXT) The user asked about Herndon weather"
-            stamp = it.timestamp or "???"
+            stamp = format_timestamp(it.timestamp)
             st_context_lines.append(
                 f"[{stamp}] ({it.item_type.value}) {it.content}"
             )
 
-        # 2) Gather relevant items from LTM
-        ltm_structs = []
+        # 2) Gather relevant items from LTM and the semantic memories,
+        # embedding the task once for all of them
+        ltm_sources = []
         if self.long_term_memory and task.strip():
-            ltm_structs = self.long_term_memory.recall(task, number=3)
-            # ltm_structs is a list of dict, e.g.
-            # [ {"text": "...", "type": "...", "timestamp": "..."}, ...]
+            ltm_sources.append(("long_term_memory", self.long_term_memory, 3))
+        recalled = await self._recall(task, ltm_sources)
+
+        ltm_structs = recalled.get("long_term_memory", [])
+        # ltm_structs is a list of dict, e.g.
+        # [ {"text": "...", "type": "...", "timestamp": "..."}, ...]
 
         # Convert them to lines
         ltm_context_lines = []
         for obj in ltm_structs:
-            ts = obj.get("timestamp", "???")
+            ts = format_timestamp(obj.get("timestamp"))
             typ = obj.get("type", "UNKNOWN")
             txt = obj.get("text", "")
             ltm_context_lines.append(f"[{ts}] ({typ}) {txt}")
 
         # Gather any attached semantic memories
         semantic_snippets = []
-        for sem_mem in self.semantic_memories:
-            results = sem_mem.recall(task, number=2)
+        for source, results in recalled.items():
+            if source == "long_term_memory":
+                continue
             snippet_texts = []
             for r in results:
                 t = r.get("text", "")
@@ -97,9 +135,8 @@ class SalientMemoryReasoning(BaseReasoning):
         )
 
         # Build system message: describe your instructions + available tools
-        available_tools_str = self.formatter.format_actions(
-            list(self.actions.values())
-        )
+        selected_actions = await self._select_actions(task)
+        available_tools_str = self.formatter.format_actions(selected_actions)
         system_message = f"""You are an AI agent.
 Your instructions: {self.instructions or '(no instructions)'}
 
@@ -133,26 +170,25 @@ If is_final=true, the conversation ends.
 
         # Turn actions into an LLM "tools" schema
         passable_actions = self.formatter.format_actions_for_llm_call(
-            list(self.actions.values())
+            selected_actions
         )
 
+        turn = 0
         while not done:
-            # Request LLM with optional tool usage
-            if self.actions:
-                completion = await llm.inference(
-                    model=llm,
-                    messages=messages,
-                    tools=passable_actions,
-                    tool_choice="auto",
-                    response_format={"type": "json_object"},
-                )
-            else:
-                # If no actions
-                completion = await llm.inference(
-                    model=llm,
-                    messages=messages,
-                    response_format={"type": "json_object"},
-                )
+            # Request LLM with optional tool usage (streamed if `events`)
+            completion = await self._next_completion(
+                llm,
+                messages,
+                passable_actions,
+                events,
+                turn=turn,
+                max_turns=max_turns,
+                deadline=deadline,
+            )
+            if completion is None:
+                # Out of turns or time; the closing message is in `messages`
+                break
+            turn += 1
 
             assistant_message = completion.choices[0].message
             response_json_str = assistant_message.content  # LLM's JSON string
@@ -162,51 +198,27 @@ If is_final=true, the conversation ends.
             if actions:
                 # Append the raw JSON from the LLM as an "assistant" message
                 messages.append(completion.choices[0].message)
-                # Then process each tool call
-                for action_call in actions:
-                    try:
-                        action_name = action_call.function.name
-                        action_args = json.loads(action_call.function.arguments)
-                    except:
-                        action_name = "UNKNOWN"
-                        action_args = {}
-                        print("Error parsing tool call arguments")
+                # Then run all tool calls of this turn concurrently
+                results = await self._execute_action_calls(
+                    actions, events, deadline
+                )
 
+                # Record them in the original tool_call order
+                for action_name, action_args, tool_message in results:
                     # [2] Store the tool call in short-term memory (without chain-of-thought)
                     if self.working_memory:
                         self.working_memory.add_action(
                             f"Action: {action_name} | Args: {action_args}"
                         )
 
-                    # Execute the tool
-                    action_obj = self.actions.get(action_name)
-
-                    if not action_obj:
-                        tool_result = f"Error: No tool '{action_name}' found"
-                    else:
-                        if inspect.iscoroutinefunction(action_obj.func):
-                            tool_result = await action_obj.func(**action_args)
-                        else:
-                            tool_result = action_obj.func(**action_args)
-
-                    # Convert to string
-                    tool_result_str = str(tool_result)
-
                     # [3] Store the tool result
                     if self.working_memory:
                         self.working_memory.add_text(
-                            f"ActionResult({action_name}): {tool_result_str}"
+                            f"ActionResult({action_name}): {tool_message['content']}"
                         )
 
                     # Insert a "tool" message with the result
-                    messages.append(
-                        {
-                            "tool_call_id": action_call.id,
-                            "role": "tool",
-                            "name": action_name,
-                            "content": tool_result_str,
-                        }
-                    )
+                    messages.append(tool_message)
             else:
                 # If no tool calls, just add the JSON response to the conversation
                 messages.append(
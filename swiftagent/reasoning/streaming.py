@@ -0,0 +1,78 @@
+import json
+import re
+from typing import Optional
+
+
+class JSONFieldStreamer:
+    """
+    Incrementally extracts the string value of one field from a JSON object
+    that is arriving in pieces.
+
+    The reasoning loop asks the model for `{"response": "...", "is_final": ...}`,
+    so streaming the raw deltas would show JSON syntax to the user. Feeding
+    the deltas through this class yields only the decoded text of the
+    `response` field, as soon as it is available.
+
+    Example:
+
+        streamer = JSONFieldStreamer("response")
+        streamer.feed('{"respo')          # -> ""
+        streamer.feed('nse": "Hel')       # -> "Hel"
+        streamer.feed('lo\\nworld", ')    # -> "lo\nworld"
+    """
+
+    _ESCAPE_LENGTHS = {"u": 6}
+
+    def __init__(self, field: str = "response"):
+        self._start = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self._buffer = ""
+        self._pos: Optional[int] = None  # index of next undecoded char
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """Add raw text and return any newly decoded field text."""
+        if self.done or not chunk:
+            return ""
+
+        self._buffer += chunk
+
+        if self._pos is None:
+            match = self._start.search(self._buffer)
+            if match is None:
+                return ""
+            self._pos = match.end()
+
+        out = []
+        buf = self._buffer
+        i = self._pos
+
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self.done = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+
+            # Escape sequence: wait until it is complete before decoding.
+            if i + 1 >= len(buf):
+                break
+            length = self._ESCAPE_LENGTHS.get(buf[i + 1], 2)
+            if length == 6 and i + 6 <= len(buf):
+                code = int(buf[i + 2 : i + 6], 16)
+                if 0xD800 <= code < 0xDC00:
+                    # High surrogate: decode together with its low half.
+                    length = 12
+            if i + length > len(buf):
+                break
+            try:
+                out.append(json.loads('"' + buf[i : i + length] + '"'))
+            except ValueError:
+                out.append(buf[i : i + length])
+            i += length
+
+        self._pos = i
+        return "".join(out)
@@ -60,6 +60,9 @@ class SwiftSuite:
         self.register_handler(
             "agent_query_response", self.handle_agent_query_response
         )
+        self.register_handler(
+            "agent_query_chunk", self.handle_agent_query_chunk
+        )
 
         # NEW:
         self.register_handler(
@@ -185,6 +188,7 @@ class SwiftSuite:
         agent_name = data.get("agent_name")
         query = data.get("query")
         request_id = data.get("request_id")
+        stream = data.get("stream", False)
 
         if not agent_name or not query or not request_id:
             # Some basic validation
@@ -227,6 +231,7 @@ class SwiftSuite:
                     "type": "agent_query",
                     "request_id": request_id,
                     "query": query,
+                    "stream": stream,
                 }
             )
         )
@@ -300,6 +305,33 @@ class SwiftSuite:
             f"[error]Unknown request_id {req_id} in agent_query_response[/error]"
         )
 
+    async def handle_agent_query_chunk(
+        self,
+        websocket: WebSocketServerProtocol,
+        data: dict,
+    ) -> None:
+        """
+        Handle 'agent_query_chunk' from an agent streaming a response.
+        Chunks are forwarded to the client as 'client_query_chunk'; the
+        request stays pending until the final 'agent_query_response'.
+        """
+        req_id = data.get("request_id")
+
+        # Only top-level single-agent requests are streamed to clients
+        client_ws = self.pending_requests.get(req_id)
+        if client_ws is None:
+            return
+
+        await client_ws.send(
+            json.dumps(
+                {
+                    "type": "client_query_chunk",
+                    "request_id": req_id,
+                    "chunk": data.get("chunk"),
+                }
+            )
+        )
+
     async def handle_disconnect(
         self,
         websocket: WebSocketServerProtocol,
@@ -1,7 +1,17 @@
 # tests/test_actions.py
 
 import pytest
-from swiftagent.actions import Action, action, ActionSet
+import asyncio
+import os
+import time
+from swiftagent.actions import (
+    Action,
+    action,
+    ActionSet,
+    ActionExecutor,
+    ExecutionPolicy,
+    ActionRetriever,
+)
 
 
 def test_action_decorator_basic():
@@ -53,3 +63,125 @@ def test_action_set():
     assert len(actions) == 2
     action_names = {a.name for a in actions}
     assert {"multiply", "subtract"} == action_names
+
+
+@pytest.mark.asyncio
+async def test_sync_actions_run_off_the_event_loop():
+    """Blocking sync actions run in the executor's thread pool by default."""
+    executor = ActionExecutor(max_workers=2)
+
+    def blocking_sleep() -> str:
+        time.sleep(0.2)
+        return "done"
+
+    sleeper = Action(func=blocking_sleep, name="blocking_sleep")
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        executor.run(sleeper, {}), executor.run(sleeper, {})
+    )
+    assert results == ["done", "done"]
+    assert time.perf_counter() - start < 0.35
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_execution_policy():
+    """execution='process' runs the (cloudpickled) function in a child process."""
+    executor = ActionExecutor(max_processes=1)
+
+    def current_pid() -> int:
+        import os
+
+        return os.getpid()
+
+    act = Action(func=current_pid, name="pid", execution="process")
+    assert act.execution == ExecutionPolicy.PROCESS
+    assert await executor.run(act, {}) != os.getpid()
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_action_result_cache_is_shared_and_expires():
+    """cache= memoizes on normalized args, shared by Actions of one function."""
+    calls = []
+
+    def company_info(symbol: str, full: bool = False) -> str:
+        calls.append(symbol)
+        return f"info:{symbol}"
+
+    executor = ActionExecutor()
+    first = Action(func=company_info, name="info", cache={"ttl": 0.2})
+    second = Action(func=company_info, name="info", cache=True)
+    assert first.cache is second.cache
+
+    await executor.run(first, {"symbol": "NVDA", "full": True})
+    await executor.run(second, {"full": True, "symbol": "NVDA"})
+    assert calls == ["NVDA"]
+    assert first.cache.stats["hits"] == 1
+
+    await asyncio.sleep(0.25)
+    await executor.run(first, {"symbol": "NVDA", "full": True})
+    assert calls == ["NVDA", "NVDA"]
+    executor.shutdown()
+
+
+def test_action_cache_options_conflict_and_disk_expiry(tmp_path, monkeypatch):
+    """Conflicting shared options raise; disk hits keep their stored expiry."""
+    import swiftagent.actions.cache as action_cache
+    from swiftagent.actions import ActionCache
+
+    monkeypatch.setattr(action_cache, "CACHE_DIR", tmp_path)
+    ActionCache.shared("conflicting", ttl=10)
+    assert ActionCache.shared("conflicting").ttl == 10
+    assert ActionCache.shared("conflicting", ttl=10).ttl == 10
+    with pytest.raises(ValueError):
+        ActionCache.shared("conflicting", ttl=20)
+
+    writer = ActionCache("disk", ttl=0.3, persist=True)
+    writer.set({"x": 1}, "value")
+    time.sleep(0.2)
+    reader = ActionCache("disk", ttl=0.3, persist=True)
+    assert reader.get({"x": 1}) == (True, "value")
+    time.sleep(0.15)
+    assert reader.get({"x": 1}) == (False, None)
+
+
+def test_action_retriever_selects_relevant_and_pinned():
+    """Only the top-k actions similar to the task (plus pins) are selected."""
+    vocabulary = ["stock", "price", "weather", "forecast", "email", "news"]
+
+    batches = []
+
+    def bag_of_words(texts):
+        batches.append(len(texts))
+        return [
+            [float(word in text.lower()) + 0.01 for word in vocabulary]
+            for text in texts
+        ]
+
+    def noop() -> str:
+        return ""
+
+    actions = [
+        Action(func=noop, name="get_stock_price", description="Stock price"),
+        Action(func=noop, name="get_weather", description="Weather forecast"),
+        Action(func=noop, name="send_email", description="Send an email"),
+        Action(func=noop, name="search_news", description="Search news"),
+    ]
+    retriever = ActionRetriever(
+        embedding_function=bag_of_words, top_k=1, pinned=["send_email"]
+    )
+    retriever.add_many(actions[:3])
+    retriever.add(actions[3])
+    # Embedded at registration, one batch per call
+    assert batches == [3, 1]
+
+    selected = retriever.select("What is the weather forecast?", actions)
+    assert [a.name for a in selected] == ["get_weather", "send_email"]
+    assert batches == [3, 1, 1]  # only the task is embedded at selection
+
+    # Re-registering an unchanged action does not invalidate its vector
+    retriever.add(actions[1])
+    assert "get_weather" in retriever._vectors
+    assert batches == [3, 1, 1]
@@ -75,3 +75,82 @@ async def test_agent_episodic_memory_init(mock_llm):
         task="Testing memory", runtime=RuntimeType.STANDARD
     )
     assert result == "Done"
+
+
+def test_ingest_runs_as_background_job(tmp_path):
+    """Ingest requests return a job id at once; progress is queryable."""
+    import numpy as np
+    from starlette.testclient import TestClient
+    from swiftagent.memory.semantic import SemanticMemory
+    from swiftagent.prebuilt.storage.numpy_store import NumpyCollection
+
+    def embed(texts):
+        return [np.array([float(len(t)), 1.0]) for t in texts]
+
+    agent = SwiftAgent(name="IngestAgent", verbose=False)
+    agent.add_semantic_memory_section(
+        SemanticMemory(
+            name="docs",
+            container_collection=NumpyCollection(
+                str(tmp_path / "docs"), embedding_function=embed
+            ),
+            text_splitter=lambda text: text.split("\n"),
+        )
+    )
+    client = TestClient(agent._create_server())
+
+    response = client.post(
+        "/IngestAgent/ingest_memory_store",
+        json={"store_name": "docs", "content": "a\nbb\nccc"},
+    )
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    agent.ingest_jobs.get(job_id)._future.result(timeout=10)
+    job = client.get(f"/IngestAgent/ingest_jobs/{job_id}").json()["job"]
+    assert job["status"] == "completed"
+    assert job["progress"]["embedded"] == 3
+
+    waited = client.post(
+        "/IngestAgent/ingest_memory_store",
+        json={"store_name": "docs", "content": "dddd", "wait": True},
+    ).json()
+    assert waited["job"]["status"] == "completed"
+    assert len(client.get("/IngestAgent/ingest_jobs").json()["jobs"]) == 2
+    assert client.get("/IngestAgent/ingest_jobs/nope").status_code == 404
+
+
+def test_agent_close_shuts_down_its_pools():
+    """close() (and a server shutdown) stops the action and ingest pools."""
+    from starlette.testclient import TestClient
+
+    agent = SwiftAgent(name="ClosingAgent", verbose=False)
+    agent.action_executor.thread_pool.submit(int).result()
+    agent.ingest_jobs._get_executor()
+    agent.close()
+    assert agent.action_executor._thread_pool is None
+    assert agent.ingest_jobs._executor is None
+
+    agent.action_executor.thread_pool.submit(int).result()
+    with TestClient(agent._create_server()):
+        assert agent.action_executor._thread_pool is not None
+    assert agent.action_executor._thread_pool is None
+
+
+@pytest.mark.asyncio
+async def test_hosted_agent_closes_when_the_runtime_ends():
+    """Ending the HOSTED runtime shuts down the agent's pools."""
+    agent = SwiftAgent(name="HostedAgent", verbose=False)
+    agent.action_executor.thread_pool.submit(int).result()
+
+    async def never_connects(host, port):
+        await asyncio.Event().wait()
+
+    with patch.object(agent, "_connect_hosted", never_connects):
+        hosted = asyncio.create_task(
+            agent.run(runtime=RuntimeType.HOSTED, host="localhost", port=1)
+        )
+        await asyncio.sleep(0.05)
+        hosted.cancel()
+        await asyncio.gather(hosted, return_exceptions=True)
+    assert agent.action_executor._thread_pool is None
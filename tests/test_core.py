@@ -0,0 +1,86 @@
+# tests/test_core.py
+
+import numpy as np
+from swiftagent.core.embedder import batch_embedder, embedder
+from swiftagent.core.embedding_cache import EmbeddingCache
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return [np.array([float(len(t)), 1.0, 2.0]) for t in texts]
+
+
+def test_embedding_cache_only_embeds_unseen_texts(tmp_path):
+    """Cached texts are served from disk, even by a fresh cache instance."""
+    ef = CountingEmbedder()
+    cache = EmbeddingCache("test-model", path=tmp_path)
+
+    first = cache.embed(["a", "bb", "a"], ef)
+    assert ef.texts == ["a", "bb"]
+    assert np.allclose(first[2], [1.0, 1.0, 2.0])
+
+    reopened = EmbeddingCache("test-model", path=tmp_path, max_memory_entries=1)
+    vectors = reopened.embed(["bb", "ccc"], ef)
+    assert ef.texts == ["a", "bb", "ccc"]
+    assert np.allclose(vectors[0], [2.0, 1.0, 2.0])
+    assert len(reopened) == 3
+    assert reopened.stats["hits"] == 1
+
+
+def test_embedder_decorator_with_cache(tmp_path):
+    """@embedder(cache=...) calls the wrapped function once per distinct text."""
+    calls = []
+
+    @embedder(cache=EmbeddingCache("decorated", path=tmp_path))
+    def embed(text: str):
+        calls.append(text)
+        return [float(len(text)), 0.5]
+
+    embed(["hello", "hi"])
+    result = embed(["hi", "hello"])
+
+    assert calls == ["hello", "hi"]
+    assert np.allclose(result[0], [2.0, 0.5])
+
+
+def test_batch_embedder_batches_sorted_and_keeps_order():
+    """Inputs are embedded in length-sorted batches and returned in input order."""
+    batches = []
+
+    @batch_embedder(batch_size=2, parallel="thread", max_workers=2)
+    def embed(texts):
+        batches.append(list(texts))
+        return np.array([[len(t), 1.0] for t in texts])
+
+    texts = ["ccc", "a", "dddd", "bb", "eeeee"]
+    matrix = embed.embed(texts)
+
+    assert matrix.dtype == np.float32 and matrix.flags["C_CONTIGUOUS"]
+    assert matrix[:, 0].tolist() == [3, 1, 4, 2, 5]
+    assert sorted(batches) == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+    assert len(embed(texts)) == 5
+
+
+def test_persistent_cache_needs_a_model_id():
+    """Function names alone never key the on-disk embedding cache."""
+    import pytest
+    from swiftagent.core.embedding_cache import CachedEmbeddingFunction
+
+    with pytest.raises(ValueError):
+
+        @embedder(cache=True)
+        def embed(text: str):
+            return [1.0, 0.0, 0.0]
+
+    with pytest.raises(ValueError):
+        CachedEmbeddingFunction(lambda texts: [[1.0] for _ in texts])
+
+    @embedder
+    def uncached(text: str):
+        return [0.0, 1.0, 0.0]
+
+    assert uncached.model_id is None and uncached.cache is None
@@ -0,0 +1,223 @@
+# tests/test_llm.py
+
+import pytest
+import asyncio
+from unittest.mock import patch, AsyncMock
+from litellm import ModelResponse, RateLimitError
+from swiftagent.llm import LLM, LLMCache, ModelScheduler, RateLimit
+from swiftagent.llm.utils import canonical_request_key
+
+
+def _completion(content: str) -> ModelResponse:
+    return ModelResponse(
+        model="gpt-4o",
+        choices=[{"message": {"role": "assistant", "content": content}}],
+    )
+
+
+def test_canonical_request_key_is_order_insensitive():
+    """Dict ordering and None-valued fields must not change the key."""
+    a = canonical_request_key(
+        "gpt-4o",
+        {
+            "messages": [{"role": "user", "content": "hi", "name": None}],
+            "response_format": {"type": "json_object"},
+        },
+    )
+    b = canonical_request_key(
+        "gpt-4o",
+        {
+            "response_format": {"type": "json_object"},
+            "messages": [{"content": "hi", "role": "user"}],
+            "timeout": 30,
+        },
+    )
+    assert a == b
+    assert a != canonical_request_key("gpt-4o-mini", {"messages": []})
+    assert canonical_request_key(
+        "gpt-4o", {"messages": [], "api_base": "https://a.example"}
+    ) != canonical_request_key(
+        "gpt-4o", {"messages": [], "api_base": "https://b.example"}
+    )
+
+
+@pytest.mark.asyncio
+@patch("swiftagent.llm.base.acompletion", new_callable=AsyncMock)
+async def test_llm_cache_hit(mock_acompletion, tmp_path):
+    """A repeated identical request is served from the on-disk cache."""
+    mock_acompletion.return_value = _completion('{"response":"hi"}')
+
+    llm = LLM("gpt-4o", cache=LLMCache(path=tmp_path / "llm.sqlite3"))
+    messages = [{"role": "user", "content": "Hello"}]
+
+    first = await llm.inference(model=llm, messages=messages)
+    second = await llm.inference(model=llm, messages=messages)
+
+    mock_acompletion.assert_called_once()
+    assert second.choices[0].message.content == '{"response":"hi"}'
+    assert first.choices[0].message.content == second.choices[0].message.content
+    assert llm.cache_stats["hits"] == 1
+    assert llm.cache_stats["misses"] == 1
+
+    # Positional args forwarded to acompletion are part of the key
+    other = LLM("gpt-4o", "positional", cache=llm.cache)
+    await other.inference(messages=messages)
+    assert mock_acompletion.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("swiftagent.llm.base.acompletion", new_callable=AsyncMock)
+async def test_llm_coalesces_identical_inflight_calls(mock_acompletion):
+    """Concurrent identical deterministic requests share one call."""
+    release = asyncio.Event()
+
+    async def slow_completion(**kwargs):
+        await release.wait()
+        return _completion("shared")
+
+    mock_acompletion.side_effect = slow_completion
+
+    llm = LLM("gpt-4o", coalesce=True)
+    messages = [{"role": "user", "content": "Hello"}]
+
+    leader = asyncio.create_task(
+        llm.inference(messages=messages, temperature=0)
+    )
+    followers = [
+        asyncio.create_task(llm.inference(messages=messages, temperature=0))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    # Cancelling the leader must not cancel the shared call.
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*followers)
+    assert all(r.choices[0].message.content == "shared" for r in results)
+    assert leader.cancelled()
+    mock_acompletion.assert_called_once()
+    # Every caller gets its own copy
+    assert len({id(r) for r in results}) == 3
+
+    # Sampled requests expect independent samples
+    await asyncio.gather(*[llm.inference(messages=messages) for _ in range(2)])
+    assert mock_acompletion.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_model_scheduler_caps_in_flight_and_retries_on_429():
+    """max_in_flight bounds concurrency; a 429 with Retry-After is retried."""
+    scheduler = ModelScheduler(
+        "test-model", RateLimit(max_in_flight=2, base_backoff=0.01)
+    )
+    in_flight = 0
+    peak = 0
+    calls = 0
+
+    async def request():
+        nonlocal in_flight, peak, calls
+        calls += 1
+        if calls == 1:
+            raise RateLimitError(
+                message="slow down",
+                llm_provider="openai",
+                model="test-model",
+                headers={"retry-after": "0.01"},
+            )
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "ok"
+
+    results = await asyncio.gather(*[scheduler.run(request) for _ in range(5)])
+    assert results == ["ok"] * 5
+    assert peak <= 2
+    assert calls == 6
+
+
+@pytest.mark.asyncio
+async def test_model_scheduler_reconfigure_keeps_running_calls_and_debt():
+    """New LLMs do not reset the shared limits; a 429 refunds its tokens."""
+    limits = RateLimit(max_in_flight=2, tpm=6000, base_backoff=0.01)
+    scheduler = ModelScheduler.for_model("reconfigured-model", limits=limits)
+    bucket = scheduler._token_bucket
+    assert (
+        ModelScheduler.for_model(
+            "reconfigured-model", limits=RateLimit(**vars(limits))
+        )
+        is scheduler
+    )
+    assert scheduler._token_bucket is bucket
+
+    release = asyncio.Event()
+    in_flight = 0
+    peak = 0
+
+    async def request():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await release.wait()
+        in_flight -= 1
+        return "ok"
+
+    running = [
+        asyncio.create_task(scheduler.run(request, tokens=1000))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0.01)
+    level = bucket.level
+
+    # A second agent with other limits: the two running calls still count
+    ModelScheduler.for_model(
+        "reconfigured-model",
+        limits=RateLimit(max_in_flight=3, tpm=6000, base_backoff=0.01),
+    )
+    assert scheduler._token_bucket is bucket
+    assert bucket.level < level + 100
+    extra = [
+        asyncio.create_task(scheduler.run(request, tokens=0)) for _ in range(2)
+    ]
+    await asyncio.sleep(0.01)
+    assert peak == 3
+
+    release.set()
+    await asyncio.gather(*running, *extra)
+    assert peak == 3
+
+    calls = 0
+
+    async def rate_limited():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RateLimitError(
+                message="slow down",
+                llm_provider="openai",
+                model="reconfigured-model",
+                headers={"retry-after": "0"},
+            )
+        return "ok"
+
+    before = bucket.level
+    await scheduler.run(rate_limited, tokens=1000)
+    # Only the successful attempt is charged
+    assert before - 1000 - 1 < bucket.level < before - 1000 + 100
+
+
+@pytest.mark.asyncio
+@patch("swiftagent.llm.base.acompletion", new_callable=AsyncMock)
+async def test_llm_without_rate_limit_does_not_retry(mock_acompletion):
+    """429 retries and shared limits only apply with an explicit rate_limit."""
+    mock_acompletion.side_effect = RateLimitError(
+        message="slow down", llm_provider="openai", model="gpt-4o"
+    )
+
+    llm = LLM("gpt-4o")
+    assert llm.scheduler is None
+    with pytest.raises(RateLimitError):
+        await llm.inference(messages=[{"role": "user", "content": "Hi"}])
+    mock_acompletion.assert_called_once()
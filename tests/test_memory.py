@@ -0,0 +1,349 @@
+# tests/test_memory.py
+
+import pytest
+import numpy as np
+from swiftagent.memory.semantic import SemanticMemory
+from swiftagent.memory.recall import RecallCoordinator
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts):
+        self.calls += 1
+        return [np.array([float(len(t)), 1.0]) for t in texts]
+
+
+class FakeCollection:
+    """In-memory stand-in exposing the parts of VectorCollection used by recall."""
+
+    def __init__(self, embedding_function, texts):
+        self.embedding_function = embedding_function
+        self.texts = texts
+
+    def search(self, query_vector, k=5, include_text=True):
+        return [
+            {"id": str(i), "metadata": {}, "distance": float(i), "text": t}
+            for i, t in enumerate(self.texts[:k])
+        ]
+
+
+@pytest.mark.asyncio
+async def test_recall_coordinator_embeds_query_once():
+    """All memories sharing an embedding function reuse one query vector."""
+    ef = CountingEmbedder()
+    memories = [
+        SemanticMemory(
+            name=f"section_{i}",
+            container_collection=FakeCollection(
+                ef, [f"fact {i}a", f"fact {i}b"]
+            ),
+        )
+        for i in range(6)
+    ]
+
+    result = await RecallCoordinator().recall(
+        "query", [(m.name, m, 2) for m in memories]
+    )
+
+    assert ef.calls == 1
+    assert result.embed_calls == 1
+    assert result.items["section_3"][0]["text"] == "fact 3a"
+    assert set(result.latency) == {m.name for m in memories}
+
+
+@pytest.mark.asyncio
+async def test_recall_coordinator_token_budget_keeps_nearest():
+    """Under a token budget, the nearest hits across sources win."""
+    ef = CountingEmbedder()
+    long_text = "word " * 50
+    a = SemanticMemory(
+        name="a", container_collection=FakeCollection(ef, ["near a", long_text])
+    )
+    b = SemanticMemory(
+        name="b", container_collection=FakeCollection(ef, ["near b", long_text])
+    )
+
+    result = await RecallCoordinator(token_budget=20).recall(
+        "query", [("a", a, 2), ("b", b, 2)]
+    )
+
+    assert [h["text"] for h in result.items["a"]] == ["near a"]
+    assert [h["text"] for h in result.items["b"]] == ["near b"]
+
+
+def test_long_term_memory_filters_inside_the_search(tmp_path):
+    """Type and time filters are pushed down instead of over-fetching."""
+    from swiftagent.memory.base import MemoryItem, MemoryItemType
+    from swiftagent.memory.long_term import LongTermMemory
+    from swiftagent.prebuilt.storage.numpy_store import NumpyCollection
+
+    ltm = LongTermMemory(
+        container_collection=NumpyCollection(
+            str(tmp_path / "ltm"), embedding_function=CountingEmbedder()
+        )
+    )
+    # TEXT items dominate the neighbourhood of the query
+    for i in range(20):
+        ltm.ingest_item(
+            MemoryItem(MemoryItemType.TEXT, "x" * 10, timestamp=1000.0 + i)
+        )
+    ltm.ingest_item(
+        MemoryItem(MemoryItemType.ACTION, "x" * 40, timestamp="1500")
+    )
+    ltm.ingest_item(
+        MemoryItem(MemoryItemType.ACTION, "x" * 50, timestamp=2000.0)
+    )
+
+    actions = ltm.recall_actions("x" * 10, number=5)
+    assert [a["type"] for a in actions] == ["ACTION", "ACTION"]
+
+    recent = ltm.recall("x" * 10, number=5, item_type="ACTION", since=1800)
+    assert [r["timestamp"] for r in recent] == [2000.0]
+
+    window = ltm.recall_text("x" * 10, number=30, since=1005, until=1009)
+    assert sorted(r["timestamp"] for r in window) == [
+        1005.0,
+        1006.0,
+        1007.0,
+        1008.0,
+        1009.0,
+    ]
+
+
+def test_hybrid_semantic_memory_finds_exact_tokens(tmp_path):
+    """BM25 hits are fused with vector hits, and the index reloads lazily."""
+    from swiftagent.prebuilt.storage.numpy_store import NumpyCollection
+
+    chunks = [
+        "Quarterly revenue grew strongly",
+        "Error ERR-4071 means the upstream timed out",
+        "Revenue guidance was raised",
+    ]
+    collection = NumpyCollection(
+        str(tmp_path / "docs"), embedding_function=CountingEmbedder()
+    )
+    memory = SemanticMemory(
+        name="docs",
+        container_collection=collection,
+        text_splitter=lambda text: text.split("\n"),
+        hybrid=True,
+    )
+    memory.ingest("\n".join(chunks))
+
+    # The embedding only sees lengths; the lexical half finds the code
+    hits = memory.recall("what is ERR-4071", 2)
+    assert "ERR-4071" in hits[0]["text"]
+    assert memory.recall("4071", 1, mode="lexical")[0]["text"] == chunks[1]
+
+    reopened = SemanticMemory(
+        name="docs", container_collection=collection, hybrid=True
+    )
+    assert len(reopened.lexical_index) == 3
+    assert "ERR-4071" in reopened.recall("ERR-4071", 1)[0]["text"]
+
+
+def test_bm25_log_is_compacted(tmp_path):
+    """Re-indexing the same documents does not grow the log without bound."""
+    from swiftagent.memory.lexical import BM25Index
+
+    path = str(tmp_path / "docs.lexical.jsonl")
+    index = BM25Index(path)
+    for version in range(20):
+        index.remove(["a", "b"])
+        index.add(["a", "b"], [f"alpha v{version}", f"beta v{version}"])
+
+    with open(path, encoding="utf-8") as f:
+        assert len(f.readlines()) <= 8
+    reopened = BM25Index(path)
+    assert len(reopened) == 2
+    assert reopened.text("a") == "alpha v19"
+    assert reopened.search("v19", 2)[0][0] in {"a", "b"}
+
+
+def test_semantic_memory_ingest_is_idempotent(tmp_path):
+    """Unchanged sources are skipped; changed ones replace their chunks."""
+    from swiftagent.prebuilt.storage.numpy_store import NumpyCollection
+
+    ef = CountingEmbedder()
+    collection = NumpyCollection(str(tmp_path / "docs"), embedding_function=ef)
+    memory = SemanticMemory(
+        name="docs",
+        container_collection=collection,
+        text_splitter=lambda text: text.split("\n"),
+    )
+    memory.ingest("one\ntwo\none")
+    calls = ef.calls
+    assert collection.size == 2  # repeated chunk stored once
+
+    memory.ingest("one\ntwo\none")
+    assert (ef.calls, collection.size) == (calls, 2)
+
+    memory.ingest("one\nthree", source="doc-1")
+    memory.ingest("one\nfour", source="doc-1")
+    texts = {r["text"] for r in collection.search_by_text("x", k=20)}
+    assert "three" not in texts and "four" in texts
+
+
+def test_ingest_many_streams_in_batches(tmp_path):
+    """Sources are chunked lazily, embedded in batches and written once."""
+    from swiftagent.prebuilt.storage.numpy_store import NumpyCollection
+
+    ef = CountingEmbedder()
+    collection = NumpyCollection(str(tmp_path / "docs"), embedding_function=ef)
+    memory = SemanticMemory(
+        name="docs",
+        container_collection=collection,
+        text_splitter=lambda text: [t for t in text.split("\n") if t],
+    )
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"part{i}.txt"
+        path.write_text("\n".join(f"line {i}-{j}" for j in range(10)))
+        paths.append(str(path))
+
+    stats = memory.ingest_many(paths, batch_size=4, workers=2)
+    assert (stats.sources, stats.chunks, stats.embedded) == (3, 30, 30)
+    assert stats.batches == 8 and ef.calls == 8
+    assert collection.size == 30 and stats.chunks_per_second > 0
+
+    again = memory.ingest_many(paths, batch_size=4)
+    assert again.skipped_sources == 3 and ef.calls == 8
+
+    pages = (f"page {i}\n" for i in range(5))
+    streamed = memory.ingest_stream(pages, source="book")
+    assert streamed.embedded == 5 and collection.size == 35
+
+
+def test_markdown_converter_caches_local_files(tmp_path):
+    """Files are converted offline, cached, and re-converted once edited."""
+    import os
+    from swiftagent.memory.convert import MarkdownConverter
+
+    converter = MarkdownConverter(tmp_path / "markdown.sqlite3")
+    notes = tmp_path / "notes.txt"
+    notes.write_text("plain notes")
+    pages = []
+    for i in range(2):
+        page = tmp_path / f"page{i}.html"
+        page.write_text(f"<h1>Title {i}</h1><p>some <b>bold</b> text</p>")
+        pages.append(str(page))
+
+    assert converter.convert(str(notes)) == "plain notes"
+    markdown = converter.convert_many(pages, max_workers=2)
+    assert markdown[0].startswith("# Title 0") and "**bold**" in markdown[1]
+
+    hits = converter.stats["hits"]
+    assert (
+        converter.convert_many([str(notes)] + pages)
+        == ["plain notes"] + markdown
+    )
+    assert converter.stats["hits"] == hits + 3
+
+    notes.write_text("edited notes")
+    os.utime(notes, ns=(0, 1))
+    assert converter.convert(str(notes)) == "edited notes"
+
+
+def test_recursive_text_splitter_offsets_tokens_and_stream():
+    """Chunks are stripped slices of the source, sized in chars or tokens."""
+    from swiftagent.memory.splitter import RecursiveTextSplitter
+
+    text = "alpha beta gamma\n\ndelta epsilon\nzeta eta theta iota"
+    splitter = RecursiveTextSplitter(chunk_size=20, chunk_overlap=6)
+    spans = splitter.spans(text)
+    assert (
+        splitter(text)
+        == [text[start:end] for start, end in spans]
+        == [
+            "alpha beta gamma",
+            "delta epsilon",
+            "zeta eta theta iota",
+        ]
+    )
+
+    long_text = "one two three four five six seven"
+    assert RecursiveTextSplitter(12, 4).split(long_text) == [
+        "one two",
+        "two three",
+        "four five",
+        "six seven",
+    ]
+
+    class WordTokenizer:
+        def encode(self, text):
+            return text.split()
+
+    by_tokens = RecursiveTextSplitter(
+        3, 1, length="tokens", tokenizer=WordTokenizer()
+    )
+    assert all(len(c.split()) <= 3 for c in by_tokens(long_text))
+
+    big = " ".join(f"w{i}" for i in range(2000))
+    pieces = (big[i : i + 100] for i in range(0, len(big), 100))
+    streamed = list(splitter.stream(pieces, window_chars=500))
+    assert all(len(c) <= 20 for c in streamed)
+    assert streamed[0] == splitter(big)[0] and streamed[-1].endswith("w1999")
+
+
+def test_working_memory_is_bounded_and_stamps_epoch_times():
+    """Oldest items are evicted in order; timestamps are epoch floats."""
+    from swiftagent.memory.base import MemoryItem, format_timestamp
+    from swiftagent.memory.working import WorkingMemory
+
+    memory = WorkingMemory(max_items=3)
+    evicted = []
+    memory._handle_eviction = evicted.append
+    for i in range(5):
+        memory.add_text(f"item {i}")
+
+    assert [item.content for item in memory.history] == [
+        "item 2",
+        "item 3",
+        "item 4",
+    ]
+    assert [item.content for item in evicted] == ["item 0", "item 1"]
+    assert [i.content for i in memory.get_recent_items(2)] == [
+        "item 3",
+        "item 4",
+    ]
+    assert memory.recall("item 3", 1)[0].content == "item 3"
+
+    item = memory.history[-1]
+    assert isinstance(item.timestamp, float) and not hasattr(item, "__dict__")
+    assert isinstance(MemoryItem.__slots__, tuple)
+    assert format_timestamp(item.timestamp).count(":") == 2
+
+
+def test_semantic_memory_sidecars_follow_the_collection(tmp_path):
+    """Manifest and lexical index live with their collection and reset with it."""
+    from swiftagent.core.embedder import embedder
+    from swiftagent.prebuilt.storage.chroma import ChromaDatabase
+
+    @embedder
+    def embed(text: str):
+        return [float(len(text)), 1.0]
+
+    memories = []
+    for directory in ("a", "b"):
+        db = ChromaDatabase(str(tmp_path / directory), embedding_function=embed)
+        memory = SemanticMemory(
+            name="docs",
+            container_collection=db.get_or_create_collection("docs"),
+            text_splitter=lambda text: text.split("\n"),
+            hybrid=True,
+        )
+        stats = memory.ingest_many(["alpha\nERR-1"])
+        assert stats.skipped_sources == 0
+        assert memory.container_collection.size == 2
+        memories.append((db, memory))
+
+    db, memory = memories[0]
+    memory.container_collection.clear()
+    assert memory.recall("ERR-1", 1, mode="lexical") == []
+    assert memory.ingest_many(["alpha\nERR-1"]).skipped_sources == 0
+    assert memory.recall("ERR-1", 1, mode="lexical")[0]["text"] == "ERR-1"
+
+    for db, _ in memories:
+        db.close()
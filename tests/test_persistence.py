@@ -32,3 +32,49 @@ def test_registry_save_load():
     assert fresh_agent._actions["greet"].func("Alice") == "Hello, Alice"
 
     shutil.rmtree(temp_dir)
+
+
+def test_registry_restores_working_memory_through_eviction(tmp_path):
+    """Saved items beyond max_items are evicted like at runtime on load."""
+    import json
+    from unittest.mock import patch
+    from swiftagent.memory.working import WorkingMemory
+
+    with open(tmp_path / "agent_profile.json", "w") as f:
+        json.dump(
+            {
+                "name": "Restored",
+                "description": "",
+                "instruction": None,
+                "llm_name": "gpt-4o",
+            },
+            f,
+        )
+    history = [
+        {"item_type": "TEXT", "content": f"item {i}", "timestamp": float(i)}
+        for i in range(3)
+    ]
+    with open(tmp_path / "memory_config.json", "w") as f:
+        json.dump(
+            {
+                "working_memory": {"max_items": 2},
+                "working_memory_data": {"history": history},
+            },
+            f,
+        )
+
+    agent = SwiftAgent(name="Empty", persist_path=str(tmp_path), verbose=False)
+    evicted = []
+    with patch.object(
+        WorkingMemory,
+        "_handle_eviction",
+        lambda self, item: evicted.append(item.content),
+    ):
+        AgentRegistry.load_agent_profile(agent)
+
+    assert [m.content for m in agent.working_memory.history] == [
+        "item 1",
+        "item 2",
+    ]
+    assert agent.working_memory.history[0].timestamp == 1.0
+    assert evicted == ["item 0"]
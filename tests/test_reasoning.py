@@ -0,0 +1,176 @@
+# tests/test_reasoning.py
+
+import pytest
+import asyncio
+from types import SimpleNamespace
+from litellm import ModelResponseStream
+from litellm.types.utils import StreamingChoices, Delta
+from swiftagent.actions import Action
+from swiftagent.reasoning.base import BaseReasoning
+from swiftagent.reasoning.context import ContextManager
+from swiftagent.reasoning.streaming import JSONFieldStreamer
+
+
+class StreamingLLM:
+    """Minimal LLM stand-in whose stream() yields the given content pieces."""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+    async def stream(self, **kwargs):
+        for piece in self.pieces:
+            yield ModelResponseStream(
+                model="gpt-4o",
+                choices=[StreamingChoices(delta=Delta(content=piece))],
+            )
+
+
+def _tool_call(id: str, name: str, arguments: str):
+    return SimpleNamespace(
+        id=id, function=SimpleNamespace(name=name, arguments=arguments)
+    )
+
+
+def test_json_field_streamer_decodes_partial_json():
+    """Only the decoded `response` value is emitted, escapes included."""
+    streamer = JSONFieldStreamer("response")
+    pieces = ['{"is_final": false, "respo', 'nse": "a\\', "nb \\u00", 'e9"}']
+    assert "".join(streamer.feed(p) for p in pieces) == "a\nb é"
+    assert streamer.done
+
+
+@pytest.mark.asyncio
+async def test_flow_stream_yields_deltas_then_final():
+    """flow_stream yields text deltas as they arrive, then the final answer."""
+    llm = StreamingLLM(
+        ['{"response": "Hel', "lo", '", "is_final": true}'],
+    )
+    reasoning = BaseReasoning(name="StreamAgent", instructions="Be brief")
+
+    events = [e async for e in reasoning.flow_stream(task="Hi", llm=llm)]
+
+    deltas = [e["content"] for e in events if e["type"] == "delta"]
+    assert "".join(deltas) == "Hello"
+    assert events[-1] == {"type": "final", "content": "Hello"}
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_run_concurrently_in_order():
+    """Tool calls of one turn overlap, keep their order, and errors become results."""
+    reasoning = BaseReasoning(name="ParallelAgent", instructions="")
+    running = 0
+    peak = 0
+
+    async def slow_echo(text: str) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return text
+
+    def explode() -> str:
+        raise RuntimeError("boom")
+
+    reasoning.set_action(Action(func=slow_echo, name="slow_echo"))
+    reasoning.set_action(Action(func=explode, name="explode"))
+
+    calls = [
+        _tool_call("1", "slow_echo", '{"text": "a"}'),
+        _tool_call("2", "explode", "{}"),
+        _tool_call("3", "slow_echo", '{"text": "b"}'),
+    ]
+    results = await reasoning._execute_action_calls(calls)
+
+    assert [m["tool_call_id"] for _, _, m in results] == ["1", "2", "3"]
+    assert results[0][2]["content"] == "a"
+    assert "boom" in results[1][2]["content"]
+    assert results[2][2]["content"] == "b"
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_action_timeout_becomes_tool_error():
+    """A hung action is cancelled and reported back instead of blocking the turn."""
+    reasoning = BaseReasoning(name="TimeoutAgent", instructions="")
+    cancelled = False
+
+    async def hang() -> str:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return "never"
+
+    reasoning.set_action(Action(func=hang, name="hang", timeout=0.05))
+
+    results = await asyncio.wait_for(
+        reasoning._execute_action_calls([_tool_call("1", "hang", "{}")]), 1
+    )
+
+    assert "timed out" in results[0][2]["content"]
+    assert cancelled
+
+
+@pytest.mark.asyncio
+async def test_flow_stops_at_max_turns():
+    """The turn budget ends a flow that never reaches a final answer."""
+    llm = StreamingLLM(['{"response": "thinking", "is_final": false}'])
+    reasoning = BaseReasoning(name="BudgetAgent", instructions="")
+
+    events = [
+        e async for e in reasoning.flow_stream(task="Hi", llm=llm, max_turns=2)
+    ]
+
+    assert len([e for e in events if e["type"] == "delta"]) == 2
+    assert "reasoning turns" in events[-1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_context_manager_keeps_head_and_tool_pairs():
+    """Compaction truncates/drops old turns but never splits a tool call from its result."""
+    context = ContextManager(
+        max_tokens=400, max_tool_output_tokens=20, keep_recent_turns=1
+    )
+    messages = [
+        {"role": "system", "content": "system prompt"},
+        {"role": "user", "content": "the task"},
+    ]
+    for i in range(6):
+        messages.append(
+            {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": str(i),
+                        "type": "function",
+                        "function": {"name": "lookup", "arguments": "{}"},
+                    }
+                ],
+            }
+        )
+        messages.append(
+            {
+                "role": "tool",
+                "tool_call_id": str(i),
+                "name": "lookup",
+                "content": "result " * 200,
+            }
+        )
+
+    await context.compact(messages)
+
+    assert context.total(messages) <= 400
+    assert messages[0]["content"] == "system prompt"
+    assert messages[1]["content"] == "the task"
+    assert "removed" in messages[2]["content"]
+    for i, message in enumerate(messages):
+        if message["role"] == "tool":
+            assert messages[i - 1]["tool_calls"][0]["id"] == (
+                message["tool_call_id"]
+            )
+    # The most recent turns are kept verbatim
+    assert messages[-1]["content"] == "result " * 200
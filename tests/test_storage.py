@@ -0,0 +1,204 @@
+# tests/test_storage.py
+
+import os
+
+import numpy as np
+import pytest
+from swiftagent.prebuilt.storage.numpy_store import NumpyCollection
+
+
+def _unit(i: int, dim: int = 8) -> np.ndarray:
+    vector = np.zeros(dim, dtype=np.float32)
+    vector[i % dim] = 1.0
+    return vector
+
+
+def test_numpy_collection_search_filter_and_delete(tmp_path):
+    """Exact search honours `where` filters and tombstones, and survives reopen."""
+    collection = NumpyCollection(str(tmp_path / "c"), auto_compact=None)
+    vectors = np.stack([_unit(i) for i in range(6)])
+    ids = collection.add_vectors(
+        vectors,
+        texts=[f"t{i}" for i in range(6)],
+        metadata=[{"type": "ACTION" if i % 2 else "TEXT"} for i in range(6)],
+    )
+
+    hits = collection.search(_unit(3), k=2)
+    assert hits[0]["id"] == ids[3] and hits[0]["text"] == "t3"
+    assert hits[0]["distance"] < 1e-6
+
+    hits = collection.search(_unit(2), k=3, where={"type": "ACTION"})
+    assert {h["metadata"]["type"] for h in hits} == {"ACTION"}
+
+    collection.delete_vectors([ids[3]])
+    assert collection.search(_unit(3), k=1)[0]["id"] != ids[3]
+
+    reopened = NumpyCollection(str(tmp_path / "c"))
+    assert reopened.size == 5
+    assert reopened.search(_unit(4), k=1)[0]["id"] == ids[4]
+
+
+def test_numpy_collection_delete_repeated_ids(tmp_path):
+    """Deleting an id listed twice tombstones it once."""
+    collection = NumpyCollection(str(tmp_path / "c"), auto_compact=None)
+    ids = collection.add_vectors(
+        np.stack([_unit(i) for i in range(3)]), ids=["a", "b", "c"]
+    )
+
+    assert collection.delete_vectors(["a", "a", "missing"])
+    assert collection.size == 2
+    assert not collection.delete_vectors(["a"])
+
+    reopened = NumpyCollection(str(tmp_path / "c"))
+    assert reopened.existing_ids(ids) == {"b", "c"}
+
+
+def test_numpy_collection_compaction_keeps_live_rows(tmp_path):
+    """Compaction rewrites the files with only the live rows."""
+    collection = NumpyCollection(
+        str(tmp_path / "c"), dtype="float16", auto_compact=0.5
+    )
+    ids = collection.add_vectors(
+        np.stack([_unit(i) for i in range(4)]), texts=list("abcd")
+    )
+
+    collection.delete_vectors(ids[:2])  # triggers compaction
+
+    assert len(collection._ids) == 2
+    reopened = NumpyCollection(str(tmp_path / "c"))
+    assert reopened.get_vector(ids[3])["text"] == "d"
+    assert reopened.search(_unit(2), k=1)[0]["id"] == ids[2]
+
+
+def test_numpy_collection_compaction_survives_a_crash(tmp_path, monkeypatch):
+    """A compaction cut short between the file swaps is finished on reload."""
+    import swiftagent.prebuilt.storage.numpy_store as numpy_store
+
+    path = str(tmp_path / "c")
+    options = {
+        "quantization": "sq8",
+        "quantization_options": {"min_train_rows": 4},
+    }
+    collection = NumpyCollection(path, auto_compact=None, **options)
+    ids = collection.add_vectors(
+        np.stack([_unit(i) for i in range(6)]), texts=list("abcdef")
+    )
+    collection.delete_vectors(ids[:3])
+
+    replace = os.replace
+    calls = []
+
+    def crash_after_first_replace(src, dst):
+        if calls:
+            raise OSError("crash")
+        calls.append(dst)
+        replace(src, dst)
+
+    monkeypatch.setattr(numpy_store.os, "replace", crash_after_first_replace)
+    with pytest.raises(OSError):
+        collection.compact()
+    monkeypatch.setattr(numpy_store.os, "replace", replace)
+
+    reopened = NumpyCollection(path, **options)
+    assert len(reopened._ids) == 3
+    for i in range(3, 6):
+        hit = reopened.search(_unit(i), k=1)[0]
+        assert hit["id"] == ids[i] and hit["text"] == "abcdef"[i]
+    assert not os.path.exists(os.path.join(path, "compact.pending"))
+
+
+def test_ivf_index_incremental_and_persistent(tmp_path):
+    """IVF trains once enough rows exist, assigns later inserts, and reloads."""
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(600, 16)).astype(np.float32)
+    options = {"nlist": 8, "nprobe": 8, "min_train_rows": 400}
+
+    collection = NumpyCollection(
+        str(tmp_path / "ivf"), index="ivf", index_options=options
+    )
+    ids = collection.add_vectors(data[:300])
+    assert not collection._index.trained
+    ids += collection.add_vectors(data[300:])
+    assert collection._index.trained
+
+    exact = NumpyCollection(str(tmp_path / "flat"))
+    exact.add_vectors(data, ids=ids)
+
+    query = data[123]
+    # Scanning every list is an exact search
+    assert [h["id"] for h in collection.search(query, k=5)] == [
+        h["id"] for h in exact.search(query, k=5)
+    ]
+    assert collection.search(query, k=1, nprobe=1)[0]["id"] == ids[123]
+
+    reopened = NumpyCollection(str(tmp_path / "ivf"))
+    assert reopened._index.trained and reopened._index.nlist == 8
+    assert reopened.search(query, k=1, nprobe=1)[0]["id"] == ids[123]
+
+
+def test_quantized_collection_recall_and_reload(tmp_path):
+    """SQ8/PQ collections search their codes and report compression."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 32)).astype(np.float32)
+    data = centers[rng.integers(0, 20, size=1000)] + rng.normal(
+        scale=0.3, size=(1000, 32)
+    ).astype(np.float32)
+
+    for quantization, ratio in (("sq8", 4.0), ("pq", 16.0)):
+        path = str(tmp_path / quantization)
+        collection = NumpyCollection(
+            path,
+            quantization=quantization,
+            quantization_options={"min_train_rows": 500, "rerank": 50},
+        )
+        ids = collection.add_vectors(data)
+
+        report = collection.quantization_report(k=5)
+        assert report["trained"] and report["compression_ratio"] == ratio
+        # The codes are stored on top of the float32 vectors
+        assert report["disk_bytes_per_vector"] == 32 * 4 * (1 + 1 / ratio)
+        assert report["recall"] >= 0.9
+        assert collection.search(data[42], k=1)[0]["id"] == ids[42]
+
+        reopened = NumpyCollection(path)
+        assert len(reopened._quantizer.codes) == 1000
+        assert reopened.search(data[7], k=1)[0]["id"] == ids[7]
+
+
+def test_chroma_databases_share_one_client_per_path(tmp_path):
+    """Databases on one directory share a pooled, reference-counted client."""
+    from swiftagent.prebuilt.storage.chroma import (
+        ChromaClientRegistry,
+        ChromaDatabase,
+    )
+
+    path = str(tmp_path / "chroma")
+    first = ChromaDatabase(path, embedding_cache=False)
+    second = ChromaDatabase(path, embedding_cache=False)
+    assert first._client is second._client
+    assert ChromaClientRegistry.refcount(path) == 2
+
+    first.close()
+    first.close()  # idempotent
+    assert ChromaClientRegistry.refcount(path) == 1
+    second.close()
+    assert ChromaClientRegistry.refcount(path) == 0
+
+    with ChromaDatabase(path, embedding_cache=False) as third:
+        assert third.get_or_create_collection("xyz").name == "xyz"
+
+
+def test_numpy_databases_share_collections_per_directory(tmp_path):
+    """Two databases on one directory append to one collection, not over it."""
+    from swiftagent.prebuilt.storage.numpy_store import NumpyDatabase
+
+    path = str(tmp_path / "db")
+    first = NumpyDatabase(path).get_or_create_collection("c")
+    second = NumpyDatabase(path).get_or_create_collection("c")
+    assert first is second
+
+    first.add_vectors(np.stack([_unit(0)]), texts=["A"])
+    second.add_vectors(np.stack([_unit(1)]), texts=["B"])
+    reopened = NumpyCollection(str(tmp_path / "db" / "c"))
+    assert reopened.size == 2
+    assert reopened.search(_unit(1), k=1)[0]["text"] == "B"